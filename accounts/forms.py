@@ -1,10 +1,10 @@
 from crispy_forms.helper import FormHelper
 from crispy_forms.layout import Column, Layout, Row, Submit
 from django import forms
-from django.contrib.auth.forms import UserCreationForm
+from django.contrib.auth.forms import PasswordResetForm, UserCreationForm
 from django.contrib.auth.models import User
 
-from core.models import BestSet, Exercise
+from core.models import BestSet, BodyweightLog, Exercise, UserProfile
 
 
 class UserRegisterForm(UserCreationForm):
@@ -25,11 +25,24 @@ class UserRegisterForm(UserCreationForm):
 
     def clean_email(self):
         email = self.cleaned_data.get("email")
-        if User.objects.filter(email=email).exists():
+        if UserProfile.objects.filter(
+            email_normalized=UserProfile.normalize_email(email)
+        ).exists():
             raise forms.ValidationError("A user with this email already exists")
         return email
 
 
+class ProfileEmailPasswordResetForm(PasswordResetForm):
+    """Finds users through the indexed, case-folded profile email."""
+
+    def get_users(self, email):
+        users = User.objects.filter(
+            userprofile__email_normalized=UserProfile.normalize_email(email),
+            is_active=True,
+        )
+        return (user for user in users if user.has_usable_password())
+
+
 class UserUpdateForm(forms.ModelForm):
     email = forms.EmailField()
 
@@ -102,3 +115,91 @@ class BestSetForm(forms.ModelForm):
             raise forms.ValidationError("Repetitions must be between 1 and 30")
 
         return cleaned_data
+
+
+class BodyweightForm(forms.ModelForm):
+    sex = forms.ChoiceField(
+        choices=[("", "—")] + UserProfile.SEX_CHOICES,
+        required=False,
+        label="Sex (for DOTS/Wilks)",
+        widget=forms.Select(attrs={"class": "form-select"}),
+    )
+
+    class Meta:
+        model = BodyweightLog
+        fields = ["weight", "measured_on"]
+        labels = {
+            "weight": "Bodyweight (kg)",
+            "measured_on": "Date",
+        }
+        widgets = {
+            "weight": forms.NumberInput(
+                attrs={"step": "0.1", "min": "20", "class": "form-control"}
+            ),
+            "measured_on": forms.DateInput(
+                attrs={"type": "date", "class": "form-control"}
+            ),
+        }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.helper = FormHelper()
+        self.helper.form_method = "post"
+        self.helper.form_action = "log_bodyweight"
+        self.helper.layout = Layout(
+            Row(
+                Column("weight", css_class="col-md-4"),
+                Column("measured_on", css_class="col-md-4"),
+                Column("sex", css_class="col-md-4"),
+            ),
+            Submit("submit", "Log Bodyweight", css_class="btn btn-primary mt-2"),
+        )
+
+    def clean_weight(self):
+        weight = self.cleaned_data["weight"]
+        if weight < 20 or weight > 400:
+            raise forms.ValidationError("Bodyweight must be between 20 and 400 kg")
+        return weight
+
+
+class FollowForm(forms.Form):
+    username = forms.CharField(
+        max_length=150,
+        label="Username",
+        widget=forms.TextInput(
+            attrs={"class": "form-control", "placeholder": "e.g. lifter"}
+        ),
+    )
+
+    def __init__(self, *args, user=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.user = user
+        self.followee = None
+        self.helper = FormHelper()
+        self.helper.form_method = "post"
+        self.helper.form_action = "follow"
+        self.helper.layout = Layout(
+            Row(Column("username", css_class="col-md-8")),
+            Submit("submit", "Follow", css_class="btn btn-primary mt-2"),
+        )
+
+    def clean_username(self):
+        username = self.cleaned_data["username"]
+        self.followee = User.objects.filter(username=username).first()
+        if self.followee is None:
+            raise forms.ValidationError(f"User '{username}' does not exist")
+        if self.followee == self.user:
+            raise forms.ValidationError("You cannot follow yourself")
+        return username
+
+
+class MesocycleForm(forms.Form):
+    """Start date posted by the mesocycle page, checked before the task is queued."""
+
+    start_date = forms.DateField(
+        input_formats=["%Y-%m-%d"],
+        error_messages={
+            "required": "Choose a start date",
+            "invalid": "Enter the start date as YYYY-MM-DD",
+        },
+    )
@@ -1,4 +1,15 @@
 from .best_set_service import BestSetService
+from .calendar_service import CalendarService
+from .coach_service import CoachService
+from .data_portability_service import ArchiveError, DataPortabilityService
+from .feed_service import FeedService
+from .forecast_service import ForecastService
+from .history_archive_service import HistoryArchiveService
+from .history_series_service import HistorySeriesService
 from .mesocycle_service import MesocycleService
 from .profile_service import ProfileService
 from .progress_service import ProgressService
+from .relative_strength_service import RelativeStrengthService
+from .rpe_service import RpeService
+from .sync_service import SyncError, SyncService
+from .volume_service import VolumeService
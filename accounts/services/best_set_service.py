@@ -3,7 +3,15 @@ from typing import Optional
 from django.db import transaction
 from django.utils import timezone
 
-from core.models import BestSet, BestSetHistory, Exercise
+from core.db_router import pin_to_primary
+from core.models import BestSet, BestSetHistory, ChangeLog, Exercise
+
+from .feed_service import FeedService
+from .forecast_service import ForecastService
+from .history_series_service import HistorySeriesService
+from .progress_service import ProgressService
+from .relative_strength_service import RelativeStrengthService
+from .rpe_service import RpeService
 
 
 class BestSetService:
@@ -11,8 +19,14 @@ class BestSetService:
 
     @staticmethod
     @transaction.atomic
-    def add_or_update_best_set(user, form_data: dict) -> tuple[bool, Optional[str]]:
-        """Add or update best set, returns (success, message)."""
+    def add_or_update_best_set(
+        user, form_data: dict, notify: bool = True
+    ) -> tuple[bool, Optional[str]]:
+        """
+        Add or update best set, returns (success, message).
+
+        notify=False leaves on_sets_changed to the caller, for batches.
+        """
         weight = form_data["weight"]
         reps = form_data["reps"]
         exercise = form_data["exercise"]
@@ -29,7 +43,7 @@ class BestSetService:
                     f"New set for '{exercise.name}' is worse than current (new 1RM: {new_1rm}kg < current: {existing_1rm}kg). Set not updated.",
                 )
 
-            BestSetHistory.objects.create(
+            history = BestSetHistory.objects.create(
                 user=user,
                 exercise=existing_set.exercise,
                 weight=existing_set.weight,
@@ -42,28 +56,63 @@ class BestSetService:
             existing_set.estimated_1rm = new_1rm
             existing_set.updated_at = timezone.now()
             existing_set.save()
+            HistorySeriesService.append(
+                user, history.exercise, history.created_at, history.estimated_1rm
+            )
+            RelativeStrengthService.score_rows(user, [history, existing_set])
+            if new_1rm > existing_1rm:
+                FeedService.record_pr(user, existing_set, previous_1rm=existing_1rm)
+            ChangeLog.objects.create(user=user, exercise=exercise, action="upsert")
+            if notify:
+                BestSetService.on_sets_changed(user)
             return True, f"Set for '{exercise.name}' updated! 1RM: {new_1rm} kg"
 
-        BestSet.objects.create(
+        best_set = BestSet.objects.create(
             user=user,
             exercise=exercise,
             weight=weight,
             reps=reps,
             estimated_1rm=new_1rm,
         )
+        RelativeStrengthService.score_rows(user, [best_set])
+        FeedService.record_pr(user, best_set)
+        ChangeLog.objects.create(user=user, exercise=exercise, action="upsert")
+        if notify:
+            BestSetService.on_sets_changed(user)
         return True, f"Set for '{exercise.name}' added! 1RM: {new_1rm} kg"
 
     @staticmethod
-    def delete_best_set(user, best_set_id: int) -> str:
+    @transaction.atomic
+    def delete_best_set(user, best_set_id: int, notify: bool = True) -> str:
         """Delete best set and its history."""
         best_set = BestSet.objects.get(id=best_set_id, user=user)
         exercise = best_set.exercise
 
         BestSetHistory.objects.filter(user=user, exercise=exercise).delete()
+        HistorySeriesService.delete(user, exercise)
         best_set.delete()
+        ChangeLog.objects.create(user=user, exercise=exercise, action="delete")
+        if notify:
+            BestSetService.on_sets_changed(user)
 
         return f"Set and history for {exercise.name} deleted"
 
+    @staticmethod
+    def on_sets_changed(user):
+        """Drop cached data and queue its rebuild once the write commits."""
+        # Read-your-own-writes: keep this session off the replica for a while.
+        pin_to_primary()
+        # Imported here: tasks import the services package.
+        from accounts.tasks import rebuild_progress_cache
+
+        def schedule():
+            ProgressService.invalidate_cache(user)
+            ForecastService.invalidate_cache(user)
+            RpeService.invalidate_cache(user)
+            rebuild_progress_cache.enqueue(user.id)
+
+        transaction.on_commit(schedule)
+
     @staticmethod
     def get_initial_exercise(exercise_id: str) -> Optional[Exercise]:
         """Get exercise for initial form data."""
@@ -0,0 +1,131 @@
+import secrets
+from datetime import timedelta
+
+from django.db.models import Count, Max
+
+from core.db_router import pin_to_primary, primary_reads
+from core.models import Mesocycle, UserProfile
+
+PRODID = "-//StrengthTrack//Mesocycles//EN"
+
+
+class CalendarService:
+    """Mesocycle weeks as an iCalendar feed behind a per-user secret URL."""
+
+    @staticmethod
+    def get_token(user) -> str:
+        """
+        The user's feed token, issued on first use. Read from the primary: a
+        replica that lags behind would not have a token issued moments ago,
+        and issuing another one breaks the URL the user just copied.
+        """
+        with primary_reads():
+            token = (
+                UserProfile.objects.filter(user=user)
+                .values_list("calendar_token", flat=True)
+                .first()
+            )
+        if token is None:
+            token = CalendarService.reset_token(user)
+        return token
+
+    @staticmethod
+    def reset_token(user) -> str:
+        """Issue a new token; the old feed URL stops working."""
+        profile = user.userprofile
+        profile.calendar_token = secrets.token_urlsafe(32)
+        profile.save(update_fields=["calendar_token"])
+        pin_to_primary()
+        return profile.calendar_token
+
+    @staticmethod
+    def get_user(token):
+        profile = UserProfile.objects.filter(calendar_token=token).select_related(
+            "user"
+        )
+        profile = profile.first()
+        return profile.user if profile else None
+
+    @staticmethod
+    def get_etag(token):
+        """
+        Version of the feed from the count and latest created_at of the
+        user's mesocycle rows, None for an unknown token. One query that is
+        answered from the (user, created_at) index, so a poll that ends in
+        304 never reads the rows themselves.
+        """
+        version = (
+            UserProfile.objects.filter(calendar_token=token)
+            .values("user_id")
+            .annotate(
+                count=Count("user__mesocycles"),
+                latest=Max("user__mesocycles__created_at"),
+            )
+            .order_by("user_id")
+            .first()
+        )
+        if version is None:
+            return None
+        latest = version["latest"].timestamp() if version["latest"] else 0
+        return f"{version['count']}-{latest:.6f}"
+
+    @staticmethod
+    def iter_calendar(user, chunk_size: int = 500):
+        """Yield the user's feed as iCalendar lines, one VEVENT per mesocycle week."""
+        yield _lines(
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            f"PRODID:{PRODID}",
+            "CALSCALE:GREGORIAN",
+            "X-WR-CALNAME:StrengthTrack mesocycles",
+        )
+        cycles = (
+            Mesocycle.objects.filter(user=user)
+            .select_related("exercise")
+            .order_by("start_date", "week", "exercise__name")
+            .iterator(chunk_size=chunk_size)
+        )
+        for cycle in cycles:
+            week_start = cycle.start_date + timedelta(days=(cycle.week - 1) * 7)
+            reps = f"{cycle.target_reps_min}-{cycle.target_reps_max}"
+            weight = f"{cycle.target_weight:g} kg"
+            yield _lines(
+                "BEGIN:VEVENT",
+                f"UID:mesocycle-{cycle.id}@strengthtrack",
+                f"DTSTAMP:{cycle.created_at:%Y%m%dT%H%M%SZ}",
+                f"DTSTART;VALUE=DATE:{week_start:%Y%m%d}",
+                f"DTEND;VALUE=DATE:{week_start + timedelta(days=7):%Y%m%d}",
+                "SUMMARY:"
+                + _escape(
+                    f"{cycle.exercise.name}: {weight} x {reps} @ RPE {cycle.rpe}"
+                ),
+                "DESCRIPTION:"
+                + _escape(
+                    f"Week {cycle.week}: {cycle.target_sets} sets of {reps} reps "
+                    f"at {weight}, RPE {cycle.rpe} (RIR {cycle.rir})"
+                ),
+                "TRANSP:TRANSPARENT",
+                "END:VEVENT",
+            )
+        yield _lines("END:VCALENDAR")
+
+
+def _escape(text: str) -> str:
+    for char in ("\\", ";", ","):
+        text = text.replace(char, "\\" + char)
+    return text.replace("\n", "\\n")
+
+
+def _lines(*lines) -> str:
+    """CRLF-terminated lines, folded at 75 octets as RFC 5545 requires."""
+    folded = []
+    for line in lines:
+        data = line.encode()
+        while len(data) > 75:
+            cut = 75
+            while data[cut] & 0xC0 == 0x80:  # Do not split a UTF-8 sequence
+                cut -= 1
+            folded.append(data[:cut].decode())
+            data = b" " + data[cut:]
+        folded.append(data.decode())
+    return "".join(line + "\r\n" for line in folded)
@@ -0,0 +1,77 @@
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+from core.models import BestSet, CoachAthlete, Mesocycle
+
+from .mesocycle_service import MAIN_EXERCISES_NAMES
+
+
+class CoachService:
+    """Builds a coach's roster of athletes."""
+
+    PAGE_SIZE = 50
+    MAIN_LIFTS = MAIN_EXERCISES_NAMES
+
+    @staticmethod
+    def is_coach(user) -> bool:
+        return CoachAthlete.objects.filter(coach=user).exists()
+
+    @staticmethod
+    def get_roster_page(coach, after: int = 0, page_size: int = PAGE_SIZE):
+        """
+        Get one page of athletes with id > after, returns (rows, next_after).
+
+        Runs two queries whatever the page size: the roster with each
+        athlete's latest PR and current mesocycle as subqueries, and the
+        main-lift best sets of the whole page.
+        """
+        latest_pr = BestSet.objects.filter(user=OuterRef("athlete_id")).order_by(
+            "-updated_at"
+        )
+        latest_cycle = Mesocycle.objects.filter(user=OuterRef("athlete_id")).order_by(
+            "-created_at"
+        )
+        links = list(
+            CoachAthlete.objects.filter(coach=coach, athlete_id__gt=after)
+            .select_related("athlete")
+            .annotate(
+                latest_pr=Subquery(latest_pr.values("updated_at")[:1]),
+                mesocycle_start=Subquery(latest_cycle.values("start_date")[:1]),
+            )
+            .order_by("athlete_id")[: page_size + 1]
+        )
+        next_after = links[page_size - 1].athlete_id if len(links) > page_size else None
+        links = links[:page_size]
+
+        lifts = {}
+        for user_id, name, estimated_1rm in BestSet.objects.filter(
+            user_id__in=[link.athlete_id for link in links],
+            exercise__name__in=CoachService.MAIN_LIFTS,
+        ).values_list("user_id", "exercise__name", "estimated_1rm"):
+            lifts.setdefault(user_id, {})[name] = estimated_1rm
+
+        today = timezone.localdate()
+        rows = [
+            {
+                "athlete": link.athlete,
+                "lifts": [
+                    lifts.get(link.athlete_id, {}).get(name)
+                    for name in CoachService.MAIN_LIFTS
+                ],
+                "latest_pr": link.latest_pr,
+                "mesocycle_start": link.mesocycle_start,
+                "mesocycle_week": _current_week(link.mesocycle_start, today),
+            }
+            for link in links
+        ]
+        return rows, next_after
+
+
+def _current_week(start_date, today):
+    """Week 1-4 of a mesocycle running today, None outside of it."""
+    if start_date is None:
+        return None
+    days = (today - start_date).days
+    if 0 <= days < 28:
+        return days // 7 + 1
+    return None
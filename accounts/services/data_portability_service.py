@@ -0,0 +1,257 @@
+import json
+import zipfile
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from core.bulk import bulk_insert
+from core.models import (
+    BestSet,
+    BestSetHistory,
+    BodyweightLog,
+    ChangeLog,
+    Exercise,
+    Mesocycle,
+    UserProfile,
+)
+
+from .history_series_service import HistorySeriesService
+from .relative_strength_service import RelativeStrengthService
+
+ARCHIVE_FORMAT = "strengthtrack-user-archive"
+ARCHIVE_VERSION = 1
+
+# Archive file name -> (model, exported fields). Exercises are stored by name.
+# Weigh-ins come first: imported sets are scored against them.
+ARCHIVE_FILES = {
+    "bodyweight.jsonl": (
+        BodyweightLog,
+        ["measured_on", "weight"],
+    ),
+    "best_sets.jsonl": (
+        BestSet,
+        ["weight", "reps", "estimated_1rm", "updated_at"],
+    ),
+    "best_set_history.jsonl": (
+        BestSetHistory,
+        ["weight", "reps", "estimated_1rm", "created_at"],
+    ),
+    "mesocycles.jsonl": (
+        Mesocycle,
+        [
+            "start_date",
+            "week",
+            "rpe",
+            "rir",
+            "target_weight",
+            "target_reps_min",
+            "target_reps_max",
+            "target_sets",
+            "created_at",
+        ],
+    ),
+}
+
+PROFILE_FIELDS = ["username", "email", "first_name", "last_name", "date_joined"]
+
+DATE_FIELDS = {"updated_at", "start_date", "measured_on"}
+DATETIME_FIELDS = {"created_at", "date_joined"}
+
+
+class ArchiveError(Exception):
+    """Raised when an archive cannot be imported."""
+
+
+class DataPortabilityService:
+    """Exports and imports all of a user's data as a single zip archive."""
+
+    @staticmethod
+    def iter_export(user, chunk_size: int = 2000, include_password: bool = False):
+        """
+        Yield the user's archive as zip bytes. Rows are streamed from the
+        database, so memory use does not depend on the amount of history.
+        The password hash is only added for include_password, which moving
+        an account to another instance needs; the download never has it.
+        """
+        sink = _StreamSink()
+        counts = {}
+
+        with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            profile = {field: getattr(user, field) for field in PROFILE_FIELDS}
+            profile["profile_created_at"] = user.userprofile.created_at
+            profile["sex"] = user.userprofile.sex
+            if include_password:
+                profile["password"] = user.password
+            archive.writestr("profile.json", _dumps(profile))
+            yield sink.pop()
+
+            for file_name, (model, fields) in ARCHIVE_FILES.items():
+                by_exercise = _by_exercise(model)
+                columns = [*fields, "exercise__name"] if by_exercise else fields
+                rows = (
+                    model.objects.filter(user=user)
+                    .order_by("id")
+                    .values_list(*columns)
+                    .iterator(chunk_size=chunk_size)
+                )
+                count = 0
+                with archive.open(file_name, "w") as archive_file:
+                    for values in rows:
+                        row = dict(zip(fields, values))
+                        if by_exercise:
+                            row["exercise"] = values[-1]
+                        archive_file.write(_dumps(row) + b"\n")
+                        count += 1
+                        if count % chunk_size == 0:
+                            yield sink.pop()
+                counts[file_name] = count
+                yield sink.pop()
+
+            manifest = {
+                "format": ARCHIVE_FORMAT,
+                "version": ARCHIVE_VERSION,
+                "exported_at": timezone.now(),
+                "username": user.username,
+                "files": counts,
+            }
+            archive.writestr("manifest.json", _dumps(manifest))
+
+        yield sink.pop()
+
+    @staticmethod
+    @transaction.atomic
+    def import_archive(archive_file, username: str = None, batch_size: int = 1000):
+        """
+        Create a user from an archive, returns (user, {file_name: row_count}).
+        Exercises are matched by name and created when missing.
+        """
+        try:
+            with zipfile.ZipFile(archive_file) as archive:
+                user, counts = _import(archive, username, batch_size)
+        except (zipfile.BadZipFile, json.JSONDecodeError, UnicodeDecodeError) as e:
+            raise ArchiveError(f"Corrupt archive: {e}")
+
+        # Sync clients (SyncService) learn about the imported best sets.
+        ChangeLog.objects.bulk_create(
+            ChangeLog(user=user, exercise_id=exercise_id, action="upsert")
+            for exercise_id in user.best_sets.values_list("exercise_id", flat=True)
+        )
+        HistorySeriesService.sync_users([user.id])
+        return user, counts
+
+
+class _StreamSink:
+    """Write-only file object that collects what zipfile writes into it."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def pop(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+class _ExerciseMap:
+    """Exercise name -> id, creating exercises missing on this instance."""
+
+    def __init__(self):
+        self.ids = dict(Exercise.objects.values_list("name", "id"))
+
+    def get_id(self, name):
+        if name not in self.ids:
+            self.ids[name] = Exercise.objects.get_or_create(name=name)[0].id
+        return self.ids[name]
+
+
+def _import(archive, username, batch_size):
+    """import_archive() of an opened zip file."""
+    try:
+        manifest = json.loads(archive.read("manifest.json"))
+        profile = json.loads(archive.read("profile.json"))
+    except KeyError as e:
+        raise ArchiveError(f"Not a user archive: {e}")
+    if manifest.get("format") != ARCHIVE_FORMAT:
+        raise ArchiveError("Not a user archive")
+    if manifest.get("version") != ARCHIVE_VERSION:
+        raise ArchiveError(f"Unsupported archive version: {manifest.get('version')}")
+
+    username = username or profile["username"]
+    if User.objects.filter(username=username).exists():
+        raise ArchiveError(f"User '{username}' already exists")
+    email_normalized = UserProfile.normalize_email(profile["email"])
+    if (
+        email_normalized
+        and UserProfile.objects.filter(email_normalized=email_normalized).exists()
+    ):
+        raise ArchiveError(f"Email '{profile['email']}' is already in use")
+
+    user = User.objects.create(
+        username=username,
+        email=profile["email"],
+        first_name=profile["first_name"],
+        last_name=profile["last_name"],
+        # Without a hash the account signs in after a password reset.
+        password=profile.get("password") or make_password(None),
+        date_joined=parse_datetime(profile["date_joined"]),
+    )
+    UserProfile.objects.filter(user=user).update(
+        created_at=parse_datetime(profile["profile_created_at"]),
+        sex=profile.get("sex", ""),
+    )
+
+    exercises = _ExerciseMap()
+    counts = {}
+    for file_name, (model, fields) in ARCHIVE_FILES.items():
+        counts[file_name] = 0
+        if file_name not in archive.namelist():
+            continue
+        with archive.open(file_name) as lines:
+            batch = []
+            for line in lines:
+                batch.append(_parse_row(json.loads(line)))
+                if len(batch) >= batch_size:
+                    counts[file_name] += _insert(model, user, batch, exercises)
+                    batch = []
+            if batch:
+                counts[file_name] += _insert(model, user, batch, exercises)
+    return user, counts
+
+
+def _dumps(data) -> bytes:
+    return json.dumps(data, cls=DjangoJSONEncoder).encode()
+
+
+def _parse_row(row):
+    for field in DATE_FIELDS & row.keys():
+        row[field] = parse_date(row[field])
+    for field in DATETIME_FIELDS & row.keys():
+        row[field] = parse_datetime(row[field])
+    return row
+
+
+def _by_exercise(model) -> bool:
+    return any(field.name == "exercise" for field in model._meta.concrete_fields)
+
+
+def _insert(model, user, rows, exercises) -> int:
+    for row in rows:
+        if "exercise" in row:
+            row["exercise_id"] = exercises.get_id(row.pop("exercise"))
+    # Archived dates would be overwritten by auto_now/auto_now_add.
+    objects = bulk_insert(model, [model(user=user, **row) for row in rows])
+
+    if model in (BestSet, BestSetHistory):
+        RelativeStrengthService.score_rows(user, objects)
+    return len(objects)
@@ -0,0 +1,150 @@
+from django.db import transaction
+from django.db.models import F, Q
+
+from core.models import CoachAthlete, FeedItem, Follow, PRActivity, UserProfile
+
+
+class FeedService:
+    """Follows and the feed of PRs from followed users and athletes."""
+
+    PAGE_SIZE = 30
+    # PRs of accounts with more followers are not copied to every follower;
+    # feeds read them from the account's own timeline instead.
+    FANOUT_LIMIT = 1000
+    BATCH_SIZE = 1000
+
+    @staticmethod
+    def record_pr(user, best_set, previous_1rm=None) -> PRActivity:
+        """Save a new PR and fan it out once the surrounding write commits."""
+        # Imported here: tasks import the services package.
+        from accounts.tasks import fan_out_activity
+
+        activity = PRActivity.objects.create(
+            user=user,
+            exercise=best_set.exercise,
+            weight=best_set.weight,
+            reps=best_set.reps,
+            estimated_1rm=best_set.estimated_1rm,
+            previous_1rm=previous_1rm,
+        )
+        transaction.on_commit(lambda: fan_out_activity.enqueue(activity.id))
+        return activity
+
+    @staticmethod
+    def fan_out(activity) -> int:
+        """
+        Copy the activity into the feeds of the lifter, their coaches and,
+        below FANOUT_LIMIT, their followers. Returns the recipients count.
+        """
+        recipients = {activity.user_id}
+        recipients.update(
+            CoachAthlete.objects.filter(athlete_id=activity.user_id).values_list(
+                "coach_id", flat=True
+            )
+        )
+        if not FeedService._is_pulled(activity.user_id):
+            recipients.update(
+                Follow.objects.filter(followee_id=activity.user_id).values_list(
+                    "follower_id", flat=True
+                )
+            )
+        # ignore_conflicts: a retried task skips the rows it already wrote.
+        FeedItem.objects.bulk_create(
+            [
+                FeedItem(recipient_id=user_id, activity=activity)
+                for user_id in recipients
+            ],
+            batch_size=FeedService.BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+        return len(recipients)
+
+    @staticmethod
+    @transaction.atomic
+    def follow(user, followee) -> bool:
+        """Follow followee, returns False if already followed."""
+        if user == followee:
+            return False
+        _, created = Follow.objects.get_or_create(follower=user, followee=followee)
+        if not created:
+            return False
+        UserProfile.objects.filter(user=followee).update(
+            follower_count=F("follower_count") + 1
+        )
+        # Show the recent PRs right away instead of from the next one on.
+        if not FeedService._is_pulled(followee.id):
+            recent = PRActivity.objects.filter(user=followee).order_by("-id")
+            FeedItem.objects.bulk_create(
+                [
+                    FeedItem(recipient=user, activity_id=activity_id)
+                    for activity_id in recent.values_list("id", flat=True)[
+                        : FeedService.PAGE_SIZE
+                    ]
+                ],
+                ignore_conflicts=True,
+            )
+        return True
+
+    @staticmethod
+    @transaction.atomic
+    def unfollow(user, followee) -> bool:
+        """Stop following followee, returns False if not followed."""
+        deleted, _ = Follow.objects.filter(follower=user, followee=followee).delete()
+        if not deleted:
+            return False
+        UserProfile.objects.filter(user=followee).update(
+            follower_count=F("follower_count") - 1
+        )
+        if not CoachAthlete.objects.filter(coach=user, athlete=followee).exists():
+            FeedItem.objects.filter(recipient=user, activity__user=followee).delete()
+        return True
+
+    @staticmethod
+    def get_following(user):
+        return (
+            Follow.objects.filter(follower=user)
+            .select_related("followee")
+            .order_by("followee__username")
+        )
+
+    @staticmethod
+    def get_feed_page(user, before: int = 0, page_size: int = PAGE_SIZE):
+        """
+        Get activities with id < before, newest first, returns
+        (activities, next_before).
+
+        One query: the user's feed items and the timelines of followed
+        accounts above FANOUT_LIMIT, each read through its index and
+        limited to the page before they are merged.
+        """
+        limit = page_size + 1
+        fanned = FeedItem.objects.filter(recipient=user)
+        pulled = PRActivity.objects.filter(
+            user__in=Follow.objects.filter(
+                follower=user,
+                followee__userprofile__follower_count__gt=FeedService.FANOUT_LIMIT,
+            ).values("followee_id")
+        )
+        if before:
+            fanned = fanned.filter(activity_id__lt=before)
+            pulled = pulled.filter(id__lt=before)
+
+        activities = list(
+            PRActivity.objects.filter(
+                Q(id__in=fanned.order_by("-activity_id").values("activity_id")[:limit])
+                | Q(id__in=pulled.order_by("-id").values("id")[:limit])
+            )
+            .select_related("user", "exercise")
+            .order_by("-id")[:limit]
+        )
+        next_before = (
+            activities[page_size - 1].id if len(activities) > page_size else None
+        )
+        return activities[:page_size], next_before
+
+    @staticmethod
+    def _is_pulled(user_id) -> bool:
+        """True if feeds read the user's PRs on demand instead of by fan-out."""
+        return UserProfile.objects.filter(
+            user_id=user_id, follower_count__gt=FeedService.FANOUT_LIMIT
+        ).exists()
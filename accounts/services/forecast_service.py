@@ -0,0 +1,131 @@
+from datetime import date
+
+import numpy as np
+from django.core.cache import cache
+from django.utils import timezone
+
+from .progress_service import ProgressService
+
+TREND_MODELS = ["linear", "log", "exponential"]
+
+
+class ForecastService:
+    """Fits 1RM trends and projects the next PR for each exercise."""
+
+    CACHE_KEY = "forecasts:{user_id}"
+
+    # Smallest jump the lifter can load: one pair of 1.25 kg plates.
+    PR_STEP = 2.5
+    MIN_POINTS = 3
+    MAX_HORIZON_DAYS = 730
+
+    @staticmethod
+    def get_forecasts(user):
+        """Get {exercise: forecast} from cache, computing it on a miss."""
+        forecasts = cache.get(ForecastService.CACHE_KEY.format(user_id=user.id))
+        if forecasts is None:
+            forecasts = ForecastService.rebuild_cache(user)
+        return forecasts
+
+    @staticmethod
+    def rebuild_cache(user):
+        """Compute forecasts and store them until the user's history changes."""
+        charts_data = ProgressService.get_progress_charts_data(user)
+        forecasts = ForecastService.fit_forecasts(charts_data)
+        cache.set(ForecastService.CACHE_KEY.format(user_id=user.id), forecasts, None)
+        return forecasts
+
+    @staticmethod
+    def invalidate_cache(user):
+        cache.delete(ForecastService.CACHE_KEY.format(user_id=user.id))
+
+    @staticmethod
+    def fit_forecasts(charts_data, today=None):
+        """
+        Fit linear, log and exponential trends to every exercise's 1RM series
+        at once, keep the best fit per exercise and solve it for the date of
+        the next PR (current best + PR_STEP).
+
+        Returns {exercise: {"model", "next_pr", "date"}}; "date" is None when
+        the trend is flat or the PR is further than MAX_HORIZON_DAYS away.
+        """
+        series = [
+            chart
+            for chart in charts_data
+            if len(chart["values"]) >= ForecastService.MIN_POINTS
+        ]
+        if not series:
+            return {}
+        today = today or timezone.now().date()
+
+        # Pad the series into (exercises x points) arrays with a mask.
+        length = max(len(chart["values"]) for chart in series)
+        days = np.zeros((len(series), length))
+        values = np.ones((len(series), length))
+        mask = np.zeros((len(series), length), dtype=bool)
+        for row, chart in enumerate(series):
+            ordinals = [date.fromisoformat(d).toordinal() for d in chart["dates"]]
+            count = len(ordinals)
+            days[row, :count] = ordinals
+            values[row, :count] = chart["values"]
+            mask[row, :count] = True
+
+        first_day = days[:, :1]
+        t = np.where(mask, days - first_day, 0.0)
+        weights = mask.astype(float)
+
+        # One least-squares fit per (model, exercise): target = a + b * feature.
+        features = np.stack([t, np.log1p(t), t])
+        targets = np.stack([values, values, np.log(values)])
+        n = weights.sum(axis=1)
+        sum_x = (features * weights).sum(axis=2)
+        sum_y = (targets * weights).sum(axis=2)
+        sum_xx = (features**2 * weights).sum(axis=2)
+        sum_xy = (features * targets * weights).sum(axis=2)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            slope = (n * sum_xy - sum_x * sum_y) / (n * sum_xx - sum_x**2)
+            intercept = (sum_y - slope * sum_x) / n
+        slope = np.nan_to_num(slope)
+        intercept = np.nan_to_num(intercept)
+
+        fitted = intercept[..., None] + slope[..., None] * features
+        fitted[2] = np.exp(fitted[2])
+        errors = (((fitted - values) ** 2) * weights).sum(axis=2)
+        best_model = errors.argmin(axis=0)
+
+        rows = np.arange(len(series))
+        a = intercept[best_model, rows]
+        b = slope[best_model, rows]
+        target = values.max(axis=1, where=mask, initial=0) + ForecastService.PR_STEP
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            target_t = np.select(
+                [best_model == 0, best_model == 1, best_model == 2],
+                [
+                    (target - a) / b,
+                    np.expm1((target - a) / b),
+                    (np.log(target) - a) / b,
+                ],
+            )
+
+        last_t = t.max(axis=1)
+        today_t = today.toordinal() - first_day[:, 0]
+        target_t = np.maximum(target_t, np.maximum(last_t, today_t))
+        reachable = (
+            (b > 0)
+            & np.isfinite(target_t)
+            & (target_t - today_t <= ForecastService.MAX_HORIZON_DAYS)
+        )
+
+        forecasts = {}
+        for row, chart in enumerate(series):
+            pr_date = None
+            if reachable[row]:
+                pr_date = date.fromordinal(
+                    int(first_day[row, 0] + np.ceil(target_t[row]))
+                )
+            forecasts[chart["exercise"]] = {
+                "model": TREND_MODELS[best_model[row]],
+                "next_pr": round(float(target[row]), 2),
+                "date": pr_date.isoformat() if pr_date else None,
+            }
+        return forecasts
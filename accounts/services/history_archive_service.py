@@ -0,0 +1,189 @@
+import gzip
+import json
+import secrets
+from datetime import timedelta
+from itertools import groupby
+from pathlib import Path
+from typing import Optional
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from core.models import BestSetHistory, Exercise
+
+from .forecast_service import ForecastService
+from .history_series_service import HistorySeriesService
+from .progress_service import ProgressService
+from .relative_strength_service import RelativeStrengthService
+
+ARCHIVE_FIELDS = [
+    "id",
+    "user_id",
+    "exercise_id",
+    "weight",
+    "reps",
+    "estimated_1rm",
+    "created_at",
+]
+
+# Keeps IN (...) lists below SQLite's bound parameter limit.
+DELETE_CHUNK_SIZE = 500
+
+
+class HistoryArchiveService:
+    """Compacts old 1RM history into monthly points and archives the raw rows."""
+
+    @staticmethod
+    def compact(
+        archive_dir, older_than_days: int, batch_size: int = 500, dry_run: bool = False
+    ) -> tuple[int, int, Optional[Path]]:
+        """
+        Keep only the best row per user, exercise and month for history older
+        than the cutoff. Removed rows go to a gzipped JSONL archive.
+        Returns (kept_count, removed_count, archive_path).
+        """
+        cutoff = timezone.now() - timedelta(days=older_than_days)
+        old_history = BestSetHistory.objects.filter(created_at__lt=cutoff)
+        user_ids = list(
+            old_history.order_by("user_id").values_list("user_id", flat=True).distinct()
+        )
+
+        archive_path = None
+        archive = None
+        if not dry_run:
+            # Unique per run and opened exclusively, so runs never share a file.
+            archive_path = Path(archive_dir) / (
+                f"best_set_history_{timezone.now():%Y%m%d_%H%M%S_%f}"
+                f"_{secrets.token_hex(4)}.jsonl.gz"
+            )
+            archive_path.parent.mkdir(parents=True, exist_ok=True)
+            archive = gzip.open(archive_path, "xt", encoding="utf-8")
+
+        kept_count = 0
+        removed_count = 0
+        try:
+            for start in range(0, len(user_ids), batch_size):
+                batch_user_ids = user_ids[start : start + batch_size]
+                rows = (
+                    old_history.filter(user_id__in=batch_user_ids)
+                    .order_by("user_id", "exercise_id", "created_at")
+                    .values(*ARCHIVE_FIELDS)
+                )
+
+                removed = []
+                for _, month_rows in groupby(rows.iterator(), key=_month_key):
+                    month_rows = list(month_rows)
+                    best = max(
+                        month_rows, key=lambda r: (r["estimated_1rm"], r["created_at"])
+                    )
+                    kept_count += 1
+                    removed.extend(row for row in month_rows if row is not best)
+
+                removed_count += len(removed)
+                if dry_run or not removed:
+                    continue
+
+                # The archive is flushed before the delete, so a failed batch
+                # leaves extra archived rows, never lost ones.
+                for row in removed:
+                    row["created_at"] = row["created_at"].isoformat()
+                    archive.write(json.dumps(row) + "\n")
+                archive.flush()
+
+                removed_ids = [row["id"] for row in removed]
+                with transaction.atomic():
+                    for i in range(0, len(removed_ids), DELETE_CHUNK_SIZE):
+                        BestSetHistory.objects.filter(
+                            id__in=removed_ids[i : i + DELETE_CHUNK_SIZE]
+                        ).delete()
+                _on_history_changed(batch_user_ids)
+        finally:
+            if archive:
+                archive.close()
+
+        if archive and not removed_count:
+            # Only this run's own, empty archive.
+            archive_path.unlink()
+            archive_path = None
+
+        return kept_count, removed_count, archive_path
+
+    @staticmethod
+    def restore(archive_path, batch_size: int = 1000) -> tuple[int, int]:
+        """
+        Insert archived rows back with their original ids and dates.
+        Rows already present or whose user/exercise is gone are skipped.
+        Returns (restored_count, skipped_count).
+        """
+        restored_count = 0
+        skipped_count = 0
+
+        with gzip.open(archive_path, "rt", encoding="utf-8") as archive:
+            batch = []
+            for line in archive:
+                batch.append(json.loads(line))
+                if len(batch) >= batch_size:
+                    restored = _restore_batch(batch)
+                    restored_count += restored
+                    skipped_count += len(batch) - restored
+                    batch = []
+            if batch:
+                restored = _restore_batch(batch)
+                restored_count += restored
+                skipped_count += len(batch) - restored
+
+        return restored_count, skipped_count
+
+
+def _month_key(row):
+    created_at = row["created_at"]
+    return row["user_id"], row["exercise_id"], created_at.year, created_at.month
+
+
+@transaction.atomic
+def _restore_batch(rows) -> int:
+    existing_ids = set(
+        BestSetHistory.objects.filter(id__in=[r["id"] for r in rows]).values_list(
+            "id", flat=True
+        )
+    )
+    user_ids = set(
+        User.objects.filter(id__in={r["user_id"] for r in rows}).values_list(
+            "id", flat=True
+        )
+    )
+    exercise_ids = set(
+        Exercise.objects.filter(id__in={r["exercise_id"] for r in rows}).values_list(
+            "id", flat=True
+        )
+    )
+
+    history = [
+        BestSetHistory(**{**row, "created_at": parse_datetime(row["created_at"])})
+        for row in rows
+        if row["id"] not in existing_ids
+        and row["user_id"] in user_ids
+        and row["exercise_id"] in exercise_ids
+    ]
+    BestSetHistory.objects.bulk_create(history)
+    # Scores are not archived; they depend on the weigh-ins at restore time.
+    history.sort(key=lambda h: h.user_id)
+    for user_id, user_history in groupby(history, key=lambda h: h.user_id):
+        RelativeStrengthService.score_rows(User(id=user_id), list(user_history))
+    _on_history_changed({h.user_id for h in history})
+    return len(history)
+
+
+def _on_history_changed(user_ids):
+    """Refresh what is derived from the users' history rows."""
+    HistorySeriesService.sync_users(user_ids)
+    cache.delete_many(
+        [
+            key.format(user_id=user_id)
+            for user_id in user_ids
+            for key in (ProgressService.CACHE_KEY, ForecastService.CACHE_KEY)
+        ]
+    )
@@ -0,0 +1,171 @@
+import datetime
+from itertools import groupby
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Length
+
+from core.models import BestSet, BestSetHistory, HistorySeries
+
+DAY_DTYPE = np.dtype("<i4")
+VALUE_DTYPE = np.dtype("<f4")
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+
+class HistorySeriesService:
+    """
+    Columnar copy of BestSetHistory: per (user, exercise) one row holding the
+    point dates and 1RMs as packed arrays, so a chart is read without an ORM
+    object per point. The rows stay the source of truth.
+    """
+
+    @staticmethod
+    def enabled() -> bool:
+        return settings.HISTORY_SERIES_STORE
+
+    @staticmethod
+    def append(user, exercise, created_at, estimated_1rm):
+        """
+        Add a history point to the end of its series, if the store is on. A
+        missing series is packed from all of the exercise's rows, so older
+        points that never reached the store are not lost.
+        """
+        if not HistorySeriesService.enabled():
+            return
+        with transaction.atomic():
+            series = (
+                HistorySeries.objects.select_for_update()
+                .filter(user=user, exercise=exercise)
+                .first()
+            )
+            if series is None:
+                HistorySeries.objects.bulk_create(
+                    _build_series(
+                        BestSetHistory.objects.filter(user=user, exercise=exercise)
+                    ),
+                    ignore_conflicts=True,
+                )
+                return
+            days, values = _pack([_epoch_day(created_at)], [estimated_1rm])
+            series.days = bytes(series.days) + days
+            series.values = bytes(series.values) + values
+            series.save(update_fields=["days", "values"])
+
+    @staticmethod
+    def delete(user, exercise):
+        HistorySeries.objects.filter(user=user, exercise=exercise).delete()
+
+    @staticmethod
+    def sync_users(user_ids):
+        """Rebuild the users' series after bulk history changes, if the store is on."""
+        if HistorySeriesService.enabled():
+            HistorySeriesService.rebuild_users(user_ids)
+
+    @staticmethod
+    @transaction.atomic
+    def rebuild_users(user_ids) -> int:
+        """Replace the users' series with ones packed from their rows, returns count."""
+        series = _build_series(BestSetHistory.objects.filter(user_id__in=user_ids))
+        HistorySeries.objects.filter(user_id__in=user_ids).delete()
+        HistorySeries.objects.bulk_create(series, batch_size=500)
+        return len(series)
+
+    @staticmethod
+    def stale_exercise_ids(user) -> set:
+        """
+        Exercises whose series is missing or holds a different number of
+        points than the user's rows, e.g. after admin edits or before the
+        first rebuild. Compares counts only; no rows or arrays are read.
+        """
+        packed = dict(
+            HistorySeries.objects.filter(user=user)
+            .annotate(size=Length("days"))
+            .values_list("exercise_id", "size")
+        )
+        counts = (
+            BestSetHistory.objects.filter(user=user)
+            .values("exercise_id")
+            .annotate(count=Count("id"))
+            .values_list("exercise_id", "count")
+            .order_by()
+        )
+        return {
+            exercise_id
+            for exercise_id, count in counts
+            if packed.get(exercise_id) != count * DAY_DTYPE.itemsize
+        }
+
+    @staticmethod
+    def build_progress_charts_data(user):
+        """
+        Same charts data as ProgressService builds from the rows, in one
+        query: every series of the user with its current best set.
+        """
+        best_set = BestSet.objects.filter(
+            user=OuterRef("user_id"), exercise=OuterRef("exercise_id")
+        )
+        rows = (
+            HistorySeries.objects.filter(user=user)
+            .annotate(
+                best_day=Subquery(best_set.values("updated_at")[:1]),
+                best_1rm=Subquery(best_set.values("estimated_1rm")[:1]),
+            )
+            .order_by("exercise__name")
+            .values_list("exercise__name", "days", "values", "best_day", "best_1rm")
+        )
+
+        charts_data = []
+        for name, days, values, best_day, best_1rm in rows:
+            days = np.frombuffer(days, DAY_DTYPE)
+            # float32 keeps 7 significant digits, enough for 1RMs to 0.01 kg.
+            values = np.round(np.frombuffer(values, VALUE_DTYPE).astype(float), 2)
+            if best_day is not None:
+                days = np.append(days, _epoch_day(best_day))
+                values = np.append(values, best_1rm)
+            order = np.argsort(days, kind="stable")
+            charts_data.append(
+                {
+                    "exercise": name,
+                    "dates": days[order].astype("datetime64[D]").astype(str).tolist(),
+                    "values": values[order].tolist(),
+                }
+            )
+        return charts_data
+
+
+def _build_series(history) -> list:
+    """Unsaved HistorySeries packed from a BestSetHistory queryset."""
+    rows = history.order_by("user_id", "exercise_id", "created_at").values_list(
+        "user_id", "exercise_id", "created_at", "estimated_1rm"
+    )
+    series = []
+    for (user_id, exercise_id), points in groupby(rows.iterator(), key=lambda r: r[:2]):
+        points = list(points)
+        days, values = _pack(
+            [_epoch_day(point[2]) for point in points],
+            [point[3] for point in points],
+        )
+        series.append(
+            HistorySeries(
+                user_id=user_id, exercise_id=exercise_id, days=days, values=values
+            )
+        )
+    return series
+
+
+def _pack(days, values) -> tuple[bytes, bytes]:
+    return (
+        np.asarray(days, dtype=DAY_DTYPE).tobytes(),
+        np.asarray(values, dtype=VALUE_DTYPE).tobytes(),
+    )
+
+
+def _epoch_day(moment) -> int:
+    """Days since 1970-01-01 of a date, or of a datetime's UTC date."""
+    if isinstance(moment, datetime.datetime):
+        if moment.tzinfo is not None:
+            moment = moment.astimezone(datetime.timezone.utc)
+        moment = moment.date()
+    return moment.toordinal() - EPOCH_ORDINAL
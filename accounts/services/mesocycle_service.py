@@ -1,6 +1,7 @@
 from datetime import timedelta
 from typing import Dict, List
 
+import numpy as np
 from django.db import transaction
 from django.utils import timezone
 
@@ -17,10 +18,10 @@ class MesocycleService:
     """Handles mesocycle generation and retrieval."""
 
     WEEKS_CONFIG = [
-        {"week": 1, "rpe": 7, "rir": 3, "mult": 0.75, "reps": (8, 12)},
-        {"week": 2, "rpe": 8, "rir": 2, "mult": 0.80, "reps": (6, 10)},
-        {"week": 3, "rpe": 10, "rir": 0, "mult": 0.9, "reps": (4, 7)},
-        {"week": 4, "rpe": 5, "rir": 5, "mult": 0.60, "reps": (10, 15)},
+        {"week": 1, "rpe": 7, "rir": 3, "mult": 0.75, "reps": (8, 12), "sets": 3},
+        {"week": 2, "rpe": 8, "rir": 2, "mult": 0.80, "reps": (6, 10), "sets": 4},
+        {"week": 3, "rpe": 10, "rir": 0, "mult": 0.9, "reps": (4, 7), "sets": 3},
+        {"week": 4, "rpe": 5, "rir": 5, "mult": 0.60, "reps": (10, 15), "sets": 2},
     ]
 
     @staticmethod
@@ -42,44 +43,105 @@ class MesocycleService:
 
     @staticmethod
     @transaction.atomic
-    def generate_mesocycle(user, start_date_str: str) -> tuple:
-        """Generate 4-week mesocycle, returns (start_date, end_date, created_count, success)."""
+    def generate_mesocycle(user, start_date_str: str, dry_run: bool = False) -> tuple:
+        """
+        Generate 4-week mesocycle, returns (start_date, end_date, changes, success).
+
+        Rows already there for the start date are diffed against the new
+        targets: only changed rows are updated, and rows are created or
+        deleted only where the grid itself changed. changes holds the
+        "created" and "deleted" rows, "updated" (row, {field: (old, new)})
+        pairs and the "unchanged" count. dry_run computes them without writing.
+        """
         start_date = timezone.datetime.strptime(start_date_str, "%Y-%m-%d").date()
 
-        Mesocycle.objects.filter(user=user, start_date=start_date).delete()
-
         main_exercises = MesocycleService.get_main_exercises()
-
-        created_count = 0
-        mesocycles_by_exercise = {}
-
+        one_rms = dict(
+            BestSet.objects.filter(user=user, exercise__in=main_exercises).values_list(
+                "exercise_id", "estimated_1rm"
+            )
+        )
+        targets = {}
         for exercise in main_exercises:
-            best_set = BestSet.objects.get(user=user, exercise=exercise)
-            base_1rm = best_set.estimated_1rm
-            cycles = []
-
+            if exercise.id not in one_rms:
+                raise BestSet.DoesNotExist(f"No best set for {exercise.name}")
             for config in MesocycleService.WEEKS_CONFIG:
-                raw_weight = base_1rm * config["mult"]
-                target_weight = round_to_plates(raw_weight)
-
-                cycle = Mesocycle.objects.create(
-                    user=user,
-                    exercise=exercise,
-                    start_date=start_date,
-                    week=config["week"],
-                    rpe=config["rpe"],
-                    rir=config["rir"],
-                    target_weight=target_weight,
-                    target_reps_min=config["reps"][0],
-                    target_reps_max=config["reps"][1],
+                targets[exercise.id, config["week"]] = {
+                    "rpe": config["rpe"],
+                    "rir": config["rir"],
+                    "target_weight": round_to_plates(
+                        one_rms[exercise.id] * config["mult"]
+                    ),
+                    "target_reps_min": config["reps"][0],
+                    "target_reps_max": config["reps"][1],
+                    "target_sets": config["sets"],
+                }
+
+        existing = Mesocycle.objects.filter(user=user, start_date=start_date)
+
+        changes = {"created": [], "updated": [], "deleted": [], "unchanged": 0}
+        seen = set()
+        for cycle in existing.select_related("exercise").order_by("id"):
+            key = (cycle.exercise_id, cycle.week)
+            if key not in targets or key in seen:
+                changes["deleted"].append(cycle)
+                continue
+            seen.add(key)
+            diff = {
+                field: (getattr(cycle, field), value)
+                for field, value in targets[key].items()
+                if getattr(cycle, field) != value
+            }
+            if diff:
+                for field, (_, value) in diff.items():
+                    setattr(cycle, field, value)
+                changes["updated"].append((cycle, diff))
+            else:
+                changes["unchanged"] += 1
+
+        exercises = {exercise.id: exercise for exercise in main_exercises}
+        for (exercise_id, week), fields in targets.items():
+            if (exercise_id, week) not in seen:
+                changes["created"].append(
+                    Mesocycle(
+                        user=user,
+                        exercise=exercises[exercise_id],
+                        start_date=start_date,
+                        week=week,
+                        **fields,
+                    )
                 )
-                cycles.append(cycle)
-                created_count += 1
 
-            mesocycles_by_exercise[exercise.name] = cycles
+        if not dry_run:
+            if changes["deleted"]:
+                Mesocycle.objects.filter(
+                    id__in=[cycle.id for cycle in changes["deleted"]]
+                ).delete()
+            if changes["updated"]:
+                fields = {field for _, diff in changes["updated"] for field in diff}
+                Mesocycle.objects.bulk_update(
+                    [cycle for cycle, _ in changes["updated"]], sorted(fields)
+                )
+            # The page shows the latest created cycle, so a regenerated one
+            # moves to the front as when it was recreated, and a changed one
+            # gets a new created_at for the calendar feed ETag.
+            changed = changes["updated"] or changes["deleted"] or changes["created"]
+            if changed or MesocycleService.get_latest_start_date(user) != start_date:
+                existing.update(created_at=timezone.now())
+            if changes["created"]:
+                Mesocycle.objects.bulk_create(changes["created"])
 
         end_date = start_date + timedelta(days=27)
-        return start_date, end_date, created_count, True
+        return start_date, end_date, changes, True
+
+    @staticmethod
+    def get_latest_start_date(user):
+        return (
+            Mesocycle.objects.filter(user=user)
+            .order_by("-created_at")
+            .values_list("start_date", flat=True)
+            .first()
+        )
 
     @staticmethod
     def get_latest_mesocycles(user) -> Dict[str, List[Mesocycle]]:
@@ -121,6 +183,9 @@ def round_to_plates(weight: float, plate_size: float = 1.25) -> float:
     """
     Round weight to the nearest achievable value using plates.
     Default: 1.25 kg plates (2.5 kg total step).
+    Works element-wise on numpy arrays of weights.
     """
     step = plate_size * 2
+    if isinstance(weight, np.ndarray):
+        return np.round(weight / step) * step
     return round(weight / step) * step
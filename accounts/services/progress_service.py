@@ -1,13 +1,62 @@
+from django.core.cache import cache
+
+from core.db_router import primary_reads
 from core.models import BestSet, BestSetHistory, Exercise
 
+from .history_series_service import HistorySeriesService
+
 
 class ProgressService:
     """Handles 1RM progress data for charts."""
 
+    CACHE_KEY = "progress_charts:{user_id}"
+
     @staticmethod
     def get_progress_charts_data(user):
+        """Get charts data from cache, building it on a miss."""
+        charts_data = cache.get(ProgressService.CACHE_KEY.format(user_id=user.id))
+        if charts_data is None:
+            charts_data = ProgressService.rebuild_cache(user)
+        return charts_data
+
+    @staticmethod
+    def rebuild_cache(user):
+        """Build charts data and store it in cache."""
+        # The cache outlives replication lag, so never fill it from the replica.
+        with primary_reads():
+            charts_data = ProgressService.build_progress_charts_data(user)
+        cache.set(ProgressService.CACHE_KEY.format(user_id=user.id), charts_data, None)
+        return charts_data
+
+    @staticmethod
+    def invalidate_cache(user):
+        """Drop cached charts data after the user's sets change."""
+        cache.delete(ProgressService.CACHE_KEY.format(user_id=user.id))
+
+    @staticmethod
+    def build_progress_charts_data(user):
         """Get charts data for all exercises with history."""
+        if not HistorySeriesService.enabled():
+            return ProgressService.build_charts_from_rows(user)
+        charts_data = HistorySeriesService.build_progress_charts_data(user)
+        stale = HistorySeriesService.stale_exercise_ids(user)
+        if stale:
+            # Series that lag behind the rows are drawn from the rows instead.
+            from_rows = ProgressService.build_charts_from_rows(user, stale)
+            names = {chart["exercise"] for chart in from_rows}
+            charts_data = [c for c in charts_data if c["exercise"] not in names]
+            charts_data = sorted(charts_data + from_rows, key=lambda c: c["exercise"])
+        return charts_data
+
+    @staticmethod
+    def build_charts_from_rows(user, exercise_ids=None):
+        """
+        Charts data from BestSetHistory rows, a few queries per exercise;
+        only for the given exercises if exercise_ids is set.
+        """
         exercises = Exercise.objects.filter(best_set_history__user=user).distinct()
+        if exercise_ids is not None:
+            exercises = exercises.filter(id__in=exercise_ids)
 
         charts_data = []
         for exercise in exercises:
@@ -0,0 +1,153 @@
+from datetime import date
+from itertools import groupby
+
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import BestSet, BestSetHistory, BodyweightLog, UserProfile
+
+# Polynomial coefficients, lowest power first, and the bodyweight range
+# each formula is defined for.
+DOTS = {
+    "M": (
+        (-307.75076, 24.0900756, -0.1918759221, 0.0007391293, -0.000001093),
+        (40, 210),
+    ),
+    "F": (
+        (-57.96288, 13.6175032, -0.1126655495, 0.0005158568, -0.0000010706),
+        (40, 150),
+    ),
+}
+WILKS = {
+    "M": (
+        (-216.0475144, 16.2606339, -0.002388645, -0.00113732, 7.01863e-06, -1.291e-08),
+        (40, 201.9),
+    ),
+    "F": (
+        (
+            594.31747775582,
+            -27.23842536447,
+            0.82112226871,
+            -0.00930733913,
+            4.731582e-05,
+            -9.054e-08,
+        ),
+        (26.51, 154.53),
+    ),
+}
+
+
+class RelativeStrengthService:
+    """Scores 1RMs against the lifter's bodyweight at the time of the set."""
+
+    @staticmethod
+    def dots(lifted: float, bodyweight: float, sex: str):
+        return _score(DOTS, lifted, bodyweight, sex)
+
+    @staticmethod
+    def wilks(lifted: float, bodyweight: float, sex: str):
+        return _score(WILKS, lifted, bodyweight, sex)
+
+    @staticmethod
+    @transaction.atomic
+    def log_bodyweight(user, weight: float, measured_on: date = None, sex: str = None):
+        """Record a weigh-in (one per day) and rescore the user's sets."""
+        BodyweightLog.objects.update_or_create(
+            user=user,
+            measured_on=measured_on or timezone.localdate(),
+            defaults={"weight": weight},
+        )
+        if sex is not None:
+            UserProfile.objects.filter(user=user).update(sex=sex)
+        RelativeStrengthService.update_users([user.id])
+
+    @staticmethod
+    def score_rows(user, rows):
+        """Score freshly saved BestSet/BestSetHistory rows of one user."""
+        sex = (
+            UserProfile.objects.filter(user=user).values_list("sex", flat=True).first()
+        )
+        weigh_ins = _weigh_ins([user.id]).get(user.id, [])
+        rows = sorted(rows, key=_row_day)
+        _apply_scores(rows, weigh_ins, sex)
+        for model in (BestSet, BestSetHistory):
+            model.objects.bulk_update(
+                [row for row in rows if isinstance(row, model)], ["dots", "wilks"]
+            )
+
+    @staticmethod
+    @transaction.atomic
+    def update_users(user_ids) -> int:
+        """
+        Rescore every best set and history row of the given users.
+
+        Each user's rows and weigh-ins are read once, sorted by day, and
+        matched with a single merge pass (an as-of join), so the cost does
+        not depend on how many rows share a weigh-in.
+        """
+        user_ids = list(user_ids)
+        weigh_ins = _weigh_ins(user_ids)
+        sexes = dict(
+            UserProfile.objects.filter(user_id__in=user_ids).values_list(
+                "user_id", "sex"
+            )
+        )
+
+        updated = 0
+        for model, day_field in (
+            (BestSet, "updated_at"),
+            (BestSetHistory, "created_at"),
+        ):
+            rows = list(
+                model.objects.filter(user_id__in=user_ids)
+                .order_by("user_id", day_field, "id")
+                .only("id", "user_id", "estimated_1rm", day_field, "dots", "wilks")
+            )
+            for user_id, user_rows in groupby(rows, key=lambda row: row.user_id):
+                _apply_scores(user_rows, weigh_ins.get(user_id, []), sexes.get(user_id))
+            model.objects.bulk_update(rows, ["dots", "wilks"], batch_size=1000)
+            updated += len(rows)
+        return updated
+
+
+def _score(table, lifted, bodyweight, sex):
+    if bodyweight is None or sex not in table:
+        return None
+    coefficients, (low, high) = table[sex]
+    bodyweight = min(max(bodyweight, low), high)
+    denominator = sum(c * bodyweight**power for power, c in enumerate(coefficients))
+    return round(lifted * 500 / denominator, 2)
+
+
+def _weigh_ins(user_ids):
+    """{user_id: [(day, weight), ...]} sorted by day."""
+    weigh_ins = {}
+    for user_id, day, weight in (
+        BodyweightLog.objects.filter(user_id__in=user_ids)
+        .order_by("user_id", "measured_on")
+        .values_list("user_id", "measured_on", "weight")
+    ):
+        weigh_ins.setdefault(user_id, []).append((day, weight))
+    return weigh_ins
+
+
+def _row_day(row) -> date:
+    if isinstance(row, BestSetHistory):
+        return timezone.localdate(row.created_at)
+    return row.updated_at
+
+
+def _apply_scores(rows, weigh_ins, sex):
+    """
+    Merge rows sorted by day with weigh-ins sorted by day: each row gets the
+    latest weigh-in on or before its day, or no score if there is none yet.
+    """
+    current = None
+    position = 0
+    for row in rows:
+        day = _row_day(row)
+        while position < len(weigh_ins) and weigh_ins[position][0] <= day:
+            current = weigh_ins[position][1]
+            position += 1
+        row.dots = RelativeStrengthService.dots(row.estimated_1rm, current, sex)
+        row.wilks = RelativeStrengthService.wilks(row.estimated_1rm, current, sex)
@@ -0,0 +1,74 @@
+import numpy as np
+from django.core.cache import cache
+
+from core.db_router import primary_reads
+from core.models import BestSet
+
+from .mesocycle_service import round_to_plates
+
+REPS = np.arange(1, 31)
+RPES = np.arange(10, 21) / 2  # 5, 5.5, ..., 10
+
+
+def _percent_table():
+    """
+    Share of 1RM for every (reps, RPE). Reps plus reps in reserve (10 - RPE)
+    is the rep max at that weight: Brzycki up to 10 reps, Epley above, where
+    Brzycki falls apart. Both give 75% at 10 reps.
+    """
+    rep_max = REPS[:, None] + (10 - RPES)[None, :]
+    brzycki = 1.0278 - 0.0278 * rep_max
+    epley = 1 / (1 + rep_max / 30)
+    return np.where(rep_max <= 10, brzycki, epley)
+
+
+PERCENT_TABLE = _percent_table()
+
+
+class RpeService:
+    """Loads for any reps x RPE target from the user's best set 1RMs."""
+
+    CACHE_KEY = "rpe_loads:{user_id}"
+
+    @staticmethod
+    def get_load_grids(user):
+        """Get the load grids from cache, computing them on a miss."""
+        grids = cache.get(RpeService.CACHE_KEY.format(user_id=user.id))
+        if grids is None:
+            grids = RpeService.rebuild_cache(user)
+        return grids
+
+    @staticmethod
+    def rebuild_cache(user):
+        """
+        Compute {"reps", "rpe", "exercises": [{"exercise", "estimated_1rm",
+        "loads"}]} and store it until the user's best sets change; loads[i][j]
+        is the load for REPS[i] at RPES[j].
+        """
+        with primary_reads():
+            best_sets = list(
+                BestSet.objects.filter(user=user)
+                .order_by("exercise__name")
+                .values_list("exercise__name", "estimated_1rm")
+            )
+        loads = RpeService.load_grids([one_rm for _, one_rm in best_sets])
+        grids = {
+            "reps": REPS.tolist(),
+            "rpe": RPES.tolist(),
+            "exercises": [
+                {"exercise": name, "estimated_1rm": one_rm, "loads": grid}
+                for (name, one_rm), grid in zip(best_sets, loads.tolist())
+            ],
+        }
+        cache.set(RpeService.CACHE_KEY.format(user_id=user.id), grids, None)
+        return grids
+
+    @staticmethod
+    def invalidate_cache(user):
+        cache.delete(RpeService.CACHE_KEY.format(user_id=user.id))
+
+    @staticmethod
+    def load_grids(one_rms):
+        """(exercises x reps x RPE) array of plate-rounded loads for the 1RMs."""
+        one_rms = np.asarray(one_rms, dtype=float).reshape(-1, 1, 1)
+        return round_to_plates(one_rms * PERCENT_TABLE)
@@ -0,0 +1,188 @@
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from accounts.forms import BestSetForm
+from core.models import BestSet, ChangeLog, SyncOperation
+
+from .best_set_service import BestSetService
+
+
+class SyncError(Exception):
+    """Raised when a sync request is malformed."""
+
+
+class SyncService:
+    """Applies batches of offline operations and returns server changes."""
+
+    MAX_OPERATIONS = 500
+    # Change log rows read per request; clients repeat while "more" is set.
+    CHANGES_LIMIT = 1000
+    MAX_KEY_LENGTH = SyncOperation._meta.get_field("key").max_length
+
+    @staticmethod
+    def sync(user, operations, cursor=None) -> dict:
+        """
+        Apply operations, then return the best sets changed after cursor.
+
+        Each operation is {"key", "type", ...}. "type" is "upsert" (with
+        "exercise" id, "weight", "reps") or "delete" (with "exercise" id).
+        Keys already applied return their stored result instead of being
+        applied again. A missing cursor returns all of the user's best sets.
+        """
+        if (
+            not isinstance(operations, list)
+            or len(operations) > SyncService.MAX_OPERATIONS
+        ):
+            raise SyncError(
+                f"operations must be a list of at most {SyncService.MAX_OPERATIONS} items"
+            )
+        if cursor is not None and not isinstance(cursor, int):
+            raise SyncError("cursor must be an integer")
+        for operation in operations:
+            if not isinstance(operation, dict) or not operation.get("key"):
+                raise SyncError("every operation needs a key")
+            if len(str(operation["key"])) > SyncService.MAX_KEY_LENGTH:
+                raise SyncError(
+                    f"keys must be at most {SyncService.MAX_KEY_LENGTH} characters"
+                )
+
+        try:
+            results = SyncService.apply_operations(user, operations)
+        except IntegrityError:
+            # A concurrent request with the same keys stored them first and
+            # this batch was rolled back; replay its stored results.
+            results = SyncService.apply_operations(user, operations)
+        changes, cursor, more = SyncService.get_changes(user, cursor)
+        return {"results": results, "changes": changes, "cursor": cursor, "more": more}
+
+    @staticmethod
+    @transaction.atomic
+    def apply_operations(user, operations) -> list:
+        """Apply new operations in one transaction, returns a result per operation."""
+        keys = [str(operation["key"]) for operation in operations]
+        applied = dict(
+            SyncOperation.objects.filter(user=user, key__in=keys).values_list(
+                "key", "result"
+            )
+        )
+
+        results = []
+        new_operations = []
+        for key, operation in zip(keys, operations):
+            if key not in applied:
+                applied[key] = SyncService._apply(user, operation)
+                new_operations.append(
+                    SyncOperation(user=user, key=key, result=applied[key])
+                )
+            results.append({"key": key, **applied[key]})
+
+        if new_operations:
+            SyncOperation.objects.bulk_create(new_operations)
+            BestSetService.on_sets_changed(user)
+        return results
+
+    @staticmethod
+    def get_changes(user, cursor=None) -> tuple[list, int, bool]:
+        """Get (best sets changed after cursor, new cursor, more pending)."""
+        if cursor is None:
+            # Full snapshot: everything up to the current end of the log.
+            last_change = ChangeLog.objects.filter(user=user).order_by("-id").first()
+            cursor = last_change.id if last_change else 0
+            best_sets = BestSet.objects.filter(user=user).select_related("exercise")
+            return [_best_set_change(best_set) for best_set in best_sets], cursor, False
+
+        log = list(
+            ChangeLog.objects.filter(user=user, id__gt=cursor)
+            .order_by("id")
+            .values_list("id", "exercise_id")[: SyncService.CHANGES_LIMIT + 1]
+        )
+        more = len(log) > SyncService.CHANGES_LIMIT
+        log = log[: SyncService.CHANGES_LIMIT]
+        if not log:
+            return [], cursor, False
+
+        exercise_ids = {exercise_id for _, exercise_id in log}
+        best_sets = {
+            best_set.exercise_id: best_set
+            for best_set in BestSet.objects.filter(
+                user=user, exercise_id__in=exercise_ids
+            ).select_related("exercise")
+        }
+        changes = [
+            (
+                _best_set_change(best_sets[exercise_id])
+                if exercise_id in best_sets
+                else {"exercise": exercise_id, "deleted": True}
+            )
+            for exercise_id in sorted(exercise_ids)
+        ]
+        return changes, log[-1][0], more
+
+    @staticmethod
+    def prune(days: int, batch_size: int = 1000) -> tuple[int, int]:
+        """
+        Delete operation results older than days, after which a retried key
+        is applied again, and change log rows of that age superseded by a
+        newer row for the same best set. Clients only read the latest state
+        of each best set, so any cursor still gets every change.
+        Returns (operations deleted, change log rows deleted).
+        """
+        cutoff = timezone.now() - timedelta(days=days)
+        newer = ChangeLog.objects.filter(
+            user=OuterRef("user"), exercise=OuterRef("exercise"), id__gt=OuterRef("id")
+        )
+        deleted = []
+        for queryset in (
+            SyncOperation.objects.filter(created_at__lt=cutoff),
+            ChangeLog.objects.filter(Exists(newer), created_at__lt=cutoff),
+        ):
+            count = 0
+            while True:
+                ids = list(queryset.values_list("id", flat=True)[:batch_size])
+                if not ids:
+                    break
+                count += queryset.model.objects.filter(id__in=ids).delete()[0]
+            deleted.append(count)
+        return tuple(deleted)
+
+    @staticmethod
+    def _apply(user, operation) -> dict:
+        if operation.get("type") == "upsert":
+            form = BestSetForm(data=operation)
+            if not form.is_valid():
+                errors = [error for errors in form.errors.values() for error in errors]
+                return {"ok": False, "message": " ".join(errors)}
+            ok, message = BestSetService.add_or_update_best_set(
+                user, form.cleaned_data, notify=False
+            )
+            return {"ok": ok, "message": message}
+
+        if operation.get("type") == "delete":
+            exercise_id = str(operation.get("exercise", ""))
+            best_set = exercise_id.isdigit() and (
+                BestSet.objects.filter(user=user, exercise_id=exercise_id).first()
+            )
+            if not best_set:
+                return {"ok": False, "message": "No best set for this exercise"}
+            message = BestSetService.delete_best_set(user, best_set.id, notify=False)
+            return {"ok": True, "message": message}
+
+        return {
+            "ok": False,
+            "message": f"Unknown operation type: {operation.get('type')}",
+        }
+
+
+def _best_set_change(best_set) -> dict:
+    return {
+        "exercise": best_set.exercise_id,
+        "exercise_name": best_set.exercise.name,
+        "weight": best_set.weight,
+        "reps": best_set.reps,
+        "estimated_1rm": best_set.estimated_1rm,
+        "updated_at": best_set.updated_at.isoformat(),
+        "deleted": False,
+    }
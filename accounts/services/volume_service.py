@@ -0,0 +1,106 @@
+import numpy as np
+from django.core.cache import cache
+
+from core.models import ExerciseMuscle, MuscleGroup
+
+from .mesocycle_service import MesocycleService
+
+
+class VolumeService:
+    """Weekly sets per muscle group from the sets planned per exercise."""
+
+    MATRIX_CACHE_KEY = "exercise_muscle_matrix"
+    # Weekly sets per muscle group that the mesocycle page recommends.
+    TARGET_SETS = (10, 20)
+
+    @staticmethod
+    def get_matrix():
+        """
+        Get {"exercises": {exercise_id: row}, "muscles": [name], "matrix"}
+        from cache, building it on a miss; matrix[row, column] is the share
+        of a set of that exercise counted for that muscle group.
+        """
+        matrix = cache.get(VolumeService.MATRIX_CACHE_KEY)
+        if matrix is None:
+            matrix = VolumeService.rebuild_matrix()
+        return matrix
+
+    @staticmethod
+    def rebuild_matrix():
+        muscles = list(MuscleGroup.objects.values_list("id", "name"))
+        columns = {muscle_id: column for column, (muscle_id, _) in enumerate(muscles)}
+        links = list(
+            ExerciseMuscle.objects.values_list(
+                "exercise_id", "muscle_id", "contribution"
+            )
+        )
+        rows = {}
+        for exercise_id, _, _ in links:
+            rows.setdefault(exercise_id, len(rows))
+
+        values = np.zeros((len(rows), len(muscles)))
+        for exercise_id, muscle_id, contribution in links:
+            values[rows[exercise_id], columns[muscle_id]] = contribution
+
+        matrix = {
+            "exercises": rows,
+            "muscles": [name for _, name in muscles],
+            "matrix": values,
+        }
+        # Dropped by a signal whenever an ExerciseMuscle row changes.
+        cache.set(VolumeService.MATRIX_CACHE_KEY, matrix, None)
+        return matrix
+
+    @staticmethod
+    def invalidate_matrix():
+        cache.delete(VolumeService.MATRIX_CACHE_KEY)
+
+    @staticmethod
+    def plan_volume(weekly_sets: dict) -> dict:
+        """
+        Weekly volume of a program given as {exercise_id: [sets in week 1,
+        week 2, ...]}, all weeks at once: (weeks x exercises) @ (exercises x
+        muscles). Exercises without muscle tags count for nothing.
+
+        Returns {"weeks": [1, ...], "muscles": [{"muscle", "weeks": [{"sets",
+        "status"}]}]} with status "under", "ok" or "over" TARGET_SETS.
+        """
+        matrix = VolumeService.get_matrix()
+        weeks = max((len(sets) for sets in weekly_sets.values()), default=0)
+        planned = np.zeros((weeks, len(matrix["exercises"])))
+        for exercise_id, sets in weekly_sets.items():
+            row = matrix["exercises"].get(exercise_id)
+            if row is not None:
+                planned[: len(sets), row] = sets
+
+        volume = planned @ matrix["matrix"]
+        low, high = VolumeService.TARGET_SETS
+        status = np.select([volume < low, volume > high], ["under", "over"], "ok")
+
+        return {
+            "weeks": list(range(1, weeks + 1)),
+            "muscles": [
+                {
+                    "muscle": name,
+                    "weeks": [
+                        {"sets": round(sets, 1), "status": week_status}
+                        for sets, week_status in zip(
+                            volume[:, column].tolist(), status[:, column].tolist()
+                        )
+                    ],
+                }
+                for column, name in enumerate(matrix["muscles"])
+            ],
+        }
+
+    @staticmethod
+    def get_cycle_volume(mesocycles_by_exercise) -> dict:
+        """plan_volume() of a mesocycle as returned by get_latest_mesocycles()."""
+        weekly_sets = {}
+        for cycles in mesocycles_by_exercise.values():
+            for cycle in cycles:
+                sets = weekly_sets.setdefault(
+                    cycle.exercise_id, [0] * len(MesocycleService.WEEKS_CONFIG)
+                )
+                sets[cycle.week - 1] = cycle.target_sets
+        return VolumeService.plan_volume(weekly_sets)
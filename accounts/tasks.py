@@ -0,0 +1,30 @@
+from django.contrib.auth.models import User
+from django.tasks import task
+
+from core.models import PRActivity
+
+from .services.feed_service import FeedService
+from .services.mesocycle_service import MesocycleService
+from .services.progress_service import ProgressService
+
+
+@task(priority=10)
+def generate_user_mesocycle(user_id: int, start_date_str: str) -> int:
+    """Generate a mesocycle in the background, returns written rows count."""
+    user = User.objects.get(id=user_id)
+    _, _, changes, _ = MesocycleService.generate_mesocycle(user, start_date_str)
+    return sum(len(changes[kind]) for kind in ("created", "updated", "deleted"))
+
+
+@task
+def rebuild_progress_cache(user_id: int):
+    """Rebuild cached progress charts after the user's sets change."""
+    user = User.objects.get(id=user_id)
+    ProgressService.rebuild_cache(user)
+
+
+@task
+def fan_out_activity(activity_id: int) -> int:
+    """Copy a new PR into its recipients' feeds, returns the recipients count."""
+    activity = PRActivity.objects.get(id=activity_id)
+    return FeedService.fan_out(activity)
@@ -1,8 +1,163 @@
+import json
+import tempfile
+import zipfile
+from datetime import date, datetime, timedelta, timezone
+from io import BytesIO, StringIO
+from pathlib import Path
+from unittest import mock
+
 from django.contrib.auth.models import User
-from django.test import TestCase
+from django.core.management import call_command
+from django.db import IntegrityError, connections
+from django.tasks import task
+from django.test import TestCase, override_settings
 from django.urls import reverse
 
-from core.models import BestSet, BestSetHistory, Exercise, UserProfile
+from accounts.forms import ProfileEmailPasswordResetForm
+from accounts.services import (
+    ArchiveError,
+    BestSetService,
+    CalendarService,
+    CoachService,
+    DataPortabilityService,
+    FeedService,
+    ForecastService,
+    HistoryArchiveService,
+    HistorySeriesService,
+    MesocycleService,
+    ProgressService,
+    RelativeStrengthService,
+    RpeService,
+    SyncService,
+    VolumeService,
+)
+from accounts.services.rpe_service import PERCENT_TABLE
+from core.db_router import replica_reads
+from core.models import (
+    BestSet,
+    BestSetHistory,
+    BodyweightLog,
+    ChangeLog,
+    CoachAthlete,
+    Exercise,
+    ExerciseMuscle,
+    FeedItem,
+    HistorySeries,
+    Mesocycle,
+    MuscleGroup,
+    PRActivity,
+    SyncOperation,
+    TaskRecord,
+    UserProfile,
+)
+
+
+@task
+def failing_task():
+    raise ValueError("boom")
+
+
+@task
+def exiting_task():
+    raise SystemExit
+
+
+class NormalizedEmailTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="lifter", email="Lifter@Example.com", password="123"
+        )
+
+    def test_profile_email_follows_user_email(self):
+        self.assertEqual(self.user.userprofile.email_normalized, "lifter@example.com")
+
+        self.user.email = "New@Example.com"
+        self.user.save()
+
+        self.user.userprofile.refresh_from_db()
+        self.assertEqual(self.user.userprofile.email_normalized, "new@example.com")
+
+    def test_registration_rejects_email_in_other_case(self):
+        response = self.client.post(
+            reverse("register"),
+            {
+                "username": "other",
+                "email": "LIFTER@example.com",
+                "password1": "StrongPass123!",
+                "password2": "StrongPass123!",
+            },
+        )
+
+        self.assertContains(response, "A user with this email already exists")
+        self.assertFalse(User.objects.filter(username="other").exists())
+
+    def test_email_in_other_case_is_left_off_profile(self):
+        other = User.objects.create_user(username="other", email="LIFTER@example.com")
+        other.save()
+
+        self.assertIsNone(other.userprofile.email_normalized)
+        self.user.save()
+        self.user.userprofile.refresh_from_db()
+        self.assertEqual(self.user.userprofile.email_normalized, "lifter@example.com")
+
+    def test_admin_forms_reject_email_in_other_case(self):
+        from core.admin import UserAddForm, UserEditForm
+
+        other = User.objects.create_user(username="other", email="other@example.com")
+        add_form = UserAddForm(
+            {
+                "username": "new",
+                "email": "lifter@EXAMPLE.com",
+                "usable_password": "false",
+            }
+        )
+        edit_form = UserEditForm(
+            {
+                "username": "other",
+                "email": "Lifter@example.com",
+                "date_joined": other.date_joined,
+            },
+            instance=other,
+        )
+
+        self.assertIn("email", add_form.errors)
+        self.assertIn(
+            "A user with this email already exists", edit_form.errors["email"]
+        )
+        own_form = UserEditForm(
+            {
+                "username": "lifter",
+                "email": "LIFTER@example.com",
+                "date_joined": self.user.date_joined,
+            },
+            instance=self.user,
+        )
+        self.assertTrue(own_form.is_valid())
+
+    def test_password_reset_finds_user_by_normalized_email(self):
+        form = ProfileEmailPasswordResetForm()
+
+        self.assertEqual(list(form.get_users(" lifter@EXAMPLE.com")), [self.user])
+
+    def test_backfill_fills_missing_profiles_and_skips_duplicates(self):
+        UserProfile.objects.update(email_normalized=None)
+        User.objects.bulk_create(
+            [
+                User(username="no_profile", email="Solo@example.com"),
+                User(username="duplicate", email="lifter@example.COM"),
+            ]
+        )
+
+        call_command("backfill_profile_emails", batch_size=1, stdout=StringIO())
+
+        self.assertEqual(
+            dict(UserProfile.objects.values_list("user__username", "email_normalized")),
+            {
+                "lifter": "lifter@example.com",
+                "no_profile": "solo@example.com",
+                "duplicate": None,
+            },
+        )
 
 
 class BestSetModelTest(TestCase):
@@ -104,3 +259,1065 @@ class Progress1RMTest(TestCase):
         response = self.client.get(reverse("progress_1rm"))
 
         self.assertContains(response, "Deadlift")
+
+
+@override_settings(HISTORY_SERIES_STORE=True)
+class HistorySeriesTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="test", password="123")
+        self.squat = Exercise.objects.create(name="Barbell Back Squat")
+        self.bench = Exercise.objects.create(name="Barbell Bench Press")
+        for exercise, weights in (
+            (self.squat, [100, 102.5, 107.5]),
+            (self.bench, [80, 83.3]),
+        ):
+            for weight in weights:
+                BestSetService.add_or_update_best_set(
+                    self.user, {"exercise": exercise, "weight": weight, "reps": 3}
+                )
+
+    def test_series_match_history_rows(self):
+        with self.assertNumQueries(1):
+            charts_data = HistorySeriesService.build_progress_charts_data(self.user)
+
+        self.assertEqual(charts_data, ProgressService.build_charts_from_rows(self.user))
+        self.assertEqual(len(charts_data[0]["values"]), 3)
+        self.assertEqual(charts_data[1]["values"], [84.71, 88.2])
+
+    def test_rebuild_and_delete(self):
+        appended = HistorySeriesService.build_progress_charts_data(self.user)
+        HistorySeriesService.rebuild_users([self.user.id])
+        self.assertEqual(
+            HistorySeriesService.build_progress_charts_data(self.user), appended
+        )
+
+        BestSetService.delete_best_set(
+            self.user, BestSet.objects.get(user=self.user, exercise=self.squat).id
+        )
+        self.assertEqual(
+            list(HistorySeries.objects.values_list("exercise__name", flat=True)),
+            ["Barbell Bench Press"],
+        )
+
+    def test_charts_fall_back_to_rows_for_stale_series(self):
+        expected = ProgressService.build_charts_from_rows(self.user)
+        HistorySeries.objects.filter(exercise=self.squat).delete()
+        BestSetHistory.objects.create(
+            user=self.user, exercise=self.bench, weight=70, reps=3, estimated_1rm=74.1
+        )
+
+        self.assertEqual(
+            HistorySeriesService.stale_exercise_ids(self.user),
+            {self.squat.id, self.bench.id},
+        )
+        self.assertEqual(
+            ProgressService.build_progress_charts_data(self.user),
+            ProgressService.build_charts_from_rows(self.user),
+        )
+        self.assertEqual(
+            ProgressService.build_progress_charts_data(self.user)[0], expected[0]
+        )
+
+    def test_append_packs_older_rows_into_a_new_series(self):
+        HistorySeries.objects.filter(exercise=self.squat).delete()
+        BestSetService.add_or_update_best_set(
+            self.user, {"exercise": self.squat, "weight": 110, "reps": 3}
+        )
+
+        self.assertEqual(HistorySeriesService.stale_exercise_ids(self.user), set())
+        self.assertEqual(
+            HistorySeriesService.build_progress_charts_data(self.user),
+            ProgressService.build_charts_from_rows(self.user),
+        )
+
+
+class ForecastTest(TestCase):
+    def chart(self, exercise, values, step=7):
+        start = date(2026, 1, 1).toordinal()
+        dates = [date.fromordinal(start + i * step) for i in range(len(values))]
+        return {
+            "exercise": exercise,
+            "dates": [d.isoformat() for d in dates],
+            "values": values,
+        }
+
+    def test_trends_project_next_pr(self):
+        forecasts = ForecastService.fit_forecasts(
+            [
+                self.chart("Squat", [100, 102.5, 105, 107.5]),
+                self.chart("Bench", [80, 80, 80]),
+                self.chart("Deadlift", [140, 150]),
+            ],
+            today=date(2026, 1, 22),
+        )
+
+        self.assertEqual(
+            forecasts["Squat"],
+            {"model": "linear", "next_pr": 110.0, "date": "2026-01-29"},
+        )
+        self.assertIsNone(forecasts["Bench"]["date"])
+        self.assertNotIn("Deadlift", forecasts)
+
+    def test_progress_page_shows_forecast_and_new_sets_refresh_it(self):
+        user = User.objects.create_user(username="test", password="123")
+        exercise = Exercise.objects.create(name="Deadlift")
+        for weight in (100, 110, 120):
+            BestSetHistory.objects.create(
+                user=user,
+                exercise=exercise,
+                weight=weight,
+                reps=1,
+                estimated_1rm=weight,
+            )
+        BestSet.objects.create(
+            user=user, exercise=exercise, weight=130, reps=1, estimated_1rm=130
+        )
+        self.client.login(username="test", password="123")
+
+        response = self.client.get(reverse("progress_1rm"))
+        self.assertContains(response, "Next PR: <strong>132.5 kg</strong>")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            BestSetService.add_or_update_best_set(
+                user, {"exercise": exercise, "weight": 140, "reps": 1}
+            )
+
+        self.assertEqual(
+            ForecastService.get_forecasts(user)["Deadlift"]["next_pr"], 142.5
+        )
+
+
+class RpeCalculatorTest(TestCase):
+    def test_percent_table(self):
+        self.assertEqual(PERCENT_TABLE.shape, (30, 11))
+        self.assertAlmostEqual(PERCENT_TABLE[0, -1], 1.0)  # 1 rep at RPE 10
+        self.assertAlmostEqual(PERCENT_TABLE[4, 6], 1.0278 - 0.0278 * 7)  # 5 @ 8
+        self.assertAlmostEqual(PERCENT_TABLE[19, -1], 1 / (1 + 20 / 30))  # 20 @ 10
+
+    def test_loads_are_served_and_refreshed_with_best_sets(self):
+        user = User.objects.create_user(username="test", password="123")
+        squat = Exercise.objects.create(name="Barbell Back Squat")
+        BestSet.objects.create(user=user, exercise=squat, weight=200, reps=1)
+        self.client.login(username="test", password="123")
+
+        grids = self.client.get(reverse("rpe_loads")).json()
+        self.assertEqual(grids["rpe"][0], 5)
+        self.assertEqual(grids["exercises"][0]["loads"][0][-1], 200)
+        self.assertEqual(grids["exercises"][0]["loads"][4][6], 167.5)  # 5 @ 8
+
+        with self.captureOnCommitCallbacks(execute=True):
+            BestSetService.add_or_update_best_set(
+                user, {"exercise": squat, "weight": 220, "reps": 1}
+            )
+
+        loads = RpeService.get_load_grids(user)["exercises"][0]["loads"]
+        self.assertEqual(loads[0][-1], 220)
+
+        self.client.logout()
+        self.assertEqual(self.client.get(reverse("rpe_loads")).status_code, 401)
+
+
+class RelativeStrengthTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="test", password="123")
+        self.exercise = Exercise.objects.create(name="Deadlift")
+        UserProfile.objects.filter(user=self.user).update(sex="M")
+
+    def test_scores_match_reference_values(self):
+        self.assertEqual(RelativeStrengthService.dots(600, 100, "M"), 369.31)
+        self.assertEqual(RelativeStrengthService.wilks(600, 100, "M"), 365.15)
+        self.assertIsNone(RelativeStrengthService.dots(600, 100, ""))
+
+    def test_rows_use_bodyweight_in_effect_at_the_time(self):
+        start = datetime(2026, 1, 1, 12, tzinfo=timezone.utc)
+        for day in (0, 5, 12):
+            BestSetHistory.objects.create(
+                user=self.user,
+                exercise=self.exercise,
+                weight=200,
+                reps=1,
+                estimated_1rm=200,
+                created_at=start + timedelta(days=day),
+            )
+        for day, weight in ((1, 80), (10, 90)):
+            BodyweightLog.objects.create(
+                user=self.user, measured_on=date(2026, 1, 1 + day), weight=weight
+            )
+
+        call_command("compute_relative_strength", stdout=StringIO())
+
+        scores = list(
+            BestSetHistory.objects.order_by("created_at").values_list("dots", flat=True)
+        )
+        self.assertEqual(
+            scores,
+            [
+                None,
+                RelativeStrengthService.dots(200, 80, "M"),
+                RelativeStrengthService.dots(200, 90, "M"),
+            ],
+        )
+
+    def test_logging_bodyweight_scores_current_sets(self):
+        self.client.login(username="test", password="123")
+        self.client.post(
+            reverse("add_best_set"),
+            {"exercise": self.exercise.id, "weight": 200, "reps": 1},
+        )
+        self.assertIsNone(BestSet.objects.get(user=self.user).dots)
+
+        self.client.post(
+            reverse("log_bodyweight"),
+            {"weight": 100, "measured_on": date.today().isoformat(), "sex": "M"},
+        )
+
+        best_set = BestSet.objects.get(user=self.user)
+        self.assertEqual(best_set.dots, RelativeStrengthService.dots(200, 100, "M"))
+        self.assertContains(self.client.get(reverse("profile")), "DOTS / Wilks")
+
+    def test_bodyweight_can_be_logged_without_sex(self):
+        self.client.login(username="test", password="123")
+
+        self.client.post(
+            reverse("log_bodyweight"),
+            {"weight": 100, "measured_on": date.today().isoformat(), "sex": ""},
+        )
+
+        self.assertTrue(
+            BodyweightLog.objects.filter(user=self.user, weight=100).exists()
+        )
+        self.assertEqual(UserProfile.objects.get(user=self.user).sex, "")
+
+
+class MuscleVolumeTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="test", password="123")
+        quads = MuscleGroup.objects.create(name="Quads")
+        glutes = MuscleGroup.objects.create(name="Glutes")
+        MuscleGroup.objects.create(name="Calves")
+        self.squat = Exercise.objects.create(name="Barbell Back Squat")
+        self.press = Exercise.objects.create(name="Leg Press")
+        self.curl = Exercise.objects.create(name="Barbell Curl")  # Not tagged
+        for exercise, muscle, contribution in (
+            (self.squat, quads, 1),
+            (self.squat, glutes, 0.5),
+            (self.press, quads, 1),
+        ):
+            ExerciseMuscle.objects.create(
+                exercise=exercise, muscle=muscle, contribution=contribution
+            )
+
+    def volume(self, plan):
+        return {
+            row["muscle"]: [(cell["sets"], cell["status"]) for cell in row["weeks"]]
+            for row in VolumeService.plan_volume(plan)["muscles"]
+        }
+
+    def test_plan_volume_per_week(self):
+        volume = self.volume(
+            {
+                self.squat.id: [6, 10, 4],
+                self.press.id: [6, 12],
+                self.curl.id: [3, 3, 3],
+            }
+        )
+
+        self.assertEqual(volume["Quads"], [(12, "ok"), (22, "over"), (4, "under")])
+        self.assertEqual(volume["Glutes"], [(3, "under"), (5, "under"), (2, "under")])
+        self.assertEqual(volume["Calves"], [(0, "under")] * 3)
+
+    def test_matrix_is_cached_until_tags_change(self):
+        VolumeService.get_matrix()
+        with self.assertNumQueries(1):  # The cache read
+            VolumeService.get_matrix()
+
+        ExerciseMuscle.objects.filter(
+            exercise=self.squat, muscle__name="Glutes"
+        ).update(contribution=1)
+        ExerciseMuscle.objects.get(exercise=self.squat, muscle__name="Glutes").save()
+
+        self.assertEqual(self.volume({self.squat.id: [10]})["Glutes"], [(10, "ok")])
+
+    def test_mesocycle_page_shows_cycle_volume(self):
+        for week, sets in enumerate([3, 4, 3, 2], start=1):
+            Mesocycle.objects.create(
+                user=self.user,
+                exercise=self.squat,
+                start_date=date(2026, 1, 5),
+                week=week,
+                rpe=7,
+                rir=3,
+                target_weight=100,
+                target_reps_min=8,
+                target_reps_max=12,
+                target_sets=sets,
+            )
+        self.client.login(username="test", password="123")
+
+        response = self.client.get(reverse("mesocycle"))
+
+        self.assertEqual(
+            [
+                cell["sets"]
+                for cell in response.context["volume"]["muscles"][1]["weeks"]
+            ],
+            [1.5, 2, 1.5, 1],
+        )
+        self.assertContains(response, "Weekly Volume")
+
+
+class MesocycleRegenerationTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="test", password="123")
+        self.best_sets = {
+            name: BestSet.objects.create(
+                user=self.user,
+                exercise=Exercise.objects.create(name=name),
+                weight=100,
+                reps=5,
+            )
+            for name in ["Barbell Back Squat", "Barbell Bench Press", "Deadlift"]
+        }
+        MesocycleService.generate_mesocycle(self.user, "2026-01-05")
+
+    def test_regeneration_updates_only_changed_rows(self):
+        ids = set(Mesocycle.objects.values_list("id", flat=True))
+        best_set = self.best_sets["Deadlift"]
+        best_set.weight = 140
+        best_set.save()
+
+        # Exercises, best sets, existing rows, one bulk update, the
+        # created_at update and the savepoint pair of atomic().
+        with self.assertNumQueries(7):
+            _, _, changes, _ = MesocycleService.generate_mesocycle(
+                self.user, "2026-01-05"
+            )
+
+        self.assertEqual(set(Mesocycle.objects.values_list("id", flat=True)), ids)
+        self.assertEqual(len(changes["updated"]), 4)
+        self.assertEqual(changes["unchanged"], 8)
+        self.assertEqual(
+            set(field for _, diff in changes["updated"] for field in diff),
+            {"target_weight"},
+        )
+        self.assertEqual(
+            Mesocycle.objects.get(exercise=best_set.exercise, week=1).target_weight,
+            round(best_set.estimated_1rm * 0.75 / 2.5) * 2.5,
+        )
+
+    def test_regeneration_restores_missing_and_drops_extra_rows(self):
+        Mesocycle.objects.filter(week=4, exercise__name="Deadlift").delete()
+        extra = Mesocycle.objects.get(week=1, exercise__name="Deadlift")
+        extra.pk = None
+        extra.save()
+
+        _, _, changes, _ = MesocycleService.generate_mesocycle(self.user, "2026-01-05")
+
+        self.assertEqual(len(changes["created"]), 1)
+        self.assertEqual(changes["deleted"], [extra])
+        self.assertEqual(Mesocycle.objects.count(), 12)
+
+    def test_dry_run_makes_no_writes(self):
+        Mesocycle.objects.filter(week=4).delete()
+        Mesocycle.objects.filter(week=1).update(target_sets=5)
+        before = list(Mesocycle.objects.order_by("id").values())
+
+        _, _, changes, _ = MesocycleService.generate_mesocycle(
+            self.user, "2026-01-05", dry_run=True
+        )
+
+        self.assertEqual(list(Mesocycle.objects.order_by("id").values()), before)
+        self.assertEqual(len(changes["created"]), 3)
+        self.assertEqual(
+            [diff for _, diff in changes["updated"]], [{"target_sets": (5, 3)}] * 3
+        )
+
+    def test_regenerated_older_cycle_becomes_latest(self):
+        MesocycleService.generate_mesocycle(self.user, "2026-02-02")
+
+        MesocycleService.generate_mesocycle(self.user, "2026-01-05")
+
+        cycles = MesocycleService.get_latest_mesocycles(self.user)
+        self.assertEqual(cycles["Deadlift"][0].start_date, date(2026, 1, 5))
+
+    def test_invalid_start_date_is_rejected_before_queueing(self):
+        self.client.login(username="test", password="123")
+
+        for data in [{"start_date": "2026-13-40"}, {"start_date": "x", "preview": ""}]:
+            response = self.client.post(reverse("mesocycle"), data, follow=True)
+            self.assertContains(response, "Enter the start date as YYYY-MM-DD")
+        self.assertFalse(TaskRecord.objects.exists())
+
+    def test_preview_button_shows_changes(self):
+        self.client.login(username="test", password="123")
+        Mesocycle.objects.filter(week=4).delete()
+
+        response = self.client.post(
+            reverse("mesocycle"),
+            {"start_date": "2026-01-05", "preview": ""},
+            follow=True,
+        )
+
+        self.assertContains(response, "would create 3, update 0 and delete 0 entries")
+        self.assertEqual(Mesocycle.objects.count(), 9)
+
+
+class CalendarFeedTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="test", password="123")
+        for name in ["Barbell Back Squat", "Barbell Bench Press", "Deadlift"]:
+            BestSet.objects.create(
+                user=self.user,
+                exercise=Exercise.objects.create(name=name),
+                weight=100,
+                reps=5,
+            )
+        MesocycleService.generate_mesocycle(self.user, "2026-01-05")
+        self.url = reverse(
+            "mesocycle_calendar", args=[CalendarService.get_token(self.user)]
+        )
+
+    def test_feed_has_event_per_week(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response["Content-Type"], "text/calendar; charset=utf-8")
+        feed = b"".join(response.streaming_content).decode()
+        self.assertTrue(feed.startswith("BEGIN:VCALENDAR\r\n"))
+        self.assertEqual(feed.count("BEGIN:VEVENT"), 12)
+        self.assertIn("DTSTART;VALUE=DATE:20260112\r\nDTEND;VALUE=DATE:20260119", feed)
+        self.assertIn("SUMMARY:Deadlift: 90 kg x 6-10 @ RPE 8\r\n", feed)
+        self.assertIn("DESCRIPTION:Week 2: 4 sets of 6-10 reps at 90 kg\\, RPE 8", feed)
+
+    def test_unchanged_feed_is_not_modified(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        with self.assertNumQueries(1):  # The ETag, without the mesocycle rows
+            response = self.client.get(self.url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 304)
+
+        best_set = BestSet.objects.get(exercise__name="Deadlift")
+        best_set.weight = 140
+        best_set.save()
+        MesocycleService.generate_mesocycle(self.user, "2026-01-05")
+
+        response = self.client.get(self.url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_reset_token_disables_old_url(self):
+        self.client.login(username="test", password="123")
+
+        self.client.post(reverse("reset_calendar_token"))
+
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+        self.assertContains(
+            self.client.get(reverse("profile")),
+            UserProfile.objects.get(user=self.user).calendar_token,
+        )
+
+    def test_token_is_read_from_the_primary_and_pins_on_issue(self):
+        token = UserProfile.objects.get(user=self.user).calendar_token
+        stale_user = User.objects.get(id=self.user.id)
+        stale_user.userprofile.calendar_token = None  # As a lagging replica has it
+
+        self.assertEqual(CalendarService.get_token(stale_user), token)
+
+        replica = {"replica": connections.settings["default"]}
+        with mock.patch.dict(connections.settings, replica), replica_reads():
+            self.assertEqual(Exercise.objects.all().db, "replica")
+            CalendarService.reset_token(self.user)
+            self.assertEqual(Exercise.objects.all().db, "default")
+
+
+class CoachDashboardTest(TestCase):
+    def setUp(self):
+        self.coach = User.objects.create_user(username="coach", password="123")
+        self.squat = Exercise.objects.create(name="Barbell Back Squat")
+
+    def add_athletes(self, count):
+        offset = User.objects.count()
+        for i in range(count):
+            athlete = User.objects.create_user(username=f"athlete{offset + i}")
+            CoachAthlete.objects.create(coach=self.coach, athlete=athlete)
+            BestSet.objects.create(
+                user=athlete, exercise=self.squat, weight=100 + i, reps=1
+            )
+            Mesocycle.objects.create(
+                user=athlete,
+                exercise=self.squat,
+                start_date=date.today() - timedelta(days=8),
+                week=1,
+                rpe=7,
+                rir=3,
+                target_weight=75,
+                target_reps_min=8,
+                target_reps_max=12,
+            )
+
+    def test_roster_queries_do_not_grow_with_athletes(self):
+        self.add_athletes(2)
+        with self.assertNumQueries(2):
+            rows, _ = CoachService.get_roster_page(self.coach)
+        self.assertEqual(rows[0]["lifts"], [100, None, None])
+        self.assertEqual(rows[0]["mesocycle_week"], 2)
+        self.assertEqual(rows[0]["latest_pr"], date.today())
+
+        self.add_athletes(20)
+        with self.assertNumQueries(2):
+            rows, _ = CoachService.get_roster_page(self.coach)
+        self.assertEqual(len(rows), 22)
+
+    def test_roster_pages_by_athlete_id(self):
+        self.add_athletes(5)
+        User.objects.create_user(username="stranger")
+
+        first, after = CoachService.get_roster_page(self.coach, page_size=3)
+        second, last = CoachService.get_roster_page(self.coach, after, page_size=3)
+
+        names = [row["athlete"].username for row in first + second]
+        self.assertEqual(names, [f"athlete{i}" for i in range(1, 6)])
+        self.assertIsNone(last)
+
+        self.client.login(username="coach", password="123")
+        response = self.client.get(reverse("coach_dashboard"), {"after": after})
+        self.assertContains(response, "athlete4")
+        self.assertNotContains(response, "athlete1<")
+
+
+class FeedTest(TestCase):
+    def setUp(self):
+        self.lifter = User.objects.create_user(username="lifter", password="123")
+        self.fan = User.objects.create_user(username="fan", password="123")
+        self.coach = User.objects.create_user(username="coach")
+        self.stranger = User.objects.create_user(username="stranger")
+        self.squat = Exercise.objects.create(name="Barbell Back Squat")
+        CoachAthlete.objects.create(coach=self.coach, athlete=self.lifter)
+
+    def add_set(self, weight):
+        with self.captureOnCommitCallbacks(execute=True):
+            BestSetService.add_or_update_best_set(
+                self.lifter, {"exercise": self.squat, "weight": weight, "reps": 1}
+            )
+        call_command("run_worker", "--burst", stdout=StringIO())
+
+    def feed(self, user, before=0, page_size=FeedService.PAGE_SIZE):
+        activities, next_before = FeedService.get_feed_page(user, before, page_size)
+        return [activity.weight for activity in activities], next_before
+
+    def test_prs_are_fanned_out_to_followers_and_coaches(self):
+        self.assertTrue(FeedService.follow(self.fan, self.lifter))
+        self.assertFalse(FeedService.follow(self.fan, self.lifter))
+
+        self.add_set(100)
+        self.add_set(90)  # Not a PR
+        self.add_set(110)
+
+        for user in (self.lifter, self.fan, self.coach):
+            self.assertEqual(self.feed(user), ([110, 100], None))
+        self.assertEqual(self.feed(self.stranger), ([], None))
+        self.assertEqual(PRActivity.objects.first().gain, None)
+        self.assertEqual(PRActivity.objects.last().gain, 10)
+
+        self.assertTrue(FeedService.unfollow(self.fan, self.lifter))
+        self.assertEqual(self.feed(self.fan), ([], None))
+        self.assertEqual(self.lifter.userprofile.follower_count, 0)
+
+    def test_new_follower_gets_recent_prs(self):
+        self.add_set(100)
+        FeedService.follow(self.fan, self.lifter)
+        self.assertEqual(self.feed(self.fan), ([100], None))
+
+    def test_celebrity_prs_are_read_from_their_timeline(self):
+        FeedService.follow(self.fan, self.lifter)
+        FeedService.follow(self.stranger, self.lifter)
+
+        with mock.patch.object(FeedService, "FANOUT_LIMIT", 1):
+            self.add_set(100)
+            self.add_set(110)
+
+            self.assertEqual(
+                set(FeedItem.objects.values_list("recipient__username", flat=True)),
+                {"lifter", "coach"},
+            )
+            for user in (self.fan, self.stranger, self.coach):
+                with self.assertNumQueries(1):
+                    self.assertEqual(self.feed(user), ([110, 100], None))
+
+    def test_feed_pages_by_cursor(self):
+        FeedService.follow(self.fan, self.lifter)
+        for weight in range(100, 105):
+            self.add_set(weight)
+
+        first, before = self.feed(self.fan, page_size=3)
+        second, last = self.feed(self.fan, before, page_size=3)
+
+        self.assertEqual(first + second, [104, 103, 102, 101, 100])
+        self.assertIsNone(last)
+
+        self.client.login(username="fan", password="123")
+        response = self.client.get(reverse("feed"), {"before": before})
+        self.assertContains(response, "101")
+        self.assertNotContains(response, "104.0 kg")
+
+    def test_follow_view(self):
+        self.client.login(username="fan", password="123")
+
+        response = self.client.post(reverse("follow"), {"username": "lifter"})
+        self.assertRedirects(response, reverse("feed"))
+        self.client.post(reverse("follow"), {"username": "fan"})
+        self.client.post(reverse("follow"), {"username": "nobody"})
+
+        self.assertEqual(
+            list(
+                FeedService.get_following(self.fan).values_list(
+                    "followee__username", flat=True
+                )
+            ),
+            ["lifter"],
+        )
+        self.client.post(reverse("unfollow", args=[self.lifter.id]))
+        self.assertFalse(FeedService.get_following(self.fan).exists())
+
+
+class SyncApiTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="test", password="123")
+        self.squat = Exercise.objects.create(name="Barbell Back Squat")
+        self.bench = Exercise.objects.create(name="Barbell Bench Press")
+        self.client.login(username="test", password="123")
+
+    def upsert(self, key, exercise, weight):
+        return {
+            "key": key,
+            "type": "upsert",
+            "exercise": exercise.id,
+            "weight": weight,
+            "reps": 5,
+        }
+
+    def sync(self, operations, cursor=None):
+        response = self.client.post(
+            reverse("sync"),
+            json.dumps({"operations": operations, "cursor": cursor}),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_batch_is_applied_once(self):
+        operations = [
+            self.upsert("a", self.squat, 100),
+            self.upsert("b", self.squat, 110),
+            self.upsert("c", self.bench, 0),
+        ]
+
+        first = self.sync(operations)
+        retry = self.sync(operations)
+
+        self.assertEqual([r["ok"] for r in first["results"]], [True, True, False])
+        self.assertEqual(retry["results"], first["results"])
+        self.assertEqual(BestSetHistory.objects.filter(user=self.user).count(), 1)
+        self.assertEqual(BestSet.objects.get(user=self.user).weight, 110)
+
+    def test_changes_since_cursor(self):
+        snapshot = self.sync([self.upsert("a", self.squat, 100)])
+        self.assertEqual([c["weight"] for c in snapshot["changes"]], [100])
+
+        BestSetService.add_or_update_best_set(
+            self.user, {"exercise": self.bench, "weight": 80, "reps": 5}
+        )
+        delta = self.sync(
+            [{"key": "b", "type": "delete", "exercise": self.squat.id}],
+            cursor=snapshot["cursor"],
+        )
+
+        self.assertEqual(
+            [(c["exercise"], c["deleted"]) for c in delta["changes"]],
+            [(self.squat.id, True), (self.bench.id, False)],
+        )
+        self.assertEqual(self.sync([], cursor=delta["cursor"])["changes"], [])
+
+    def test_rejects_anonymous_and_malformed_requests(self):
+        long_key = json.dumps({"operations": [self.upsert("k" * 65, self.squat, 100)]})
+        for body in ["[]", '{"operations": [{"type": "upsert"}]}', long_key]:
+            response = self.client.post(
+                reverse("sync"), body, content_type="application/json"
+            )
+            self.assertEqual(response.status_code, 400)
+
+        self.client.logout()
+        response = self.client.post(
+            reverse("sync"), "{}", content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 401)
+
+    def test_batch_losing_a_race_replays_stored_results(self):
+        apply_operations = SyncService.apply_operations
+        calls = []
+
+        def lose_race(user, operations):
+            if not calls:
+                calls.append(True)
+                # Another request stored the key between the read and the insert.
+                SyncOperation.objects.create(
+                    user=user, key="a", result={"ok": True, "message": "Stored"}
+                )
+                raise IntegrityError
+            return apply_operations(user, operations)
+
+        with mock.patch.object(SyncService, "apply_operations", side_effect=lose_race):
+            result = self.sync([self.upsert("a", self.squat, 100)])
+
+        self.assertEqual(
+            result["results"], [{"key": "a", "ok": True, "message": "Stored"}]
+        )
+        self.assertFalse(BestSet.objects.exists())
+
+    def test_prune_keeps_latest_change_per_best_set(self):
+        first = self.sync([self.upsert("a", self.squat, 100)])
+        self.sync([self.upsert("b", self.squat, 110), self.upsert("c", self.bench, 80)])
+        month_ago = datetime.now(timezone.utc) - timedelta(days=31)
+        ChangeLog.objects.update(created_at=month_ago)
+        SyncOperation.objects.filter(key="a").update(created_at=month_ago)
+
+        call_command("prune_sync_log", "--days", "30", stdout=StringIO())
+
+        self.assertEqual(
+            sorted(SyncOperation.objects.values_list("key", flat=True)), ["b", "c"]
+        )
+        self.assertEqual(ChangeLog.objects.count(), 2)
+        changes = self.sync([], cursor=first["cursor"] - 1)["changes"]
+        self.assertEqual(
+            [(change["exercise"], change["weight"]) for change in changes],
+            [(self.squat.id, 110), (self.bench.id, 80)],
+        )
+
+
+@override_settings(
+    TASKS={
+        "default": {
+            "BACKEND": "core.task_backend.DatabaseBackend",
+            "OPTIONS": {"MAX_ATTEMPTS": 2, "RETRY_DELAY": 0},
+        }
+    }
+)
+class DatabaseTaskBackendTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="test", password="123")
+        for name in ["Barbell Back Squat", "Barbell Bench Press", "Deadlift"]:
+            exercise = Exercise.objects.create(name=name)
+            BestSet.objects.create(
+                user=self.user, exercise=exercise, weight=100, reps=5
+            )
+
+    def run_worker(self):
+        call_command("run_worker", "--burst", stdout=StringIO())
+
+    def test_mesocycle_generation_is_queued(self):
+        self.client.login(username="test", password="123")
+
+        response = self.client.post(reverse("mesocycle"), {"start_date": "2026-01-05"})
+
+        self.assertRedirects(response, reverse("mesocycle"))
+        self.assertEqual(Mesocycle.objects.count(), 0)
+        self.assertEqual(TaskRecord.objects.get().status, "READY")
+
+        self.run_worker()
+
+        self.assertEqual(Mesocycle.objects.count(), 12)
+        record = TaskRecord.objects.get()
+        self.assertEqual(record.status, "SUCCESSFUL")
+        self.assertEqual(record.return_value, 12)
+
+    def test_best_set_write_queues_progress_rebuild(self):
+        self.client.login(username="test", password="123")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse("add_best_set"),
+                {
+                    "exercise": Exercise.objects.get(name="Deadlift").id,
+                    "weight": 120,
+                    "reps": 5,
+                },
+            )
+
+        # The set is a PR too, so its fan-out to feeds is queued next to it.
+        self.assertEqual(
+            sorted(TaskRecord.objects.values_list("task_path", flat=True)),
+            [
+                "accounts.tasks.fan_out_activity",
+                "accounts.tasks.rebuild_progress_cache",
+            ],
+        )
+        record = TaskRecord.objects.get(
+            task_path="accounts.tasks.rebuild_progress_cache"
+        )
+        self.assertEqual(record.args, [self.user.id])
+
+    def test_higher_priority_runs_first(self):
+        from accounts.tasks import generate_user_mesocycle, rebuild_progress_cache
+
+        low = rebuild_progress_cache.enqueue(self.user.id)
+        high = generate_user_mesocycle.enqueue(self.user.id, "2026-01-05")
+
+        backend = low.task.get_backend()
+        self.assertEqual(backend.claim_next().id, high.id)
+        self.assertEqual(backend.claim_next().id, low.id)
+        self.assertIsNone(backend.claim_next())
+
+    def test_failed_task_is_retried_then_marked_failed(self):
+        result = failing_task.enqueue()
+
+        self.run_worker()
+
+        result.refresh()
+        self.assertEqual(result.status, "FAILED")
+        self.assertEqual(result.attempts, 2)
+        self.assertEqual(len(result.errors), 2)
+        self.assertEqual(result.errors[0].exception_class, ValueError)
+
+    def test_tasks_of_lost_workers_are_run_again(self):
+        result = failing_task.enqueue()
+        backend = result.task.get_backend()
+        lease = timedelta(seconds=backend.lease_timeout + 1)
+        expired = datetime.now(timezone.utc) - lease
+
+        for status in ["READY", "FAILED"]:
+            backend.claim_next()  # The worker dies without storing an outcome
+            self.assertEqual(backend.requeue_stale(), 0)
+            TaskRecord.objects.update(last_attempted_at=expired)
+            self.assertEqual(backend.requeue_stale(), 1)
+            result.refresh()
+            self.assertEqual(result.status, status)
+
+    def test_system_exit_is_not_retried(self):
+        result = exiting_task.enqueue()
+        backend = result.task.get_backend()
+
+        with self.assertRaises(SystemExit):
+            backend.run(backend.claim_next(), "worker")
+        result.refresh()
+        self.assertEqual(result.status, "RUNNING")
+
+
+class HistoryArchiveTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="test")
+        RelativeStrengthService.log_bodyweight(self.user, 90, date(2019, 1, 1), "M")
+        self.exercise = Exercise.objects.create(name="Deadlift")
+        self.archive_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.archive_dir.cleanup)
+
+    def add_history(self, day, month, year, estimated_1rm):
+        return BestSetHistory.objects.create(
+            user=self.user,
+            exercise=self.exercise,
+            weight=100,
+            reps=5,
+            estimated_1rm=estimated_1rm,
+            created_at=datetime(year, month, day, tzinfo=timezone.utc),
+        )
+
+    def test_compact_keeps_monthly_max_and_restore_brings_rows_back(self):
+        self.add_history(3, 1, 2020, 150)
+        best_january = self.add_history(20, 1, 2020, 160)
+        self.add_history(28, 1, 2020, 155)
+        best_february = self.add_history(5, 2, 2020, 165)
+        recent = BestSetHistory.objects.create(
+            user=self.user,
+            exercise=self.exercise,
+            weight=110,
+            reps=5,
+            estimated_1rm=170,
+        )
+
+        kept, removed, archive_path = HistoryArchiveService.compact(
+            self.archive_dir.name, older_than_days=365
+        )
+
+        self.assertEqual((kept, removed), (2, 2))
+        self.assertQuerySetEqual(
+            BestSetHistory.objects.order_by("created_at"),
+            [best_january, best_february, recent],
+        )
+
+        restored, skipped = HistoryArchiveService.restore(archive_path)
+
+        self.assertEqual((restored, skipped), (2, 0))
+        self.assertEqual(BestSetHistory.objects.count(), 5)
+        restored_row = BestSetHistory.objects.get(
+            created_at=datetime(2020, 1, 3, tzinfo=timezone.utc)
+        )
+        self.assertIsNotNone(restored_row.dots)
+
+    def test_dry_run_writes_nothing(self):
+        self.add_history(3, 1, 2020, 150)
+        self.add_history(20, 1, 2020, 160)
+
+        kept, removed, archive_path = HistoryArchiveService.compact(
+            self.archive_dir.name, older_than_days=365, dry_run=True
+        )
+
+        self.assertEqual((kept, removed, archive_path), (1, 1, None))
+        self.assertEqual(BestSetHistory.objects.count(), 2)
+
+    def test_back_to_back_runs_keep_every_archive(self):
+        self.add_history(3, 1, 2020, 150)
+        self.add_history(20, 1, 2020, 160)
+        self.add_history(3, 1, 2021, 170)
+        self.add_history(20, 1, 2021, 180)
+
+        _, _, first = HistoryArchiveService.compact(
+            self.archive_dir.name,
+            older_than_days=(date.today() - date(2020, 6, 1)).days,
+        )
+        _, _, second = HistoryArchiveService.compact(
+            self.archive_dir.name, older_than_days=365
+        )
+        _, removed, third = HistoryArchiveService.compact(
+            self.archive_dir.name, older_than_days=365
+        )
+
+        self.assertEqual((removed, third), (0, None))
+        self.assertNotEqual(first, second)
+        self.assertEqual(
+            sorted(Path(self.archive_dir.name).iterdir()), sorted([first, second])
+        )
+        BestSetHistory.objects.all().delete()
+        self.assertEqual(HistoryArchiveService.restore(first), (1, 0))
+        self.assertEqual(HistoryArchiveService.restore(second), (1, 0))
+
+
+class DataPortabilityTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="lifter", password="123")
+        UserProfile.objects.filter(user=self.user).update(sex="M")
+        BodyweightLog.objects.create(
+            user=self.user, measured_on=date(2017, 1, 1), weight=90
+        )
+        squat = Exercise.objects.create(name="Barbell Back Squat")
+        BestSet.objects.create(user=self.user, exercise=squat, weight=150, reps=3)
+        for i in range(3):
+            BestSetHistory.objects.create(
+                user=self.user,
+                exercise=squat,
+                weight=120 + i * 10,
+                reps=3,
+                estimated_1rm=127 + i * 10,
+                created_at=datetime(2018 + i, 5, 1, tzinfo=timezone.utc),
+            )
+        Mesocycle.objects.create(
+            user=self.user,
+            exercise=squat,
+            start_date=datetime(2020, 1, 6).date(),
+            week=1,
+            rpe=7,
+            rir=3,
+            target_weight=115,
+            target_reps_min=8,
+            target_reps_max=12,
+        )
+
+    def export(self):
+        self.client.login(username="lifter", password="123")
+        response = self.client.get(reverse("export_data"))
+        self.assertEqual(response["Content-Type"], "application/zip")
+        return BytesIO(b"".join(response.streaming_content))
+
+    def test_export_contains_manifest_and_model_files(self):
+        with zipfile.ZipFile(self.export()) as archive:
+            self.assertEqual(
+                set(archive.namelist()),
+                {
+                    "manifest.json",
+                    "profile.json",
+                    "bodyweight.jsonl",
+                    "best_sets.jsonl",
+                    "best_set_history.jsonl",
+                    "mesocycles.jsonl",
+                },
+            )
+            self.assertIn(b'"best_set_history.jsonl": 3', archive.read("manifest.json"))
+
+    def test_download_has_no_password_hash(self):
+        with zipfile.ZipFile(self.export()) as archive:
+            profile = json.loads(archive.read("profile.json"))
+
+        self.assertNotIn("password", profile)
+
+    def test_command_export_keeps_password_on_request(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = f"{directory}/lifter.zip"
+            call_command(
+                "export_user_data",
+                "lifter",
+                path,
+                "--include-password",
+                stdout=StringIO(),
+            )
+            with open(path, "rb") as archive:
+                user, _ = DataPortabilityService.import_archive(
+                    archive, username="moved"
+                )
+
+        self.assertTrue(user.check_password("123"))
+
+    def test_import_rejects_corrupt_archives(self):
+        broken_json = BytesIO()
+        with zipfile.ZipFile(self.export()) as archive, zipfile.ZipFile(
+            broken_json, "w"
+        ) as copy:
+            for name in archive.namelist():
+                data = archive.read(name)
+                copy.writestr(
+                    name, b"{not json\n" if name == "best_sets.jsonl" else data
+                )
+
+        for archive in [BytesIO(b"not a zip"), broken_json]:
+            with self.assertRaisesMessage(ArchiveError, "Corrupt archive"):
+                DataPortabilityService.import_archive(archive, username="moved")
+        self.assertFalse(User.objects.filter(username="moved").exists())
+
+    def test_import_logs_best_sets_for_sync_clients(self):
+        user, _ = DataPortabilityService.import_archive(self.export(), username="moved")
+
+        self.assertEqual(
+            list(
+                ChangeLog.objects.filter(user=user).values_list(
+                    "exercise__name", "action"
+                )
+            ),
+            [("Barbell Back Squat", "upsert")],
+        )
+
+    def test_import_recreates_user_with_exercises_mapped_by_name(self):
+        archive = self.export()
+        Exercise.objects.all().delete()
+        Exercise.objects.create(name="Deadlift")
+
+        user, counts = DataPortabilityService.import_archive(archive, username="moved")
+
+        self.assertEqual(
+            counts,
+            {
+                "bodyweight.jsonl": 1,
+                "best_sets.jsonl": 1,
+                "best_set_history.jsonl": 3,
+                "mesocycles.jsonl": 1,
+            },
+        )
+        self.assertEqual(UserProfile.objects.get(user=user).sex, "M")
+        self.assertEqual(user.bodyweight_logs.get().weight, 90)
+        self.assertEqual(user.best_set_history.filter(dots__isnull=False).count(), 3)
+        self.assertIsNotNone(user.best_sets.get().wilks)
+        self.assertFalse(user.has_usable_password())
+        self.assertEqual(
+            list(
+                user.best_set_history.order_by("created_at").values_list(
+                    "created_at__year", flat=True
+                )
+            ),
+            [2018, 2019, 2020],
+        )
+        self.assertEqual(user.best_sets.get().exercise.name, "Barbell Back Squat")
@@ -2,6 +2,7 @@ from django.contrib.auth import views as auth_views
 from django.urls import path
 
 from . import views
+from .forms import ProfileEmailPasswordResetForm
 
 urlpatterns = [
     path("register/", views.register, name="register"),
@@ -19,6 +20,7 @@ urlpatterns = [
     path(
         "password-reset/",
         auth_views.PasswordResetView.as_view(
+            form_class=ProfileEmailPasswordResetForm,
             template_name="accounts/password_reset.html",
             email_template_name="accounts/password_reset_email.html",
             subject_template_name="accounts/password_reset_subject.txt",
@@ -54,4 +56,18 @@ urlpatterns = [
     ),
     path("mesocycle/", views.mesocycle, name="mesocycle"),
     path("progress/", views.progress_1rm, name="progress_1rm"),
+    path("export/", views.export_data, name="export_data"),
+    path(
+        "calendar/<str:token>/mesocycles.ics",
+        views.mesocycle_calendar,
+        name="mesocycle_calendar",
+    ),
+    path("calendar/reset/", views.reset_calendar_token, name="reset_calendar_token"),
+    path("coach/", views.coach_dashboard, name="coach_dashboard"),
+    path("feed/", views.feed, name="feed"),
+    path("follow/", views.follow, name="follow"),
+    path("unfollow/<int:user_id>/", views.unfollow, name="unfollow"),
+    path("api/sync/", views.sync, name="sync"),
+    path("api/rpe-loads/", views.rpe_loads, name="rpe_loads"),
+    path("bodyweight/", views.log_bodyweight, name="log_bodyweight"),
 ]
@@ -1,17 +1,39 @@
+import json
 from datetime import timedelta
 
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.shortcuts import redirect, render
+from django.contrib.auth.models import User
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404, redirect, render
+from django.urls import reverse
 from django.utils import timezone
+from django.views.decorators.http import condition, require_POST, require_safe
 
-from .forms import BestSetForm, UserRegisterForm
+from .forms import (
+    BestSetForm,
+    BodyweightForm,
+    FollowForm,
+    MesocycleForm,
+    UserRegisterForm,
+)
 from .services import (
     BestSetService,
+    CalendarService,
+    CoachService,
+    DataPortabilityService,
+    FeedService,
+    ForecastService,
     MesocycleService,
     ProfileService,
     ProgressService,
+    RelativeStrengthService,
+    RpeService,
+    SyncError,
+    SyncService,
+    VolumeService,
 )
+from .tasks import generate_user_mesocycle
 
 
 def register(request):
@@ -34,9 +56,26 @@ def register(request):
 def profile(request):
     user_best_sets = ProfileService.get_user_best_sets(request.user)
 
+    profile = request.user.userprofile
+    latest_weigh_in = request.user.bodyweight_logs.first()
+
     context = {
         "best_sets": user_best_sets,
         "total_best_sets": user_best_sets.count(),
+        "latest_weigh_in": latest_weigh_in,
+        "is_coach": CoachService.is_coach(request.user),
+        "calendar_url": request.build_absolute_uri(
+            reverse(
+                "mesocycle_calendar", args=[CalendarService.get_token(request.user)]
+            )
+        ),
+        "bodyweight_form": BodyweightForm(
+            initial={
+                "weight": latest_weigh_in.weight if latest_weigh_in else None,
+                "measured_on": timezone.localdate(),
+                "sex": profile.sex,
+            }
+        ),
     }
     return render(request, "accounts/profile.html", context)
 
@@ -71,6 +110,24 @@ def delete_best_set(request, best_set_id):
     return redirect("profile")
 
 
+@login_required
+def log_bodyweight(request):
+    if request.method == "POST":
+        form = BodyweightForm(request.POST)
+        if form.is_valid():
+            RelativeStrengthService.log_bodyweight(
+                request.user,
+                form.cleaned_data["weight"],
+                form.cleaned_data["measured_on"],
+                form.cleaned_data["sex"],
+            )
+            messages.success(request, "Bodyweight saved, relative strength updated")
+        else:
+            for errors in form.errors.values():
+                messages.warning(request, " ".join(errors))
+    return redirect("profile")
+
+
 @login_required
 def mesocycle(request):
     main_exercises = MesocycleService.get_main_exercises()
@@ -83,19 +140,31 @@ def mesocycle(request):
     mesocycle_end_date = None
 
     if request.method == "POST" and not missing_best_sets:
-        start_date_str = request.POST.get("start_date")
-        if start_date_str:
-            start_date, end_date, created_count, success = (
-                MesocycleService.generate_mesocycle(request.user, start_date_str)
+        form = MesocycleForm(request.POST)
+        if not form.is_valid():
+            for errors in form.errors.values():
+                messages.warning(request, " ".join(errors))
+            return redirect("mesocycle")
+        start_date_str = form.cleaned_data["start_date"].isoformat()
+        if "preview" in request.POST:
+            _, _, changes, _ = MesocycleService.generate_mesocycle(
+                request.user, start_date_str, dry_run=True
             )
-            if success:
-                messages.success(
-                    request,
-                    f"Mesocycle generated: "
-                    f"{start_date.strftime('%Y-%m-%d')} – "
-                    f"{end_date.strftime('%Y-%m-%d')} "
-                    f"({created_count} entries)",
-                )
+            messages.info(
+                request,
+                f"Regenerating the mesocycle from {start_date_str} would create "
+                f"{len(changes['created'])}, update {len(changes['updated'])} and "
+                f"delete {len(changes['deleted'])} entries; "
+                f"{changes['unchanged']} stay as they are.",
+            )
+            return redirect("mesocycle")
+        generate_user_mesocycle.enqueue(request.user.id, start_date_str)
+        messages.info(
+            request,
+            f"Mesocycle from {start_date_str} is being generated. "
+            f"Refresh the page in a few seconds.",
+        )
+        return redirect("mesocycle")
 
     mesocycles_by_exercise = MesocycleService.get_latest_mesocycles(request.user)
 
@@ -104,6 +173,9 @@ def mesocycle(request):
         mesocycle_end_date = start_date_display + timedelta(days=27)
 
     MesocycleService.add_week_dates(mesocycles_by_exercise)
+    volume = None
+    if mesocycles_by_exercise:
+        volume = VolumeService.get_cycle_volume(mesocycles_by_exercise)
 
     context = {
         "main_exercises": main_exercises,
@@ -113,6 +185,8 @@ def mesocycle(request):
         "today": timezone.now().date(),
         "start_date": start_date_display,
         "mesocycle_end_date": mesocycle_end_date,
+        "volume": volume,
+        "target_sets": VolumeService.TARGET_SETS,
     }
 
     return render(request, "accounts/mesocycle.html", context)
@@ -121,6 +195,141 @@ def mesocycle(request):
 @login_required
 def progress_1rm(request):
     charts_data = ProgressService.get_progress_charts_data(request.user)
+    forecasts = ForecastService.get_forecasts(request.user)
+    charts_data = [
+        {**chart, "forecast": forecasts.get(chart["exercise"])} for chart in charts_data
+    ]
 
     context = {"charts_data": charts_data}
     return render(request, "accounts/progress_1rm.html", context)
+
+
+@login_required
+def coach_dashboard(request):
+    try:
+        after = int(request.GET.get("after", 0))
+    except ValueError:
+        after = 0
+    rows, next_after = CoachService.get_roster_page(request.user, after)
+
+    context = {
+        "rows": rows,
+        "main_lifts": CoachService.MAIN_LIFTS,
+        "next_after": next_after,
+        "is_first_page": after == 0,
+    }
+    return render(request, "accounts/coach_dashboard.html", context)
+
+
+@login_required
+def feed(request):
+    try:
+        before = int(request.GET.get("before", 0))
+    except ValueError:
+        before = 0
+    activities, next_before = FeedService.get_feed_page(request.user, before)
+
+    context = {
+        "activities": activities,
+        "next_before": next_before,
+        "is_first_page": before == 0,
+        "following": FeedService.get_following(request.user),
+        "follow_form": FollowForm(user=request.user),
+    }
+    return render(request, "accounts/feed.html", context)
+
+
+@login_required
+@require_POST
+def follow(request):
+    form = FollowForm(request.POST, user=request.user)
+    if form.is_valid():
+        if FeedService.follow(request.user, form.followee):
+            messages.success(request, f"You now follow {form.followee.username}")
+        else:
+            messages.info(request, f"You already follow {form.followee.username}")
+    else:
+        for errors in form.errors.values():
+            messages.warning(request, " ".join(errors))
+    return redirect("feed")
+
+
+@login_required
+@require_POST
+def unfollow(request, user_id):
+    followee = get_object_or_404(User, id=user_id)
+    if FeedService.unfollow(request.user, followee):
+        messages.success(request, f"You no longer follow {followee.username}")
+    return redirect("feed")
+
+
+@login_required
+def export_data(request):
+    response = StreamingHttpResponse(
+        DataPortabilityService.iter_export(request.user),
+        content_type="application/zip",
+    )
+    response["Content-Disposition"] = (
+        f'attachment; filename="strengthtrack-{request.user.username}.zip"'
+    )
+    return response
+
+
+def _calendar_etag(request, token):
+    return CalendarService.get_etag(token)
+
+
+@require_safe
+@condition(etag_func=_calendar_etag)
+def mesocycle_calendar(request, token):
+    """
+    iCalendar feed of the token owner's mesocycle weeks for calendar apps,
+    which poll it without a session. Unchanged feeds are answered with 304.
+    """
+    user = CalendarService.get_user(token)
+    if user is None:
+        raise Http404
+    response = StreamingHttpResponse(
+        CalendarService.iter_calendar(user), content_type="text/calendar; charset=utf-8"
+    )
+    response["Content-Disposition"] = 'inline; filename="strengthtrack.ics"'
+    return response
+
+
+@login_required
+@require_POST
+def reset_calendar_token(request):
+    CalendarService.reset_token(request.user)
+    messages.success(request, "New calendar link created, the old one no longer works")
+    return redirect("profile")
+
+
+@require_POST
+def sync(request):
+    """
+    Offline sync: {"cursor": int | null, "operations": [...]} in, results
+    of the operations and best sets changed after the cursor out.
+    """
+    if not request.user.is_authenticated:
+        return JsonResponse({"error": "Authentication required"}, status=401)
+    try:
+        payload = json.loads(request.body)
+    except ValueError:
+        payload = None
+    if not isinstance(payload, dict):
+        return JsonResponse({"error": "Body must be a JSON object"}, status=400)
+
+    try:
+        result = SyncService.sync(
+            request.user, payload.get("operations", []), payload.get("cursor")
+        )
+    except SyncError as error:
+        return JsonResponse({"error": str(error)}, status=400)
+    return JsonResponse(result)
+
+
+def rpe_loads(request):
+    """Plate-rounded loads for reps 1-30 x RPE 5-10 from each best set 1RM."""
+    if not request.user.is_authenticated:
+        return JsonResponse({"error": "Authentication required"}, status=401)
+    return JsonResponse(RpeService.get_load_grids(request.user))
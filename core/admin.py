@@ -1,16 +1,215 @@
+import datetime
+
+from django import forms
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
+from django.contrib.auth.forms import AdminUserCreationForm, UserChangeForm
 from django.contrib.auth.models import User
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+from .models import (
+    BestSet,
+    BestSetHistory,
+    BodyweightLog,
+    CoachAthlete,
+    Exercise,
+    ExerciseMuscle,
+    Follow,
+    Mesocycle,
+    MuscleGroup,
+    PRActivity,
+    UserProfile,
+)
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that takes the table size from database statistics instead of
+    COUNT(*) when the changelist is unfiltered and the table is large.
+    Estimates can overshoot, e.g. SQLite's highest rowid after deletes, so
+    a page that comes back short corrects the count, and a page past the
+    real end shows the last one instead of an empty list.
+    """
+
+    # Below this size an exact count is cheap enough.
+    EXACT_COUNT_LIMIT = 10000
+    estimated = False
+
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, "query", None)
+        if query is not None and not query.has_filters():
+            estimate = estimate_row_count(self.object_list.model, self.object_list.db)
+            if estimate is not None and estimate > self.EXACT_COUNT_LIMIT:
+                self.estimated = True
+                return estimate
+        return super().count
+
+    def page(self, number):
+        page = super().page(number)
+        if not self.estimated or len(page) >= self.per_page:
+            return page
+
+        self.estimated = False
+        self.__dict__.pop("num_pages", None)
+        if len(page):
+            # A short page is the last one, so the rows before it are exact.
+            self.count = (page.number - 1) * self.per_page + len(page)
+            return page
+        self.count = super().count
+        return super().page(min(page.number, self.num_pages))
+
+
+def estimate_row_count(model, using="default"):
+    """Row count estimate from database statistics, None if unavailable."""
+    connection = connections[using]
+    table = model._meta.db_table
+
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute("SELECT reltuples FROM pg_class WHERE relname = %s", [table])
+        elif connection.vendor == "mysql":
+            cursor.execute(
+                "SELECT table_rows FROM information_schema.tables "
+                "WHERE table_schema = DATABASE() AND table_name = %s",
+                [table],
+            )
+        elif connection.vendor == "sqlite":
+            # The highest rowid is read from the end of the b-tree, no scan.
+            cursor.execute(
+                f"SELECT MAX(_rowid_) FROM {connection.ops.quote_name(table)}"
+            )
+        else:
+            return None
+        row = cursor.fetchone()
+
+    if not row or row[0] is None or row[0] < 0:
+        return None
+    return int(row[0])
+
 
-from .models import BestSet, Exercise, Mesocycle, UserProfile
+class IndexedDateQuerySet(QuerySet):
+    """
+    QuerySet for date_hierarchy that lists every period between the first and
+    last date (two index lookups) instead of a SELECT DISTINCT over the whole
+    table. Periods without rows may show up in the drill-down.
+    """
+
+    def dates(self, field_name, kind, order="ASC"):
+        if kind not in ("year", "month", "day"):
+            return super().dates(field_name, kind, order)
+        return self._periods(field_name, kind, order, as_datetime=False)
+
+    def datetimes(self, field_name, kind, order="ASC", tzinfo=None):
+        if kind not in ("year", "month", "day"):
+            return super().datetimes(field_name, kind, order, tzinfo)
+        return self._periods(field_name, kind, order, as_datetime=True)
+
+    def _periods(self, field_name, kind, order, as_datetime):
+        values = self.filter(**{f"{field_name}__isnull": False}).values_list(
+            field_name, flat=True
+        )
+        first = values.order_by(field_name).first()
+        last = values.order_by(f"-{field_name}").first()
+        if first is None:
+            return []
+        if as_datetime and timezone.is_aware(first):
+            first, last = timezone.localtime(first), timezone.localtime(last)
+
+        if kind == "year":
+            current = datetime.date(first.year, 1, 1)
+        elif kind == "month":
+            current = datetime.date(first.year, first.month, 1)
+        else:
+            current = datetime.date(first.year, first.month, first.day)
+        last_date = datetime.date(last.year, last.month, last.day)
+
+        periods = []
+        while current <= last_date:
+            periods.append(current)
+            if kind == "year":
+                current = current.replace(year=current.year + 1)
+            elif kind == "month":
+                current = (current + datetime.timedelta(days=32)).replace(day=1)
+            else:
+                current += datetime.timedelta(days=1)
+
+        if as_datetime:
+            periods = [
+                datetime.datetime.combine(day, datetime.time()) for day in periods
+            ]
+            if timezone.is_aware(first):
+                periods = [timezone.make_aware(moment) for moment in periods]
+        if order == "DESC":
+            periods.reverse()
+        return periods
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """Changelist settings for tables with millions of rows."""
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False  # Skip the second, unfiltered COUNT(*)
+    list_per_page = 100
+    list_select_related = ("user", "exercise")
+    autocomplete_fields = ("user", "exercise")
+    # Prefix search so the lookups can use the username/name indexes.
+    search_fields = ("^user__username", "^exercise__name")
+    ordering = ("-id",)
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        return IndexedDateQuerySet(self.model, query=queryset.query, using=queryset.db)
 
 
 class UserProfileInline(admin.StackedInline):
     model = UserProfile
     can_delete = False
+    readonly_fields = ("email_normalized",)
+
+
+class UniqueEmailMixin:
+    """Rejects an email that differs from another user's only in case."""
+
+    def clean_email(self):
+        email = self.cleaned_data.get("email")
+        email_normalized = UserProfile.normalize_email(email)
+        if UserProfile.email_conflicts(email_normalized, self.instance.pk):
+            raise forms.ValidationError("A user with this email already exists")
+        return email
+
+
+class UserAddForm(UniqueEmailMixin, AdminUserCreationForm):
+    class Meta(AdminUserCreationForm.Meta):
+        fields = ("username", "email")
+
+
+class UserEditForm(UniqueEmailMixin, UserChangeForm):
+    pass
 
 
 class CustomUserAdmin(UserAdmin):
+    form = UserEditForm
+    add_form = UserAddForm
+    add_fieldsets = (
+        (
+            None,
+            {
+                "classes": ("wide",),
+                "fields": (
+                    "username",
+                    "email",
+                    "usable_password",
+                    "password1",
+                    "password2",
+                ),
+            },
+        ),
+    )
     inlines = [UserProfileInline]
     list_display = [
         "username",
@@ -28,8 +227,14 @@ admin.site.unregister(User)
 admin.site.register(User, CustomUserAdmin)
 
 
+class ExerciseMuscleInline(admin.TabularInline):
+    model = ExerciseMuscle
+    extra = 1
+
+
 @admin.register(Exercise)
 class ExerciseAdmin(admin.ModelAdmin):
+    inlines = [ExerciseMuscleInline]
     list_display = ("name", "created_at")  # Только название и дата создания
     list_display_links = ("name",)  # Клик по названию = редактирование
     search_fields = ("name",)  # Поиск по названию
@@ -43,12 +248,83 @@ class ExerciseAdmin(admin.ModelAdmin):
 
 
 @admin.register(BestSet)
-class BestSetAdmin(admin.ModelAdmin):
+class BestSetAdmin(LargeTableAdmin):
     list_display = ("exercise", "user", "weight", "reps", "estimated_1rm", "updated_at")
-    list_filter = ("exercise", "updated_at")
-    search_fields = ("exercise__name", "user__username")
-    readonly_fields = ("estimated_1rm", "updated_at")
+    date_hierarchy = "updated_at"
+    readonly_fields = ("estimated_1rm", "updated_at", "dots", "wilks")
+
+
+@admin.register(BestSetHistory)
+class BestSetHistoryAdmin(LargeTableAdmin):
+    list_display = ("exercise", "user", "weight", "reps", "estimated_1rm", "created_at")
+    date_hierarchy = "created_at"
+    readonly_fields = ("created_at", "dots", "wilks")
+
+
+@admin.register(BodyweightLog)
+class BodyweightLogAdmin(admin.ModelAdmin):
+    list_display = ("user", "measured_on", "weight")
+    list_select_related = ("user",)
+    autocomplete_fields = ("user",)
+    search_fields = ("^user__username",)
+    date_hierarchy = "measured_on"
+
+
+@admin.register(CoachAthlete)
+class CoachAthleteAdmin(admin.ModelAdmin):
+    list_display = ("coach", "athlete", "created_at")
+    list_select_related = ("coach", "athlete")
+    autocomplete_fields = ("coach", "athlete")
+    search_fields = ("^coach__username", "^athlete__username")
+
+
+@admin.register(Follow)
+class FollowAdmin(admin.ModelAdmin):
+    list_display = ("follower", "followee", "created_at")
+    list_select_related = ("follower", "followee")
+    autocomplete_fields = ("follower", "followee")
+    search_fields = ("^follower__username", "^followee__username")
+
+    # Read-only: FeedService keeps follower counts and feeds in step with follows.
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(PRActivity)
+class PRActivityAdmin(LargeTableAdmin):
+    list_display = ("exercise", "user", "weight", "reps", "estimated_1rm", "created_at")
+    date_hierarchy = "created_at"
+    readonly_fields = ("created_at",)
+
+
+@admin.register(Mesocycle)
+class MesocycleAdmin(LargeTableAdmin):
+    list_display = (
+        "exercise",
+        "user",
+        "start_date",
+        "week",
+        "rpe",
+        "rir",
+        "target_weight",
+        "target_reps_min",
+        "target_reps_max",
+        "target_sets",
+    )
+    date_hierarchy = "start_date"
+    readonly_fields = ("created_at",)
+
+
+@admin.register(MuscleGroup)
+class MuscleGroupAdmin(admin.ModelAdmin):
+    list_display = ("name",)
+    search_fields = ("name",)
 
 
 admin.site.register(UserProfile)
-admin.site.register(Mesocycle)
@@ -0,0 +1,38 @@
+from django.db import connections, router, transaction
+
+
+def bulk_insert(model, objects, batch_size: int = None) -> list:
+    """
+    bulk_create() that keeps the objects' own auto_now/auto_now_add values,
+    e.g. archived or generated dates, which bulk_create() overwrites. Rows
+    are inserted raw, as loaddata does, so no field's pre_save() runs and
+    every row is written once. Primary keys are set on the objects when
+    the database returns them.
+    """
+    objects = list(objects)
+    using = router.db_for_write(model)
+    queryset = model._base_manager.using(using)
+    connection = connections[using]
+    opts = model._meta
+    fields = [field for field in opts.concrete_fields if field is not opts.auto_field]
+    returning = []
+    if connection.features.can_return_rows_from_bulk_insert:
+        returning = [field for field in opts.db_returning_fields if field not in fields]
+
+    max_size = connection.ops.bulk_batch_size(fields, objects) or len(objects)
+    batch_size = min(batch_size, max_size) if batch_size else max_size
+    with transaction.atomic(using=using, savepoint=False):
+        for start in range(0, len(objects), batch_size):
+            batch = objects[start : start + batch_size]
+            for obj in batch:
+                obj._prepare_related_fields_for_save(operation_name="bulk_insert")
+            rows = queryset._insert(
+                batch, fields, returning_fields=returning or None, raw=True
+            )
+            for obj, row in zip(batch, rows or []):
+                for field, value in zip(returning, row):
+                    setattr(obj, field.attname, value)
+            for obj in batch:
+                obj._state.adding = False
+                obj._state.db = using
+    return objects
@@ -0,0 +1,105 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+REPLICA = "replica"
+PIN_SESSION_KEY = "_primary_pinned_until"
+
+# Models that are never read from the replica: the task queue is claimed
+# with read-then-update, and sync bookkeeping must see the latest writes.
+PRIMARY_ONLY_MODELS = {"taskrecord", "changelog", "syncoperation"}
+
+_replica_reads = ContextVar("replica_reads", default=False)
+_wrote = ContextVar("wrote_to_primary", default=False)
+
+
+@contextmanager
+def replica_reads(enabled: bool = True):
+    """
+    Send reads of core models inside the block to the replica, until
+    pin_to_primary() is called in it.
+    """
+    reads_token = _replica_reads.set(enabled)
+    wrote_token = _wrote.set(False)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(reads_token)
+        _wrote.reset(wrote_token)
+
+
+@contextmanager
+def primary_reads():
+    """Read from the primary inside the block, e.g. to fill a shared cache."""
+    token = _replica_reads.set(False)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def pin_to_primary():
+    """Note a write: later reads in this request (and session) use the primary."""
+    _wrote.set(True)
+
+
+class ReplicaRouter:
+    """
+    Reads of core models go to the replica inside replica_reads() unless
+    the current request wrote something. Everything else (auth, sessions,
+    cache table, writes, migrations) stays on the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        if (
+            _replica_reads.get()
+            and not _wrote.get()
+            and REPLICA in connections.settings
+            and model._meta.app_label == "core"
+            and model._meta.model_name not in PRIMARY_ONLY_MODELS
+        ):
+            return REPLICA
+        return None
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica is a copy of the primary, not migrated on its own.
+        return db != REPLICA
+
+
+class ReplicaMiddleware:
+    """
+    Serve GET/HEAD requests from the replica, except for sessions that
+    wrote within the last REPLICA_PIN_SECONDS, so users see their own
+    changes before replication catches up. Without a replica database it
+    is left out of the stack, so requests do not load the session for it.
+    """
+
+    def __init__(self, get_response):
+        if REPLICA not in connections.settings:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        pinned_until = request.session.get(PIN_SESSION_KEY, 0)
+        use_replica = request.method in ("GET", "HEAD") and pinned_until < time.time()
+
+        with replica_reads(use_replica):
+            if request.method not in ("GET", "HEAD", "OPTIONS"):
+                pin_to_primary()
+            response = self.get_response(request)
+            if _wrote.get() and REPLICA in connections.settings:
+                request.session[PIN_SESSION_KEY] = (
+                    time.time() + settings.REPLICA_PIN_SECONDS
+                )
+        return response
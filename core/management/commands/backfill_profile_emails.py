@@ -0,0 +1,98 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.models import UserProfile
+
+
+class Command(BaseCommand):
+    help = "Fills UserProfile.email_normalized for existing users in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Users per transaction (default: 1000)",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        updated = created = 0
+        conflicts = []
+        last_id = 0
+
+        while True:
+            users = list(
+                User.objects.filter(id__gt=last_id)
+                .order_by("id")
+                .values_list("id", "username", "email")[:batch_size]
+            )
+            if not users:
+                break
+            last_id = users[-1][0]
+
+            with transaction.atomic():
+                profiles = {
+                    profile.user_id: profile
+                    for profile in UserProfile.objects.filter(
+                        user_id__in=[user_id for user_id, _, _ in users]
+                    )
+                }
+                wanted = {
+                    user_id: UserProfile.normalize_email(email)
+                    for user_id, _, email in users
+                }
+                # Emails already held by another user's profile.
+                taken = dict(
+                    UserProfile.objects.filter(
+                        email_normalized__in=[e for e in wanted.values() if e]
+                    ).values_list("email_normalized", "user_id")
+                )
+
+                to_update = []
+                to_create = []
+                for user_id, username, _ in users:
+                    email_normalized = wanted[user_id]
+                    owner = taken.get(email_normalized, user_id)
+                    if email_normalized and owner != user_id:
+                        # The current holder (or first user seen) keeps it.
+                        conflicts.append((username, email_normalized))
+                        email_normalized = None
+                    elif email_normalized:
+                        taken[email_normalized] = user_id
+
+                    profile = profiles.get(user_id)
+                    if profile is None:
+                        to_create.append(
+                            UserProfile(
+                                user_id=user_id, email_normalized=email_normalized
+                            )
+                        )
+                    elif profile.email_normalized != email_normalized:
+                        profile.email_normalized = email_normalized
+                        to_update.append(profile)
+
+                # Release addresses first so swaps inside a batch do not collide.
+                UserProfile.objects.filter(
+                    id__in=[profile.id for profile in to_update]
+                ).update(email_normalized=None)
+                UserProfile.objects.bulk_update(to_update, ["email_normalized"])
+                UserProfile.objects.bulk_create(to_create)
+
+            updated += len(to_update)
+            created += len(to_create)
+            self.stdout.write(f"Processed users up to id {last_id}")
+
+        for username, email in conflicts:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Skipped {username}: {email} belongs to another user"
+                )
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Done: {updated} profiles updated, {created} profiles created, "
+                f"{len(conflicts)} conflicts."
+            )
+        )
@@ -0,0 +1,102 @@
+import random
+import statistics
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection
+
+from accounts.services import HistorySeriesService, ProgressService
+from core.models import BestSetHistory, HistorySeries
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares the row-per-event BestSetHistory table with the packed "
+        "HistorySeries store: bytes on disk and progress chart read latency"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--users",
+            type=int,
+            default=200,
+            help="Users whose charts are read (default: 200)",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Seed of the user sample (default: 0)",
+        )
+
+    def handle(self, *args, **options):
+        if not HistorySeries.objects.exists():
+            raise CommandError("No series yet, run build_history_series first.")
+
+        points = BestSetHistory.objects.count()
+        self.stdout.write(f"{'store':<16}{'rows':>10}{'bytes':>14}{'bytes/point':>13}")
+        for name, model in (("rows", BestSetHistory), ("series", HistorySeries)):
+            size = _table_bytes(model)
+            self.stdout.write(
+                f"{name:<16}{model.objects.count():>10}"
+                f"{size if size is not None else 'n/a':>14}"
+                f"{size / points if size is not None and points else 0:>13.1f}"
+            )
+
+        user_ids = list(
+            HistorySeries.objects.values_list("user_id", flat=True).distinct()
+        )
+        sample = random.Random(options["seed"]).sample(
+            user_ids, min(options["users"], len(user_ids))
+        )
+        timings = {"rows": [], "series": []}
+        mismatches = 0
+        for user in User.objects.filter(id__in=sample):
+            started = time.perf_counter()
+            from_rows = ProgressService.build_charts_from_rows(user)
+            timings["rows"].append(time.perf_counter() - started)
+            started = time.perf_counter()
+            from_series = HistorySeriesService.build_progress_charts_data(user)
+            timings["series"].append(time.perf_counter() - started)
+            mismatches += from_rows != from_series
+
+        self.stdout.write(f"\n{'read':<16}{'p50 ms':>10}{'p95 ms':>10}{'mean ms':>10}")
+        for name, values in timings.items():
+            values.sort()
+            self.stdout.write(
+                f"{name:<16}{values[len(values) // 2] * 1000:>10.2f}"
+                f"{values[int(len(values) * 0.95)] * 1000:>10.2f}"
+                f"{statistics.mean(values) * 1000:>10.2f}"
+            )
+        speedup = statistics.mean(timings["rows"]) / statistics.mean(timings["series"])
+        self.stdout.write(
+            f"\nSeries reads are {speedup:.1f}x faster over {len(sample)} users"
+        )
+        if mismatches:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"{mismatches} users' charts differ, re-run build_history_series"
+                )
+            )
+
+
+def _table_bytes(model):
+    """Bytes of the table and its indexes, None where the database can't tell."""
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        try:
+            if connection.vendor == "sqlite":
+                # dbstat needs SQLite built with SQLITE_ENABLE_DBSTAT_VTAB.
+                cursor.execute(
+                    "SELECT SUM(pgsize) FROM dbstat WHERE name IN "
+                    "(SELECT name FROM sqlite_master WHERE tbl_name = %s)",
+                    [table],
+                )
+            elif connection.vendor == "postgresql":
+                cursor.execute("SELECT pg_total_relation_size(%s)", [table])
+            else:
+                return None
+        except OperationalError:
+            return None
+        return cursor.fetchone()[0]
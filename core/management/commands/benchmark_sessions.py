@@ -0,0 +1,61 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils.crypto import get_random_string
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures requests per second of a logged-in page with each session "
+        "backend, against the configured database"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=500,
+            help="Requests per backend (default: 500)",
+        )
+        parser.add_argument(
+            "--url",
+            default=reverse("profile"),
+            help="Page to request (default: profile)",
+        )
+
+    def handle(self, *args, **options):
+        password = get_random_string(16)
+        user = User.objects.create_user(
+            username=f"session_bench_{get_random_string(8)}", password=password
+        )
+        host = settings.ALLOWED_HOSTS[-1]
+
+        self.stdout.write(f"{'backend':<16}{'req/s':>10}{'ms/req':>10}")
+        try:
+            for backend, engine in settings.SESSION_ENGINES.items():
+                with override_settings(SESSION_ENGINE=engine):
+                    client = Client(HTTP_HOST=host)
+                    client.login(username=user.username, password=password)
+                    client.get(options["url"])
+
+                    started = time.perf_counter()
+                    for _ in range(options["requests"]):
+                        response = client.get(options["url"])
+                    elapsed = time.perf_counter() - started
+                    client.logout()
+
+                if response.status_code != 200:
+                    self.stdout.write(
+                        self.style.ERROR(f"{backend}: HTTP {response.status_code}")
+                    )
+                    continue
+                self.stdout.write(
+                    f"{backend:<16}{options['requests'] / elapsed:>10.0f}"
+                    f"{elapsed * 1000 / options['requests']:>10.2f}"
+                )
+        finally:
+            user.delete()
@@ -0,0 +1,108 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs in a fresh interpreter so nothing is imported or cached yet.
+COLD_PROCESS_SCRIPT = """
+import json, sys, time
+from io import BytesIO
+
+started = time.perf_counter()
+from strengthtrack.wsgi import application
+import_seconds = time.perf_counter() - started
+
+warmup_seconds = 0.0
+if sys.argv[1] == "warm":
+    from core.warmup import warm_up
+    started = time.perf_counter()
+    warm_up()
+    warmup_seconds = time.perf_counter() - started
+
+def request(path):
+    environ = {
+        "REQUEST_METHOD": "GET", "PATH_INFO": path, "QUERY_STRING": "",
+        "SERVER_NAME": "127.0.0.1", "SERVER_PORT": "80", "HTTP_HOST": "127.0.0.1",
+        "wsgi.url_scheme": "http", "wsgi.input": BytesIO(), "wsgi.errors": sys.stderr,
+        "wsgi.multithread": False, "wsgi.multiprocess": True, "wsgi.run_once": False,
+    }
+    status = []
+    started = time.perf_counter()
+    body = b"".join(application(environ, lambda s, h, e=None: status.append(s)))
+    elapsed = time.perf_counter() - started
+    if not status[0].startswith(("200", "302")):
+        raise SystemExit(f"{path} returned {status[0]}")
+    return elapsed
+
+first = request(sys.argv[2])
+second = request(sys.argv[2])
+print(json.dumps({
+    "import": import_seconds, "warmup": warmup_seconds,
+    "first_request": first, "second_request": second,
+}))
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures import time and first-request latency of fresh processes, "
+        "with and without the warm-up stage"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--runs",
+            type=int,
+            default=5,
+            help="Cold processes started per mode (default: 5)",
+        )
+        parser.add_argument(
+            "--path",
+            default="/accounts/login/",
+            help="URL requested by each process (default: /accounts/login/)",
+        )
+
+    def handle(self, *args, **options):
+        env = {
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": os.environ.get(
+                "DJANGO_SETTINGS_MODULE", "strengthtrack.settings"
+            ),
+            # The script decides itself when to warm up.
+            "WARMUP_ON_STARTUP": "False",
+        }
+
+        self.stdout.write(
+            f"{'mode':<6}{'import':>10}{'warm-up':>10}{'1st req':>10}"
+            f"{'2nd req':>10}{'ready+1st':>11}   (median ms, {options['runs']} runs)"
+        )
+        for mode in ("cold", "warm"):
+            runs = [
+                self.run_process(mode, options["path"], env)
+                for _ in range(options["runs"])
+            ]
+            median = {
+                key: statistics.median(run[key] for run in runs) * 1000
+                for key in runs[0]
+            }
+            self.stdout.write(
+                f"{mode:<6}{median['import']:>10.1f}{median['warmup']:>10.1f}"
+                f"{median['first_request']:>10.1f}{median['second_request']:>10.1f}"
+                f"{median['import'] + median['warmup'] + median['first_request']:>11.1f}"
+            )
+
+    def run_process(self, mode, path, env):
+        result = subprocess.run(
+            [sys.executable, "-c", COLD_PROCESS_SCRIPT, mode, path],
+            cwd=settings.BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            raise CommandError(result.stderr.strip() or result.stdout.strip())
+        return json.loads(result.stdout.strip().splitlines()[-1])
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+
+from accounts.services import HistorySeriesService
+from core.models import BestSetHistory, HistorySeries
+
+
+class Command(BaseCommand):
+    help = (
+        "Packs every user's best set history into per-exercise series for "
+        "HISTORY_SERIES_STORE; safe to re-run, series are rebuilt from the rows"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Users rebuilt per transaction (default: 500)",
+        )
+
+    def handle(self, *args, **options):
+        if not HistorySeriesService.enabled():
+            self.stdout.write(
+                self.style.WARNING(
+                    "HISTORY_SERIES_STORE is off: the series are built but not "
+                    "appended to or read until it is enabled."
+                )
+            )
+        user_ids = list(
+            BestSetHistory.objects.values_list("user_id", flat=True)
+            .order_by("user_id")
+            .distinct()
+        )
+        # Users whose history is gone entirely are not in user_ids.
+        HistorySeries.objects.exclude(
+            user_id__in=BestSetHistory.objects.values("user_id")
+        ).delete()
+
+        size = options["batch_size"]
+        series = 0
+        for start in range(0, len(user_ids), size):
+            batch = user_ids[start : start + size]
+            series += HistorySeriesService.rebuild_users(batch)
+            self.stdout.write(f"Packed {start + len(batch)}/{len(user_ids)} users")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Done: {series} series for {len(user_ids)} users.")
+        )
@@ -0,0 +1,53 @@
+import time
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.sessions.backends.db import SessionStore as DBStore
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes expired database sessions in small batches, so the table "
+        "is never locked for long"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Sessions deleted per statement (default: 1000)",
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0.05,
+            help="Seconds to sleep between batches (default: 0.05)",
+        )
+
+    def handle(self, *args, **options):
+        engine = import_module(settings.SESSION_ENGINE)
+        if not issubclass(engine.SessionStore, DBStore):
+            self.stdout.write(
+                f"{settings.SESSION_ENGINE} does not store sessions in the database, "
+                f"nothing to clear."
+            )
+            return
+
+        session_model = engine.SessionStore.get_model_class()
+        now = timezone.now()
+        deleted = 0
+        while True:
+            keys = list(
+                session_model.objects.filter(expire_date__lt=now).values_list(
+                    "session_key", flat=True
+                )[: options["batch_size"]]
+            )
+            if not keys:
+                break
+            deleted += session_model.objects.filter(session_key__in=keys).delete()[0]
+            time.sleep(options["pause"])
+
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired sessions."))
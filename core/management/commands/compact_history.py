@@ -0,0 +1,60 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.services import HistoryArchiveService
+
+
+class Command(BaseCommand):
+    help = (
+        "Collapses best set history older than the given age into monthly "
+        "max 1RM points and archives the removed rows"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than-days",
+            type=int,
+            default=730,
+            help="Compact history older than this many days (default: 730)",
+        )
+        parser.add_argument(
+            "--archive-dir",
+            default=settings.HISTORY_ARCHIVE_DIR,
+            help="Directory for the .jsonl.gz archives",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Users processed per transaction",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report what would be removed",
+        )
+
+    def handle(self, *args, **options):
+        if options["older_than_days"] < 1:
+            raise CommandError("--older-than-days must be positive")
+
+        kept, removed, archive_path = HistoryArchiveService.compact(
+            options["archive_dir"],
+            options["older_than_days"],
+            batch_size=options["batch_size"],
+            dry_run=options["dry_run"],
+        )
+
+        if options["dry_run"]:
+            self.stdout.write(
+                f"Dry run: {removed} rows would be archived, {kept} monthly points kept."
+            )
+        elif archive_path:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Archived {removed} rows to {archive_path}, "
+                    f"{kept} monthly points kept."
+                )
+            )
+        else:
+            self.stdout.write(self.style.WARNING("Nothing to compact."))
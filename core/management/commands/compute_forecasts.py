@@ -0,0 +1,50 @@
+import multiprocessing
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from accounts.services import ForecastService
+from core.models import BestSetHistory
+from core.parallel import map_chunks
+
+
+def _compute_chunk(user_ids):
+    for user in User.objects.filter(id__in=user_ids):
+        ForecastService.rebuild_cache(user)
+    connections.close_all()
+    return len(user_ids)
+
+
+class Command(BaseCommand):
+    help = "Recomputes projected PRs for every user with history (run nightly)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=multiprocessing.cpu_count(),
+            help="Worker processes; 1 computes inline (default: CPU count)",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=200,
+            help="Users handed to a worker at a time (default: 200)",
+        )
+
+    def handle(self, *args, **options):
+        user_ids = list(
+            BestSetHistory.objects.values_list("user_id", flat=True)
+            .order_by("user_id")
+            .distinct()
+        )
+        size = options["chunk_size"]
+        chunks = [user_ids[i : i + size] for i in range(0, len(user_ids), size)]
+
+        done = 0
+        for count in map_chunks(_compute_chunk, chunks, options["processes"]):
+            done += count
+            self.stdout.write(f"Computed forecasts for {done}/{len(user_ids)} users")
+
+        self.stdout.write(self.style.SUCCESS(f"Done: forecasts for {done} users."))
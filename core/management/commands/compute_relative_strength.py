@@ -0,0 +1,41 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+
+from accounts.services import RelativeStrengthService
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes DOTS/Wilks scores of every best set and history row from "
+        "the bodyweight logged at the time, in batches of users"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=200,
+            help="Users scored per transaction (default: 200)",
+        )
+
+    def handle(self, *args, **options):
+        rows = users = 0
+        last_id = 0
+
+        while True:
+            user_ids = list(
+                User.objects.filter(id__gt=last_id)
+                .order_by("id")
+                .values_list("id", flat=True)[: options["batch_size"]]
+            )
+            if not user_ids:
+                break
+            last_id = user_ids[-1]
+
+            rows += RelativeStrengthService.update_users(user_ids)
+            users += len(user_ids)
+            self.stdout.write(f"Processed users up to id {last_id}")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Done: {rows} rows scored for {users} users.")
+        )
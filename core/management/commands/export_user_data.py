@@ -0,0 +1,42 @@
+import sys
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.services import DataPortabilityService
+
+
+class Command(BaseCommand):
+    help = "Exports a user's sets, history, mesocycles and profile as a zip archive"
+
+    def add_arguments(self, parser):
+        parser.add_argument("username")
+        parser.add_argument("output", help="Archive path, '-' for stdout")
+        parser.add_argument(
+            "--include-password",
+            action="store_true",
+            help="Add the password hash, so the account keeps its password "
+            "when imported elsewhere. Keep such archives private.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options["username"])
+        except User.DoesNotExist:
+            raise CommandError(f"User '{options['username']}' does not exist")
+
+        chunks = DataPortabilityService.iter_export(
+            user, include_password=options["include_password"]
+        )
+        if options["output"] == "-":
+            for chunk in chunks:
+                sys.stdout.buffer.write(chunk)
+            return
+
+        with open(options["output"], "wb") as output:
+            for chunk in chunks:
+                output.write(chunk)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Exported {user.username} to {options['output']}")
+        )
@@ -0,0 +1,303 @@
+import math
+import multiprocessing
+import random
+import time
+from datetime import date, datetime
+from datetime import time as day_time
+from datetime import timedelta
+from functools import lru_cache
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connections, transaction
+from django.utils import timezone
+
+from accounts.services.history_series_service import HistorySeriesService
+from accounts.services.mesocycle_service import (
+    MAIN_EXERCISES_NAMES,
+    MesocycleService,
+    round_to_plates,
+)
+from core.bulk import bulk_insert
+from core.models import BestSet, BestSetHistory, Exercise, Mesocycle, UserProfile
+from core.parallel import map_chunks
+
+# Starting 1RM (kg) of an average new lifter; other exercises use ACCESSORY_1RM.
+BASE_1RM = {
+    "Barbell Back Squat": 90,
+    "Barbell Bench Press": 65,
+    "Deadlift": 110,
+}
+ACCESSORY_1RM = 40
+LOCK_RETRIES = 5
+
+
+def _generate_chunk(job):
+    """Create users [start, stop) of the dataset, returns rows created."""
+    prefix, start, stop, seed, years, exercises_per_user, batch_size, today = job
+    exercises = dict(Exercise.objects.values_list("name", "id"))
+    main = [name for name in MAIN_EXERCISES_NAMES if name in exercises]
+    accessories = sorted(set(exercises) - set(main))
+    password = make_password(None)
+
+    users, plans = [], []
+    for index in range(start, stop):
+        # Seeded per user, so the data does not depend on the chunking.
+        rng = random.Random(f"{seed}:{index}")
+        joined = today - timedelta(days=rng.randint(28, years * 365))
+        users.append(
+            User(
+                username=f"{prefix}{index:07d}",
+                email=f"{prefix}{index:07d}@example.com",
+                password=password,
+                date_joined=_aware(joined),
+            )
+        )
+        chosen = main + rng.sample(
+            accessories, min(len(accessories), max(exercises_per_user - len(main), 0))
+        )
+        plans.append(_simulate_user(rng, joined, today, chosen, main))
+
+    # Concurrent SQLite writers wait for each other's transaction; retry
+    # the whole chunk if the wait outlasts the connection timeout.
+    for attempt in range(LOCK_RETRIES):
+        try:
+            rows = _write_chunk(users, plans, exercises, batch_size)
+            break
+        except OperationalError as error:
+            if "locked" not in str(error) or attempt == LOCK_RETRIES - 1:
+                raise
+            for user in users:
+                user.pk = None
+            time.sleep(1)
+    connections.close_all()
+    return stop - start, rows
+
+
+def _write_chunk(users, plans, exercises, batch_size):
+    rows = 0
+    with transaction.atomic():
+        users = User.objects.bulk_create(users, batch_size=batch_size)
+        bulk_insert(
+            UserProfile,
+            [
+                UserProfile(
+                    user=user,
+                    email_normalized=UserProfile.normalize_email(user.email),
+                    created_at=user.date_joined,
+                )
+                for user in users
+            ],
+            batch_size,
+        )
+        best_sets, history, mesocycles = [], [], []
+        for user, (user_best_sets, user_history, user_mesocycles) in zip(users, plans):
+            for name, weight, reps, one_rm, day in user_best_sets:
+                best_sets.append(
+                    BestSet(
+                        user=user,
+                        exercise_id=exercises[name],
+                        weight=weight,
+                        reps=reps,
+                        estimated_1rm=one_rm,
+                        updated_at=day,
+                    )
+                )
+            for name, weight, reps, one_rm, day in user_history:
+                history.append(
+                    BestSetHistory(
+                        user=user,
+                        exercise_id=exercises[name],
+                        weight=weight,
+                        reps=reps,
+                        estimated_1rm=one_rm,
+                        created_at=_aware(day),
+                    )
+                )
+            for name, start_date, config, target_weight in user_mesocycles:
+                mesocycles.append(
+                    Mesocycle(
+                        user=user,
+                        exercise_id=exercises[name],
+                        start_date=start_date,
+                        week=config["week"],
+                        rpe=config["rpe"],
+                        rir=config["rir"],
+                        target_weight=target_weight,
+                        target_reps_min=config["reps"][0],
+                        target_reps_max=config["reps"][1],
+                        target_sets=config["sets"],
+                        created_at=_aware(start_date),
+                    )
+                )
+        for model, objects in (
+            (BestSet, best_sets),
+            (BestSetHistory, history),
+            (Mesocycle, mesocycles),
+        ):
+            bulk_insert(model, objects, batch_size)
+            rows += len(objects)
+        HistorySeriesService.sync_users([user.id for user in users])
+    return rows
+
+
+def _simulate_user(rng, joined, today, exercise_names, main):
+    """
+    Weekly tests along a saturating strength curve with noise. A test that
+    beats the current best becomes the new best, and the old one goes to
+    history, as BestSetService does. A mesocycle starts every 6-12 weeks.
+    """
+    strength = rng.lognormvariate(0, 0.25)
+    curves = {
+        name: (
+            BASE_1RM.get(name, ACCESSORY_1RM) * strength * rng.uniform(0.8, 1.2),
+            rng.uniform(0.3, 0.9),  # total gain
+            rng.uniform(40, 120),  # weeks to ~63% of the gain
+        )
+        for name in exercise_names
+    }
+    best = {}
+    history = []
+    mesocycles = []
+    next_mesocycle = joined + timedelta(weeks=rng.randint(4, 12))
+
+    day = joined
+    week = 0
+    while day <= today:
+        for name, (start, gain, tau) in curves.items():
+            if name in best and rng.random() > 0.35:
+                continue
+            tested = start * (1 + gain * (1 - math.exp(-week / tau)))
+            tested *= 1 + rng.gauss(0, 0.03)
+            reps = rng.randint(1, 8)
+            weight = round_to_plates(tested * (1.0278 - 0.0278 * reps))
+            one_rm = round(weight / (1.0278 - 0.0278 * reps), 2)
+            if name not in best:
+                best[name] = (name, weight, reps, one_rm, day)
+            elif one_rm > best[name][3]:
+                history.append(best[name][:4] + (day,))
+                best[name] = (name, weight, reps, one_rm, day)
+
+        if day >= next_mesocycle and day + timedelta(days=27) <= today:
+            for name in main:
+                for config in MesocycleService.WEEKS_CONFIG:
+                    target = round_to_plates(best[name][3] * config["mult"])
+                    mesocycles.append((name, day, config, target))
+            next_mesocycle = day + timedelta(weeks=rng.randint(6, 12))
+
+        day += timedelta(days=7)
+        week += 1
+    return list(best.values()), history, mesocycles
+
+
+@lru_cache(maxsize=None)
+def _aware(day):
+    return timezone.make_aware(datetime.combine(day, day_time(18)))
+
+
+class Command(BaseCommand):
+    help = (
+        "Generates synthetic users with multi-year best set history and "
+        "mesocycles for scale testing. The same --seed gives the same data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--users",
+            type=int,
+            default=1000,
+            help="Users to create (default: 1000)",
+        )
+        parser.add_argument(
+            "--years",
+            type=int,
+            default=3,
+            help="Longest training history per user in years (default: 3)",
+        )
+        parser.add_argument(
+            "--exercises",
+            type=int,
+            default=6,
+            help="Exercises per user, main lifts included (default: 6)",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=42,
+            help="Random seed (default: 42)",
+        )
+        parser.add_argument(
+            "--today",
+            type=date.fromisoformat,
+            default=None,
+            help="Day the histories end on, YYYY-MM-DD; fix it to get the same "
+            "data from a --seed on any day (default: the current date)",
+        )
+        parser.add_argument(
+            "--prefix",
+            default="synth",
+            help="Username prefix (default: synth)",
+        )
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=multiprocessing.cpu_count(),
+            help="Worker processes; 1 generates inline (default: CPU count)",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=100,
+            help="Users per worker transaction (default: 100)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=2000,
+            help="Rows per INSERT (default: 2000)",
+        )
+
+    def handle(self, *args, **options):
+        if not Exercise.objects.exists():
+            raise CommandError("Run populate_exercises first.")
+        prefix = options["prefix"]
+        if User.objects.filter(username__startswith=prefix).exists():
+            raise CommandError(
+                f"Users starting with {prefix!r} already exist, choose another --prefix."
+            )
+
+        total = options["users"]
+        size = options["chunk_size"]
+        jobs = [
+            (
+                prefix,
+                start,
+                min(start + size, total),
+                options["seed"],
+                options["years"],
+                options["exercises"],
+                options["batch_size"],
+                options["today"] or timezone.localdate(),
+            )
+            for start in range(0, total, size)
+        ]
+
+        started = time.perf_counter()
+        users = rows = 0
+        for chunk_users, chunk_rows in map_chunks(
+            _generate_chunk, jobs, options["processes"]
+        ):
+            users += chunk_users
+            rows += chunk_rows
+            self.stdout.write(
+                f"{users}/{total} users, {rows} rows "
+                f"({rows / (time.perf_counter() - started):.0f} rows/s)"
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Done: {users} users and {rows} best set, history and mesocycle rows "
+                f"in {time.perf_counter() - started:.1f}s."
+            )
+        )
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.services import ArchiveError, DataPortabilityService
+
+
+class Command(BaseCommand):
+    help = "Creates a user from an export_user_data archive"
+
+    def add_arguments(self, parser):
+        parser.add_argument("archive", help="Path to the .zip archive")
+        parser.add_argument(
+            "--username",
+            help="Import under a different username than the archived one",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with open(options["archive"], "rb") as archive:
+                user, counts = DataPortabilityService.import_archive(
+                    archive, username=options["username"]
+                )
+        except (OSError, ArchiveError) as e:
+            raise CommandError(str(e))
+
+        summary = ", ".join(f"{name}: {count}" for name, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(f"Imported {user.username} ({summary})"))
@@ -0,0 +1,370 @@
+import http.client
+import random
+import statistics
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from http.cookies import SimpleCookie
+from urllib.parse import urlencode, urlsplit
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+from django.core.signals import got_request_exception
+from django.core.wsgi import get_wsgi_application
+from django.db import connections
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.crypto import get_random_string
+
+from accounts.services.mesocycle_service import MAIN_EXERCISES_NAMES
+from accounts.tasks import fan_out_activity
+from core.models import BestSet, Exercise, PRActivity, TaskRecord, UserProfile
+
+# name -> (method, URL name)
+ENDPOINTS = {
+    "profile": ("GET", "profile"),
+    "add_best_set": ("POST", "add_best_set"),
+    "mesocycle": ("GET", "mesocycle"),
+    "progress_1rm": ("GET", "progress_1rm"),
+}
+DEFAULT_MIX = "profile=40,add_best_set=20,mesocycle=20,progress_1rm=20"
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+class LoadClient:
+    """Keep-alive HTTP client for one synthetic user, with its own cookies."""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.connection = http.client.HTTPConnection(host, port, timeout=60)
+        self.cookies = SimpleCookie()
+
+    def request(self, method, path, data=None):
+        headers = {"Host": self.host}
+        if self.cookies:
+            headers["Cookie"] = "; ".join(
+                f"{name}={morsel.value}" for name, morsel in self.cookies.items()
+            )
+        body = None
+        if data is not None:
+            body = urlencode(data)
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+            headers["X-CSRFToken"] = self.cookies["csrftoken"].value
+            headers["Referer"] = f"http://{self.host}{path}"
+        try:
+            self.connection.request(method, path, body, headers)
+            response = self.connection.getresponse()
+            response.read()
+        except (http.client.HTTPException, OSError):
+            # Reconnect on the next request; the caller counts the error.
+            self.connection.close()
+            raise
+        for header in response.headers.get_all("Set-Cookie") or []:
+            self.cookies.load(header)
+        return response.status
+
+    def close(self):
+        self.connection.close()
+
+
+class Stats:
+    """Thread-safe collector of client timings and server exceptions."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+        self.locked = Counter()
+        self.exceptions = Counter()
+        self.paths = {reverse(path): name for name, (_, path) in ENDPOINTS.items()}
+
+    def record(self, name, seconds, status):
+        with self.lock:
+            self.latencies[name].append(seconds)
+            self.statuses[name][status] += 1
+
+    def record_exception(self, sender, request=None, **kwargs):
+        # Runs in the server thread that handled the request.
+        error = sys.exc_info()[1]
+        name = self.paths.get(getattr(request, "path", None), "other")
+        with self.lock:
+            self.exceptions[f"{type(error).__name__}: {error}"] += 1
+            if "database is locked" in str(error):
+                self.locked[name] += 1
+
+
+class Command(BaseCommand):
+    help = (
+        "Serves the WSGI app on a local threaded server, logs in synthetic "
+        "users and drives a weighted mix of pages concurrently. Reports "
+        "throughput, latency percentiles and errors per endpoint."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--users",
+            type=int,
+            default=20,
+            help="Concurrent synthetic users, one client thread each (default: 20)",
+        )
+        parser.add_argument(
+            "--duration",
+            type=float,
+            default=30,
+            help="Seconds to generate load (default: 30)",
+        )
+        parser.add_argument(
+            "--mix",
+            default=DEFAULT_MIX,
+            help=f"Endpoint weights (default: {DEFAULT_MIX})",
+        )
+        parser.add_argument(
+            "--target",
+            help=(
+                "Base URL of an already running server, e.g. an ASGI server "
+                "started with strengthtrack.asgi; by default the WSGI app is "
+                "served in-process"
+            ),
+        )
+        parser.add_argument(
+            "--login",
+            metavar="USERNAME:PASSWORD",
+            help=(
+                "Existing account on the --target server that every client "
+                "logs in as, for servers that do not share this database; no "
+                "synthetic users are created here"
+            ),
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Seed of the request mix (default: 0)",
+        )
+        parser.add_argument(
+            "--keep-users",
+            action="store_true",
+            help="Do not delete the synthetic users afterwards",
+        )
+
+    def handle(self, *args, **options):
+        mix = self.parse_mix(options["mix"])
+        if options["login"] and not options["target"]:
+            raise CommandError("--login is only used with --target")
+        exercises = list(Exercise.objects.all())
+        if not exercises and "add_best_set" in mix:
+            raise CommandError("The exercise catalog is empty, add exercises first.")
+
+        users = []
+        if options["login"]:
+            username, _, password = options["login"].partition(":")
+            usernames = [username] * options["users"]
+        else:
+            password = get_random_string(16)
+            created_at = timezone.now()
+            users = self.create_users(options["users"], password, exercises)
+            usernames = [user.username for user in users]
+            self.stdout.write(f"Created {len(users)} synthetic users")
+
+        server = None
+        if options["target"]:
+            target = urlsplit(options["target"])
+            host, port = target.hostname, target.port or 80
+        else:
+            host = settings.ALLOWED_HOSTS[-1]
+            server = ThreadedWSGIServer(("127.0.0.1", 0), QuietHandler)
+            server.daemon_threads = True
+            server.set_app(get_wsgi_application())
+            port = server.server_port
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            self.stdout.write(f"Serving WSGI app on 127.0.0.1:{port}")
+
+        stats = Stats()
+        got_request_exception.connect(stats.record_exception)
+        started = time.perf_counter()
+        try:
+            threads = [
+                threading.Thread(
+                    target=self.run_user,
+                    args=(
+                        username,
+                        password,
+                        host,
+                        port,
+                        mix,
+                        exercises,
+                        stats,
+                        started + options["duration"],
+                        options["seed"] + index,
+                    ),
+                )
+                for index, username in enumerate(usernames)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - started
+        finally:
+            got_request_exception.disconnect(stats.record_exception)
+            if server:
+                server.shutdown()
+                server.server_close()
+            connections.close_all()
+            if users and not options["keep_users"]:
+                self.delete_users(users, created_at)
+
+        self.report(stats, elapsed)
+
+    def parse_mix(self, value):
+        mix = {}
+        for part in value.split(","):
+            name, _, weight = part.partition("=")
+            if name not in ENDPOINTS or not weight.isdigit():
+                raise CommandError(
+                    f"Bad mix entry {part!r}; use name=weight with names "
+                    f"{', '.join(ENDPOINTS)}"
+                )
+            mix[name] = int(weight)
+        return mix
+
+    def create_users(self, count, password, exercises):
+        prefix = f"loadtest_{get_random_string(6)}"
+        # Hash once: every synthetic user shares the password.
+        password_hash = make_password(password)
+        users = User.objects.bulk_create(
+            User(username=f"{prefix}_{i}", password=password_hash) for i in range(count)
+        )
+        # bulk_create skips the post_save signal that creates profiles.
+        UserProfile.objects.bulk_create(UserProfile(user=user) for user in users)
+        main_exercises = [e for e in exercises if e.name in MAIN_EXERCISES_NAMES]
+        # bulk_create skips BestSet.save(), so fill the 1RM in from one instance.
+        template = BestSet(weight=100, reps=5)
+        estimated_1rm = template.calculate_1rm_brzycki()
+        BestSet.objects.bulk_create(
+            BestSet(
+                user=user,
+                exercise=exercise,
+                weight=template.weight,
+                reps=template.reps,
+                estimated_1rm=estimated_1rm,
+            )
+            for user in users
+            for exercise in main_exercises
+        )
+        return users
+
+    def delete_users(self, users, created_at):
+        user_ids = set(user.id for user in users)
+        activity_ids = set(
+            PRActivity.objects.filter(user_id__in=user_ids).values_list("id", flat=True)
+        )
+        # Cache rebuilds and PR fan-outs queued by add_best_set would fail
+        # once users are gone.
+        for task in TaskRecord.objects.filter(
+            status="READY", enqueued_at__gte=created_at
+        ).only("id", "task_path", "args"):
+            ids = (
+                activity_ids
+                if task.task_path == fan_out_activity.module_path
+                else user_ids
+            )
+            if task.args and task.args[0] in ids:
+                task.delete()
+        User.objects.filter(id__in=user_ids).delete()
+
+    def run_user(
+        self, username, password, host, port, mix, exercises, stats, stop_at, seed
+    ):
+        rng = random.Random(seed)
+        client = LoadClient(host, port)
+        try:
+            client.request("GET", reverse("login"))
+            status = client.request(
+                "POST",
+                reverse("login"),
+                {"username": username, "password": password},
+            )
+            if status != 302:
+                stats.record("login", 0, status)
+                return
+
+            names = list(mix)
+            weights = list(mix.values())
+            weight = 100
+            while time.perf_counter() < stop_at:
+                name = rng.choices(names, weights)[0]
+                method, path = ENDPOINTS[name]
+                data = None
+                if method == "POST":
+                    weight += 2.5
+                    data = {
+                        "exercise": rng.choice(exercises).id,
+                        "weight": weight,
+                        "reps": rng.randint(1, 10),
+                    }
+                request_started = time.perf_counter()
+                try:
+                    status = client.request(method, reverse(path), data)
+                except (http.client.HTTPException, OSError) as error:
+                    status = type(error).__name__
+                stats.record(name, time.perf_counter() - request_started, status)
+        finally:
+            client.close()
+
+    def report(self, stats, elapsed):
+        self.stdout.write(
+            f"\n{'endpoint':<14}{'requests':>9}{'req/s':>8}{'p50 ms':>9}"
+            f"{'p90 ms':>9}{'p99 ms':>9}{'max ms':>9}{'errors':>8}{'locked':>8}"
+        )
+        total = 0
+        for name in sorted(stats.latencies):
+            latencies = sorted(stats.latencies[name])
+            count = len(latencies)
+            total += count
+            errors = sum(
+                n
+                for status, n in stats.statuses[name].items()
+                if not _is_success(status)
+            )
+            self.stdout.write(
+                f"{name:<14}{count:>9}{count / elapsed:>8.1f}"
+                f"{_percentile(latencies, 50):>9.1f}{_percentile(latencies, 90):>9.1f}"
+                f"{_percentile(latencies, 99):>9.1f}{latencies[-1] * 1000:>9.1f}"
+                f"{errors / count:>8.1%}{stats.locked[name]:>8}"
+            )
+        self.stdout.write(
+            f"\n{total} requests in {elapsed:.1f}s, {total / elapsed:.1f} req/s"
+        )
+
+        for name in sorted(stats.statuses):
+            failed = {
+                status: n
+                for status, n in stats.statuses[name].items()
+                if not _is_success(status)
+            }
+            if failed:
+                self.stdout.write(self.style.WARNING(f"{name}: {failed}"))
+        for message, count in stats.exceptions.most_common(5):
+            self.stdout.write(self.style.WARNING(f"{count} x {message}"))
+
+
+def _is_success(status):
+    return isinstance(status, int) and status < 400
+
+
+def _percentile(sorted_values, percent):
+    if len(sorted_values) == 1:
+        return sorted_values[0] * 1000
+    return (
+        statistics.quantiles(sorted_values, n=100, method="inclusive")[percent - 1]
+        * 1000
+    )
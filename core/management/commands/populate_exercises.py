@@ -1,6 +1,50 @@
 from django.core.management.base import BaseCommand
 
-from core.models import Exercise
+from accounts.services import VolumeService
+from core.models import Exercise, ExerciseMuscle, MuscleGroup
+
+# Share of each set counted per muscle group: 1 for prime movers, 0.5 for
+# synergists.
+EXERCISE_MUSCLES = {
+    "Barbell Back Squat": {"Quads": 1, "Glutes": 0.5},
+    "Barbell Bench Press": {"Chest": 1, "Front Delts": 0.5, "Triceps": 0.5},
+    "Incline Barbell Bench Press": {"Chest": 1, "Front Delts": 0.5, "Triceps": 0.5},
+    "Deadlift": {"Glutes": 1, "Lower Back": 1, "Hamstrings": 0.5, "Upper Back": 0.5},
+    "Romanian Deadlift": {"Hamstrings": 1, "Glutes": 0.5, "Lower Back": 0.5},
+    "Overhead Barbell Press": {"Front Delts": 1, "Side Delts": 0.5, "Triceps": 0.5},
+    "Seated Dumbbell Shoulder Press": {
+        "Front Delts": 1,
+        "Side Delts": 0.5,
+        "Triceps": 0.5,
+    },
+    "Dumbbell Lateral Raises": {"Side Delts": 1},
+    "Cable Lateral Raises": {"Side Delts": 1},
+    "Weighted Pull-Ups": {"Lats": 1, "Biceps": 0.5, "Upper Back": 0.5},
+    "Bent-Over Barbell Row": {
+        "Upper Back": 1,
+        "Lats": 0.5,
+        "Rear Delts": 0.5,
+        "Biceps": 0.5,
+    },
+    "Seated Cable Row": {"Upper Back": 1, "Lats": 0.5, "Biceps": 0.5},
+    "Lat Pulldown": {"Lats": 1, "Biceps": 0.5},
+    "Barbell Hip Thrust": {"Glutes": 1, "Hamstrings": 0.5},
+    "Leg Press": {"Quads": 1, "Glutes": 0.5},
+    "Standing Calf Raises": {"Calves": 1},
+    "Seated Calf Raises": {"Calves": 1},
+    "Dumbbell Bench Press": {"Chest": 1, "Front Delts": 0.5, "Triceps": 0.5},
+    "Incline Dumbbell Bench Press": {"Chest": 1, "Front Delts": 0.5, "Triceps": 0.5},
+    "Dumbbell Flyes": {"Chest": 1},
+    "Weighted Dips": {"Chest": 1, "Triceps": 1, "Front Delts": 0.5},
+    "Barbell Curl": {"Biceps": 1},
+    "Dumbbell Curl": {"Biceps": 1},
+    "Incline Bench Dumbbell Curl": {"Biceps": 1},
+    "Hammer Curl": {"Biceps": 1},
+    "Skull Crushers": {"Triceps": 1},
+    "Cable Triceps Pushdown": {"Triceps": 1},
+    "Leg Extension": {"Quads": 1},
+    "Leg Curl": {"Hamstrings": 1},
+}
 
 
 class Command(BaseCommand):
@@ -53,3 +97,33 @@ class Command(BaseCommand):
         self.stdout.write(
             self.style.SUCCESS(f"Готово! Создано {created_count} новых упражнений.")
         )
+
+        muscles = {
+            name: MuscleGroup.objects.get_or_create(name=name)[0]
+            for name in sorted(
+                {m for shares in EXERCISE_MUSCLES.values() for m in shares}
+            )
+        }
+        exercise_ids = dict(
+            Exercise.objects.filter(name__in=EXERCISE_MUSCLES).values_list("name", "id")
+        )
+        # Only fills in missing tags, contributions edited in the admin stay.
+        ExerciseMuscle.objects.bulk_create(
+            [
+                ExerciseMuscle(
+                    exercise_id=exercise_ids[exercise],
+                    muscle=muscles[muscle],
+                    contribution=contribution,
+                )
+                for exercise, shares in EXERCISE_MUSCLES.items()
+                if exercise in exercise_ids
+                for muscle, contribution in shares.items()
+            ],
+            ignore_conflicts=True,
+        )
+        VolumeService.invalidate_matrix()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Группы мышц: {len(muscles)}, связи с упражнениями обновлены."
+            )
+        )
@@ -0,0 +1,72 @@
+from collections import Counter, defaultdict
+
+from django.core.management.base import BaseCommand
+
+from core.profiling import get_profile_store
+
+
+class Command(BaseCommand):
+    help = (
+        "Merges stored request profiles per view and prints the hottest call "
+        "stacks; --collapsed writes flame graph input"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--view", help="Only include this view name")
+        parser.add_argument(
+            "--top",
+            type=int,
+            default=10,
+            help="Stacks shown per view (default: 10)",
+        )
+        parser.add_argument(
+            "--collapsed",
+            metavar="PATH",
+            help="Write merged stacks as 'view;frame;...;frame count' lines, "
+            "readable by flamegraph.pl and speedscope",
+        )
+
+    def handle(self, *args, **options):
+        samples_by_view = defaultdict(Counter)
+        requests_by_view = Counter()
+        duration_by_view = Counter()
+
+        for profile in get_profile_store().load():
+            view = profile["view"]
+            if options["view"] and view != options["view"]:
+                continue
+            samples_by_view[view].update(profile["samples"])
+            requests_by_view[view] += 1
+            duration_by_view[view] += profile["duration_ms"]
+
+        if not samples_by_view:
+            self.stdout.write(self.style.WARNING("No profiles stored."))
+            return
+
+        for view, samples in sorted(
+            samples_by_view.items(), key=lambda item: -sum(item[1].values())
+        ):
+            total = sum(samples.values())
+            requests = requests_by_view[view]
+            self.stdout.write(
+                self.style.MIGRATE_HEADING(
+                    f"{view}: {requests} requests, "
+                    f"avg {duration_by_view[view] / requests:.1f} ms, {total} samples"
+                )
+            )
+            for stack, count in samples.most_common(options["top"]):
+                frames = stack.split(";")
+                self.stdout.write(f"  {count / total:6.1%}  {frames[-1]}")
+                for frame in reversed(frames[-6:-1]):
+                    self.stdout.write(f"            <- {frame}")
+
+        if options["collapsed"]:
+            with open(options["collapsed"], "w") as output:
+                for view, samples in samples_by_view.items():
+                    for stack, count in samples.items():
+                        output.write(f"{view};{stack} {count}\n")
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Collapsed stacks written to {options['collapsed']}"
+                )
+            )
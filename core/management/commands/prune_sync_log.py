@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.services import SyncService
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes old sync operation results and change log rows superseded "
+        "by newer ones, keeping both tables bounded"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=30,
+            help="Keep everything newer than this many days (default: 30)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Rows deleted per statement (default: 1000)",
+        )
+
+    def handle(self, *args, **options):
+        if options["days"] < 1:
+            raise CommandError("--days must be at least 1")
+
+        operations, changes = SyncService.prune(options["days"], options["batch_size"])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Deleted {operations} sync operations and {changes} change log rows."
+            )
+        )
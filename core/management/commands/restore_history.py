@@ -0,0 +1,24 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.services import HistoryArchiveService
+
+
+class Command(BaseCommand):
+    help = "Restores best set history rows from a compact_history archive"
+
+    def add_arguments(self, parser):
+        parser.add_argument("archive", nargs="+", help="Path to a .jsonl.gz archive")
+
+    def handle(self, *args, **options):
+        for archive in options["archive"]:
+            if not Path(archive).is_file():
+                raise CommandError(f"Archive not found: {archive}")
+
+            restored, skipped = HistoryArchiveService.restore(archive)
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{archive}: restored {restored} rows, skipped {skipped}."
+                )
+            )
@@ -0,0 +1,100 @@
+import threading
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.tasks import DEFAULT_TASK_BACKEND_ALIAS, task_backends
+from django.utils.crypto import get_random_string
+
+from core.task_backend import DatabaseBackend
+
+
+class Command(BaseCommand):
+    help = "Runs tasks queued in the database task backend"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--backend",
+            default=DEFAULT_TASK_BACKEND_ALIAS,
+            help="Task backend alias from settings.TASKS",
+        )
+        parser.add_argument(
+            "--queue",
+            action="append",
+            dest="queues",
+            help="Queue to process (repeatable, default: all queues of the backend)",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=1,
+            help="Number of worker threads",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            help="Seconds to wait when the queue is empty",
+        )
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="Exit once there are no runnable tasks left",
+        )
+
+    def handle(self, *args, **options):
+        backend = task_backends[options["backend"]]
+        if not isinstance(backend, DatabaseBackend):
+            raise CommandError(
+                f"Backend '{options['backend']}' is not a DatabaseBackend"
+            )
+        if options["concurrency"] < 1:
+            raise CommandError("--concurrency must be at least 1")
+
+        self.stop = threading.Event()
+        worker_args = (
+            backend,
+            options["queues"],
+            options["interval"],
+            options["burst"],
+        )
+
+        self.stdout.write(
+            f"Worker started: {options['concurrency']} thread(s), "
+            f"queues: {', '.join(options['queues'] or sorted(backend.queues))}"
+        )
+
+        try:
+            if options["concurrency"] == 1:
+                self.work(*worker_args)
+            else:
+                threads = [
+                    threading.Thread(target=self.work_in_thread, args=worker_args)
+                    for _ in range(options["concurrency"])
+                ]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    while thread.is_alive():
+                        thread.join(timeout=1)
+        except KeyboardInterrupt:
+            self.stop.set()
+            self.stdout.write(self.style.WARNING("Stopping worker..."))
+
+        self.stdout.write(self.style.SUCCESS("Worker stopped"))
+
+    def work(self, backend, queues, interval, burst):
+        worker_id = get_random_string(32)
+        while not self.stop.is_set():
+            record = backend.claim_next(queues)
+            if record is None:
+                if burst:
+                    return
+                self.stop.wait(interval)
+                continue
+            backend.run(record, worker_id)
+
+    def work_in_thread(self, *worker_args):
+        try:
+            self.work(*worker_args)
+        finally:
+            connections.close_all()
@@ -0,0 +1,50 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+
+class Command(BaseCommand):
+    help = (
+        "Copies the SQLite primary database into the replica file with the "
+        "SQLite backup API, standing in for replication"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--path",
+            help="Replica file (default: the replica database's NAME)",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=0,
+            help="Keep copying every N seconds; 0 copies once (default: 0)",
+        )
+
+    def handle(self, *args, **options):
+        primary = connections["default"]
+        if primary.vendor != "sqlite":
+            raise CommandError("sync_replica only copies SQLite databases.")
+        path = options["path"] or settings.DATABASES.get("replica", {}).get("NAME")
+        if not path:
+            raise CommandError("Set REPLICA_DB_PATH in .env or pass --path.")
+
+        while True:
+            started = time.perf_counter()
+            primary.ensure_connection()
+            replica = sqlite3.connect(path)
+            try:
+                # Copies a consistent snapshot; replica readers see the old or
+                # the new pages, never a mix.
+                primary.connection.backup(replica)
+            finally:
+                replica.close()
+            self.stdout.write(
+                f"Replica {path} synced in {(time.perf_counter() - started) * 1000:.0f} ms"
+            )
+            if not options["interval"]:
+                break
+            time.sleep(options["interval"])
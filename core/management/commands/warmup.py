@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from core.warmup import warm_up
+
+
+class Command(BaseCommand):
+    help = "Runs the startup warm-up and prints how long each stage took"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--no-database",
+            action="store_true",
+            help="Skip stages that touch the database",
+        )
+
+    def handle(self, *args, **options):
+        timings = warm_up(database=not options["no_database"])
+        for stage, seconds in timings.items():
+            self.stdout.write(f"{stage:<10} {seconds * 1000:8.1f} ms")
+        self.stdout.write(
+            self.style.SUCCESS(f"Warm-up done in {sum(timings.values()) * 1000:.1f} ms")
+        )
@@ -0,0 +1,58 @@
+# Generated by Django 6.0.1 on 2026-10-19 10:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0002_alter_bestset_options_alter_mesocycle_options_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskRecord",
+            fields=[
+                (
+                    "id",
+                    models.CharField(max_length=32, primary_key=True, serialize=False),
+                ),
+                ("backend", models.CharField(default="default", max_length=100)),
+                ("task_path", models.CharField(max_length=255)),
+                ("queue_name", models.CharField(default="default", max_length=100)),
+                ("priority", models.IntegerField(default=0)),
+                ("args", models.JSONField(default=list)),
+                ("kwargs", models.JSONField(default=dict)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("READY", "Ready"),
+                            ("RUNNING", "Running"),
+                            ("FAILED", "Failed"),
+                            ("SUCCESSFUL", "Successful"),
+                        ],
+                        default="READY",
+                        max_length=10,
+                    ),
+                ),
+                ("run_after", models.DateTimeField()),
+                ("enqueued_at", models.DateTimeField(auto_now_add=True)),
+                ("started_at", models.DateTimeField(blank=True, null=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                ("last_attempted_at", models.DateTimeField(blank=True, null=True)),
+                ("attempts", models.IntegerField(default=0)),
+                ("worker_ids", models.JSONField(default=list)),
+                ("errors", models.JSONField(default=list)),
+                ("return_value", models.JSONField(blank=True, null=True)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["status", "queue_name", "-priority", "run_after"],
+                        name="core_task_claim_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 6.0.1 on 2026-10-19 10:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0003_taskrecord"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="bestset",
+            name="updated_at",
+            field=models.DateField(auto_now=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name="bestsethistory",
+            name="created_at",
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name="mesocycle",
+            name="start_date",
+            field=models.DateField(db_index=True),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 6.0.1 on 2026-10-19 10:51
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0004_date_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="bestsethistory",
+            name="created_at",
+            field=models.DateTimeField(
+                db_index=True, default=django.utils.timezone.now
+            ),
+        ),
+    ]
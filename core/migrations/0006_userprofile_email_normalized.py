@@ -0,0 +1,20 @@
+# Generated by Django 6.0.1 on 2026-10-19 10:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0005_history_created_at_default"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="userprofile",
+            name="email_normalized",
+            field=models.CharField(
+                blank=True, editable=False, max_length=254, null=True, unique=True
+            ),
+        ),
+    ]
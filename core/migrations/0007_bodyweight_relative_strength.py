@@ -0,0 +1,87 @@
+# Generated by Django 6.0.1 on 2026-10-19 11:03
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0006_userprofile_email_normalized"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="bestset",
+            name="dots",
+            field=models.FloatField(
+                blank=True, help_text="DOTS score of the 1RM", null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="bestset",
+            name="wilks",
+            field=models.FloatField(
+                blank=True, help_text="Wilks score of the 1RM", null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="bestsethistory",
+            name="dots",
+            field=models.FloatField(
+                blank=True, help_text="DOTS score of the 1RM", null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="bestsethistory",
+            name="wilks",
+            field=models.FloatField(
+                blank=True, help_text="Wilks score of the 1RM", null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="userprofile",
+            name="sex",
+            field=models.CharField(
+                blank=True, choices=[("M", "Male"), ("F", "Female")], max_length=1
+            ),
+        ),
+        migrations.CreateModel(
+            name="BodyweightLog",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "measured_on",
+                    models.DateField(default=django.utils.timezone.localdate),
+                ),
+                ("weight", models.FloatField(help_text="Bodyweight in kg")),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="bodyweight_logs",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-measured_on"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("user", "measured_on"), name="core_bodyweight_user_day"
+                    )
+                ],
+            },
+        ),
+    ]
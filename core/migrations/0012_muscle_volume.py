@@ -0,0 +1,93 @@
+# Generated by Django 6.0.1 on 2026-10-19 11:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# MesocycleService.WEEKS_CONFIG sets per week when this migration was written.
+WEEK_SETS = {1: 3, 2: 4, 3: 3, 4: 2}
+
+
+def fill_target_sets(apps, schema_editor):
+    Mesocycle = apps.get_model("core", "Mesocycle")
+    for week, sets in WEEK_SETS.items():
+        Mesocycle.objects.filter(week=week).update(target_sets=sets)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0011_history_series"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MuscleGroup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100, unique=True)),
+            ],
+            options={
+                "ordering": ["name"],
+            },
+        ),
+        migrations.AddField(
+            model_name="mesocycle",
+            name="target_sets",
+            field=models.PositiveSmallIntegerField(
+                default=3, help_text="Sets per week"
+            ),
+        ),
+        migrations.CreateModel(
+            name="ExerciseMuscle",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "contribution",
+                    models.FloatField(
+                        default=1.0,
+                        help_text="Sets counted per set: 1 for a prime mover, 0.5 for a synergist",
+                    ),
+                ),
+                (
+                    "exercise",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="muscles",
+                        to="core.exercise",
+                    ),
+                ),
+                (
+                    "muscle",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="exercises",
+                        to="core.musclegroup",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("exercise", "muscle"), name="core_exercise_muscle"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(fill_target_sets, migrations.RunPython.noop),
+    ]
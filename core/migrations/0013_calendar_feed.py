@@ -0,0 +1,28 @@
+# Generated by Django 6.0.1 on 2026-10-19 11:38
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0012_muscle_volume"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="userprofile",
+            name="calendar_token",
+            field=models.CharField(
+                blank=True, editable=False, max_length=43, null=True, unique=True
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="mesocycle",
+            index=models.Index(
+                fields=["user", "created_at"], name="core_mesocycle_created_idx"
+            ),
+        ),
+    ]
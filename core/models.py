@@ -1,16 +1,46 @@
 from django.contrib.auth.models import User
 from django.db import models
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
+from django.utils import timezone
 
 
 class UserProfile(models.Model):
+    SEX_CHOICES = [("M", "Male"), ("F", "Female")]
+
     user = models.OneToOneField(User, on_delete=models.CASCADE)
+    # Selects the DOTS/Wilks coefficients; scores stay empty while unset.
+    sex = models.CharField(max_length=1, choices=SEX_CHOICES, blank=True)
+    # Case-folded copy of user.email; auth_user.email has no index.
+    email_normalized = models.CharField(
+        max_length=254, unique=True, null=True, blank=True, editable=False
+    )
+    # Kept up to date by FeedService; decides fan-out on write vs on read.
+    follower_count = models.PositiveIntegerField(default=0, editable=False)
+    # Secret part of the iCalendar feed URL, issued when first shown.
+    calendar_token = models.CharField(
+        max_length=43, unique=True, null=True, blank=True, editable=False
+    )
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
         return f"{self.user.username} Profile"
 
+    @staticmethod
+    def normalize_email(email):
+        """Lookup form of an email address, None for an empty one."""
+        email = (email or "").strip()
+        return email.casefold() or None
+
+    @staticmethod
+    def email_conflicts(email_normalized, user_id=None) -> bool:
+        """Whether another user's profile already holds the address."""
+        return bool(email_normalized) and (
+            UserProfile.objects.filter(email_normalized=email_normalized)
+            .exclude(user_id=user_id)
+            .exists()
+        )
+
 
 class Exercise(models.Model):
     name = models.CharField(max_length=200, unique=True)
@@ -25,13 +55,58 @@ class Exercise(models.Model):
         return self.name
 
 
+class MuscleGroup(models.Model):
+    name = models.CharField(max_length=100, unique=True)
+
+    class Meta:
+        ordering = ["name"]
+
+    def __str__(self):
+        return self.name
+
+
+class ExerciseMuscle(models.Model):
+    """Share of an exercise's sets that counts toward a muscle group's volume."""
+
+    exercise = models.ForeignKey(
+        Exercise, on_delete=models.CASCADE, related_name="muscles"
+    )
+    muscle = models.ForeignKey(
+        MuscleGroup, on_delete=models.CASCADE, related_name="exercises"
+    )
+    contribution = models.FloatField(
+        default=1.0,
+        help_text="Sets counted per set: 1 for a prime mover, 0.5 for a synergist",
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["exercise", "muscle"], name="core_exercise_muscle"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.exercise.name} - {self.muscle.name}: {self.contribution}"
+
+
+@receiver([post_save, post_delete], sender=ExerciseMuscle)
+def drop_muscle_matrix(sender, **kwargs):
+    # Imported here: the services import the models.
+    from accounts.services.volume_service import VolumeService
+
+    VolumeService.invalidate_matrix()
+
+
 class BestSet(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="best_sets")
     exercise = models.ForeignKey(Exercise, on_delete=models.CASCADE)
     weight = models.FloatField(help_text="Weight in kg")
     reps = models.IntegerField(help_text="Repetitions")
     estimated_1rm = models.FloatField(help_text="Calculated 1RM (Brzycki)")
-    updated_at = models.DateField(auto_now=True)
+    updated_at = models.DateField(auto_now=True, db_index=True)
+    dots = models.FloatField(null=True, blank=True, help_text="DOTS score of the 1RM")
+    wilks = models.FloatField(null=True, blank=True, help_text="Wilks score of the 1RM")
 
     def calculate_1rm_brzycki(self):
         """Brzycki formula: 1RM = weight / (1.0278 - 0.0278 * reps)"""
@@ -58,7 +133,15 @@ def create_user_profile(sender, instance, created, **kwargs):
 
 @receiver(post_save, sender=User)
 def save_user_profile(sender, instance, **kwargs):
-    instance.userprofile.save()
+    profile = instance.userprofile
+    email_normalized = UserProfile.normalize_email(instance.email)
+    # Like backfill_profile_emails, an address another user holds stays
+    # off the profile; forms reject it, createsuperuser and scripts do not.
+    if UserProfile.email_conflicts(email_normalized, instance.id):
+        email_normalized = None
+    if profile.email_normalized != email_normalized:
+        profile.email_normalized = email_normalized
+        profile.save(update_fields=["email_normalized"])
 
 
 class Mesocycle(models.Model):
@@ -66,7 +149,7 @@ class Mesocycle(models.Model):
 
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="mesocycles")
     exercise = models.ForeignKey(Exercise, on_delete=models.CASCADE)
-    start_date = models.DateField()
+    start_date = models.DateField(db_index=True)
     week = models.IntegerField(
         choices=[(1, "Week 1"), (2, "Week 2"), (3, "Week 3"), (4, "Week 4")]
     )
@@ -75,8 +158,17 @@ class Mesocycle(models.Model):
     target_weight = models.FloatField()
     target_reps_min = models.IntegerField()
     target_reps_max = models.IntegerField()
+    target_sets = models.PositiveSmallIntegerField(default=3, help_text="Sets per week")
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Latest cycle lookup and the calendar feed ETag, from the index alone.
+            models.Index(
+                fields=["user", "created_at"], name="core_mesocycle_created_idx"
+            ),
+        ]
+
     def __str__(self):
         return f"{self.user.username} - {self.exercise.name} - Week {self.week}"
 
@@ -92,8 +184,11 @@ class BestSetHistory(models.Model):
     weight = models.FloatField(help_text="Weight in kg")
     reps = models.IntegerField(help_text="Repetitions")
     estimated_1rm = models.FloatField(help_text="Calculated 1RM (Brzycki)")
+    dots = models.FloatField(null=True, blank=True, help_text="DOTS score of the 1RM")
+    wilks = models.FloatField(null=True, blank=True, help_text="Wilks score of the 1RM")
 
-    created_at = models.DateTimeField(auto_now_add=True)
+    # Not auto_now_add: archived rows are restored with their original time.
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
 
     class Meta:
         ordering = ["-created_at"]
@@ -103,3 +198,218 @@ class BestSetHistory(models.Model):
             f"{self.user.username} - {self.exercise.name}: "
             f"{self.weight}kg x {self.reps} ({self.estimated_1rm}kg)"
         )
+
+
+class HistorySeries(models.Model):
+    """
+    BestSetHistory of one (user, exercise) as packed little-endian arrays,
+    read whole for charts. Derived from the rows; see HistorySeriesService.
+    """
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    exercise = models.ForeignKey(Exercise, on_delete=models.CASCADE, related_name="+")
+    days = models.BinaryField(help_text="int32 days since 1970-01-01")
+    values = models.BinaryField(help_text="float32 estimated 1RMs")
+
+    class Meta:
+        verbose_name_plural = "history series"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "exercise"], name="core_history_series_user_exercise"
+            ),
+        ]
+
+    def __str__(self):
+        return (
+            f"{self.user.username} - {self.exercise.name}: {len(self.days) // 4} points"
+        )
+
+
+class BodyweightLog(models.Model):
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="bodyweight_logs"
+    )
+    measured_on = models.DateField(default=timezone.localdate)
+    weight = models.FloatField(help_text="Bodyweight in kg")
+
+    class Meta:
+        ordering = ["-measured_on"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "measured_on"], name="core_bodyweight_user_day"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - {self.measured_on}: {self.weight}kg"
+
+
+class CoachAthlete(models.Model):
+    coach = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="athlete_links"
+    )
+    athlete = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="coach_links"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            # Also serves the roster's keyset paging by athlete id.
+            models.UniqueConstraint(
+                fields=["coach", "athlete"], name="core_coach_athlete"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.coach.username} -> {self.athlete.username}"
+
+
+class Follow(models.Model):
+    follower = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="following_links"
+    )
+    followee = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="follower_links"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["follower", "followee"], name="core_follow_pair"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.follower.username} follows {self.followee.username}"
+
+
+class PRActivity(models.Model):
+    """A new best set, shown in the feeds of the lifter, followers and coaches."""
+
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="pr_activities"
+    )
+    exercise = models.ForeignKey(Exercise, on_delete=models.CASCADE, related_name="+")
+    weight = models.FloatField(help_text="Weight in kg")
+    reps = models.IntegerField(help_text="Repetitions")
+    estimated_1rm = models.FloatField(help_text="Calculated 1RM (Brzycki)")
+    previous_1rm = models.FloatField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name_plural = "PR activities"
+        indexes = [
+            # Timelines of accounts read on demand instead of fanned out.
+            models.Index(fields=["user", "id"], name="core_practivity_user_idx"),
+        ]
+
+    @property
+    def gain(self):
+        """1RM gained over the previous best, None for a first set."""
+        if self.previous_1rm is None:
+            return None
+        return round(self.estimated_1rm - self.previous_1rm, 2)
+
+    def __str__(self):
+        return (
+            f"{self.user.username} - {self.exercise.name}: "
+            f"{self.weight}kg x {self.reps} ({self.estimated_1rm}kg)"
+        )
+
+
+class FeedItem(models.Model):
+    """Copy of an activity in one recipient's feed, paged by activity id."""
+
+    recipient = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    activity = models.ForeignKey(
+        PRActivity, on_delete=models.CASCADE, related_name="feed_items"
+    )
+
+    class Meta:
+        constraints = [
+            # Also serves the feed's keyset paging and makes fan-out retryable.
+            models.UniqueConstraint(
+                fields=["recipient", "activity"], name="core_feed_recipient_activity"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.recipient.username} - {self.activity}"
+
+
+class ChangeLog(models.Model):
+    """Best set changes per user; sync clients read it from a cursor (id)."""
+
+    ACTION_CHOICES = [("upsert", "Upsert"), ("delete", "Delete")]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    exercise = models.ForeignKey(Exercise, on_delete=models.CASCADE, related_name="+")
+    action = models.CharField(max_length=6, choices=ACTION_CHOICES)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "id"], name="core_changelog_cursor_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - {self.exercise.name}: {self.action}"
+
+
+class SyncOperation(models.Model):
+    """Result of a client operation, kept so retried batches are not re-applied."""
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    key = models.CharField(max_length=64)
+    result = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "key"], name="core_sync_user_key"),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - {self.key}"
+
+
+class TaskRecord(models.Model):
+    """Task queued through the database task backend."""
+
+    STATUS_CHOICES = [
+        ("READY", "Ready"),
+        ("RUNNING", "Running"),
+        ("FAILED", "Failed"),
+        ("SUCCESSFUL", "Successful"),
+    ]
+
+    id = models.CharField(primary_key=True, max_length=32)
+    backend = models.CharField(max_length=100, default="default")
+    task_path = models.CharField(max_length=255)
+    queue_name = models.CharField(max_length=100, default="default")
+    priority = models.IntegerField(default=0)
+    args = models.JSONField(default=list)
+    kwargs = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="READY")
+    run_after = models.DateTimeField()
+    enqueued_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    last_attempted_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.IntegerField(default=0)
+    worker_ids = models.JSONField(default=list)
+    errors = models.JSONField(default=list)
+    return_value = models.JSONField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["status", "queue_name", "-priority", "run_after"],
+                name="core_task_claim_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.task_path} ({self.status})"
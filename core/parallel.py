@@ -0,0 +1,27 @@
+import multiprocessing
+
+import django
+from django.db import connections
+
+
+def init_worker():
+    # Spawned workers start without Django; forked ones must not share
+    # the parent's database connection.
+    django.setup()
+    connections.close_all()
+
+
+def map_chunks(function, chunks, processes: int = 1):
+    """
+    Yield function(chunk) for every chunk, unordered, from a pool of worker
+    processes; processes=1 runs inline. function must be importable
+    (module level) and should close its connections when done.
+    """
+    if processes <= 1:
+        for chunk in chunks:
+            yield function(chunk)
+        return
+
+    connections.close_all()
+    with multiprocessing.Pool(processes, init_worker) as pool:
+        yield from pool.imap_unordered(function, chunks)
@@ -0,0 +1,146 @@
+import json
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.crypto import get_random_string
+
+
+class StackSampler:
+    """Records the Python stack of one thread at a fixed interval."""
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        self._thread.join()
+        return self.samples
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.samples[collapse_stack(frame)] += 1
+
+
+def collapse_stack(frame) -> str:
+    """Stack as 'root;...;leaf', the collapsed format flame graph tools read."""
+    frames = []
+    while frame is not None:
+        code = frame.f_code
+        frames.append(
+            f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})"
+        )
+        frame = frame.f_back
+    return ";".join(reversed(frames))
+
+
+def _short_path(filename: str) -> str:
+    for marker in ("site-packages/", str(settings.BASE_DIR) + "/"):
+        if marker in filename:
+            return filename.split(marker, 1)[1]
+    return filename
+
+
+class ProfileStore:
+    """Directory of per-request profiles that keeps only the newest ones."""
+
+    def __init__(self, directory, max_profiles: int):
+        self.directory = Path(directory)
+        self.max_profiles = max_profiles
+
+    def save(self, profile: dict) -> Path:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        view = re.sub(r"[^\w.-]", "_", profile["view"])
+        path = self.directory / (
+            f"{timezone.now():%Y%m%d%H%M%S%f}_{view}_{get_random_string(6)}.json"
+        )
+        path.write_text(json.dumps(profile))
+        self._trim()
+        return path
+
+    def load(self):
+        for path in sorted(self.directory.glob("*.json")):
+            try:
+                yield json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue  # Removed by _trim() or partially written
+
+    def _trim(self):
+        paths = sorted(self.directory.glob("*.json"))
+        for path in paths[: max(len(paths) - self.max_profiles, 0)]:
+            path.unlink(missing_ok=True)
+
+
+def get_profile_store() -> ProfileStore:
+    return ProfileStore(settings.PROFILER_DIR, settings.PROFILER_MAX_PROFILES)
+
+
+class SamplingProfilerMiddleware:
+    """
+    Samples the request thread's stack and stores one profile per request.
+
+    A request is profiled when any of these apply:
+        - a staff user passes the PROFILER_QUERY_FLAG query parameter;
+        - the path matches one of PROFILER_URL_PATTERNS;
+        - it is picked at random with probability PROFILER_SAMPLE_RATE.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not self.should_profile(request):
+            return self.get_response(request)
+
+        sampler = StackSampler(threading.get_ident(), settings.PROFILER_INTERVAL)
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            samples = sampler.stop()
+        duration = time.perf_counter() - started
+
+        resolver_match = getattr(request, "resolver_match", None)
+        get_profile_store().save(
+            {
+                "view": resolver_match.view_name if resolver_match else "unresolved",
+                "path": request.path,
+                "method": request.method,
+                "status": response.status_code,
+                "duration_ms": round(duration * 1000, 2),
+                "interval": settings.PROFILER_INTERVAL,
+                "samples": samples,
+            }
+        )
+        return response
+
+    def should_profile(self, request) -> bool:
+        user = getattr(request, "user", None)
+        if (
+            settings.PROFILER_QUERY_FLAG in request.GET
+            and user is not None
+            and user.is_staff
+        ):
+            return True
+        if any(
+            re.search(pattern, request.path)
+            for pattern in settings.PROFILER_URL_PATTERNS
+        ):
+            return True
+        return random.random() < settings.PROFILER_SAMPLE_RATE
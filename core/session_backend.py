@@ -0,0 +1,42 @@
+from django.conf import settings
+from django.contrib.sessions.backends.cached_db import SessionStore as CachedDBStore
+from django.core.cache.backends.locmem import LocMemCache
+
+
+class SessionStore(CachedDBStore):
+    """
+    cached_db sessions. Reads come from the cache, writes go through to the
+    database. On a per-process cache, entries live at most
+    SESSION_LOCAL_CACHE_TTL seconds instead of the whole session age, so a
+    logout or login in one worker reaches the other workers' caches quickly.
+    """
+
+    def __init__(self, session_key=None):
+        super().__init__(session_key)
+        if isinstance(self._cache, LocMemCache):
+            self._cache = _CappedTimeoutCache(
+                self._cache, settings.SESSION_LOCAL_CACHE_TTL
+            )
+
+
+class _CappedTimeoutCache:
+    def __init__(self, cache, max_timeout):
+        self._cache = cache
+        self._max_timeout = max_timeout
+
+    def _timeout(self, timeout):
+        if timeout is None:
+            return self._max_timeout
+        return min(timeout, self._max_timeout)
+
+    def set(self, key, value, timeout=None, version=None):
+        return self._cache.set(key, value, self._timeout(timeout), version)
+
+    async def aset(self, key, value, timeout=None, version=None):
+        return await self._cache.aset(key, value, self._timeout(timeout), version)
+
+    def __getattr__(self, name):
+        return getattr(self._cache, name)
+
+    def __contains__(self, key):
+        return key in self._cache
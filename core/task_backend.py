@@ -0,0 +1,210 @@
+import logging
+from datetime import timedelta
+from traceback import format_exception
+
+from django.db.models import F, Value
+from django.db.models.functions import Coalesce
+from django.tasks import TaskContext, TaskResult, TaskResultStatus
+from django.tasks.backends.base import BaseTaskBackend
+from django.tasks.base import TaskError
+from django.tasks.exceptions import TaskResultDoesNotExist
+from django.tasks.signals import task_enqueued, task_finished, task_started
+from django.utils import timezone
+from django.utils.crypto import get_random_string
+from django.utils.json import normalize_json
+from django.utils.module_loading import import_string
+
+from .models import TaskRecord
+
+logger = logging.getLogger(__name__)
+
+
+class DatabaseBackend(BaseTaskBackend):
+    """
+    Stores tasks in the TaskRecord table; the run_worker command executes them.
+
+    OPTIONS:
+        MAX_ATTEMPTS - how many times a failing task is run (default 3).
+        RETRY_DELAY - seconds before the first retry, doubled on each next one.
+        LEASE_TIMEOUT - seconds after which a RUNNING task counts as lost with
+            its worker and is run again (default 900); keep it above the
+            longest task.
+    """
+
+    supports_defer = True
+    supports_get_result = True
+    supports_priority = True
+
+    # How many candidates a worker looks at when another worker races it.
+    CLAIM_BATCH = 10
+
+    def __init__(self, alias, params):
+        super().__init__(alias, params)
+        self.max_attempts = self.options.get("MAX_ATTEMPTS", 3)
+        self.retry_delay = self.options.get("RETRY_DELAY", 30)
+        self.lease_timeout = self.options.get("LEASE_TIMEOUT", 900)
+
+    def enqueue(self, task, args, kwargs):
+        self.validate_task(task)
+
+        record = TaskRecord.objects.create(
+            id=get_random_string(32),
+            backend=self.alias,
+            task_path=task.module_path,
+            queue_name=task.queue_name,
+            priority=task.priority,
+            args=normalize_json(args),
+            kwargs=normalize_json(kwargs),
+            run_after=task.run_after or timezone.now(),
+        )
+
+        task_result = self._to_result(record, task)
+        task_enqueued.send(type(self), task_result=task_result)
+        return task_result
+
+    def get_result(self, result_id):
+        try:
+            record = TaskRecord.objects.get(id=result_id, backend=self.alias)
+        except TaskRecord.DoesNotExist:
+            raise TaskResultDoesNotExist(result_id)
+        return self._to_result(record)
+
+    def requeue_stale(self, now=None):
+        """
+        Return tasks whose worker died while running them to READY, or mark
+        them FAILED when out of attempts. Returns the number of tasks changed.
+        """
+        now = now or timezone.now()
+        stale = TaskRecord.objects.filter(
+            backend=self.alias,
+            status=TaskResultStatus.RUNNING,
+            last_attempted_at__lt=now - timedelta(seconds=self.lease_timeout),
+        )
+        requeued = stale.filter(attempts__lt=self.max_attempts).update(
+            status=TaskResultStatus.READY, run_after=now
+        )
+        failed = stale.update(status=TaskResultStatus.FAILED, finished_at=now)
+        if requeued or failed:
+            logger.warning(
+                "Requeued %s and failed %s tasks left running by lost workers",
+                requeued,
+                failed,
+            )
+        return requeued + failed
+
+    def claim_next(self, queues=None):
+        """Mark the most urgent runnable task as RUNNING and return it, or None."""
+        now = timezone.now()
+        self.requeue_stale(now)
+        candidate_ids = (
+            TaskRecord.objects.filter(
+                backend=self.alias,
+                status=TaskResultStatus.READY,
+                queue_name__in=queues or self.queues,
+                run_after__lte=now,
+            )
+            .order_by("-priority", "run_after")
+            .values_list("id", flat=True)[: self.CLAIM_BATCH]
+        )
+
+        for task_id in candidate_ids:
+            # Only one worker can flip READY -> RUNNING, the others get 0 rows.
+            claimed = TaskRecord.objects.filter(
+                id=task_id, status=TaskResultStatus.READY
+            ).update(
+                status=TaskResultStatus.RUNNING,
+                started_at=Coalesce(F("started_at"), Value(now)),
+                last_attempted_at=now,
+                attempts=F("attempts") + 1,
+            )
+            if claimed:
+                return TaskRecord.objects.get(id=task_id)
+        return None
+
+    def run(self, record, worker_id):
+        """Execute a claimed task and store the outcome, scheduling a retry on failure."""
+        record.worker_ids.append(worker_id)
+
+        try:
+            task = import_string(record.task_path)
+        except ImportError as e:
+            self._store_failure(record, e, retry=False)
+            return
+
+        task_result = self._to_result(record, task)
+        task_started.send(type(self), task_result=task_result)
+
+        try:
+            if task.takes_context:
+                return_value = task.call(
+                    TaskContext(task_result=task_result), *record.args, **record.kwargs
+                )
+            else:
+                return_value = task.call(*record.args, **record.kwargs)
+            record.return_value = normalize_json(return_value)
+        except Exception as e:
+            self._store_failure(record, e, retry=record.attempts < self.max_attempts)
+        else:
+            record.status = TaskResultStatus.SUCCESSFUL
+            record.finished_at = timezone.now()
+            record.save(
+                update_fields=["status", "finished_at", "worker_ids", "return_value"]
+            )
+
+        task_finished.send(type(self), task_result=self._to_result(record, task))
+
+    def _store_failure(self, record, exc, retry):
+        exception_type = type(exc)
+        record.errors.append(
+            {
+                "exception_class_path": (
+                    f"{exception_type.__module__}.{exception_type.__qualname__}"
+                ),
+                "traceback": "".join(format_exception(exc)),
+            }
+        )
+
+        if retry:
+            delay = self.retry_delay * 2 ** (record.attempts - 1)
+            record.status = TaskResultStatus.READY
+            record.run_after = timezone.now() + timedelta(seconds=delay)
+            logger.warning(
+                "Task id=%s path=%s failed, retrying in %ss",
+                record.id,
+                record.task_path,
+                delay,
+            )
+        else:
+            record.status = TaskResultStatus.FAILED
+            record.finished_at = timezone.now()
+
+        record.save(
+            update_fields=["status", "run_after", "finished_at", "worker_ids", "errors"]
+        )
+
+    def _to_result(self, record, task=None):
+        if task is None:
+            task = import_string(record.task_path)
+        task = task.using(
+            priority=record.priority,
+            queue_name=record.queue_name,
+            run_after=record.run_after,
+            backend=self.alias,
+        )
+
+        task_result = TaskResult(
+            task=task,
+            id=record.id,
+            status=TaskResultStatus(record.status),
+            enqueued_at=record.enqueued_at,
+            started_at=record.started_at,
+            finished_at=record.finished_at,
+            last_attempted_at=record.last_attempted_at,
+            args=record.args,
+            kwargs=record.kwargs,
+            backend=self.alias,
+            errors=[TaskError(**error) for error in record.errors],
+            worker_ids=record.worker_ids,
+        )
+        object.__setattr__(task_result, "_return_value", record.return_value)
+        return task_result
@@ -1 +1,379 @@
-from django.test import TestCase
+import sqlite3
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from datetime import timezone as dt_timezone
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.contrib.sessions.models import Session
+from django.core.cache import caches
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.management import call_command
+from django.db import connection, connections
+from django.test import (
+    LiveServerTestCase,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from core.admin import EstimatedCountPaginator
+from core.bulk import bulk_insert
+from core.db_router import (
+    PIN_SESSION_KEY,
+    ReplicaMiddleware,
+    pin_to_primary,
+    replica_reads,
+)
+from core.models import BestSet, BestSetHistory, Exercise, Mesocycle, TaskRecord
+from core.session_backend import SessionStore
+from core.warmup import warm_up
+
+
+class LargeTableAdminTest(TestCase):
+    def setUp(self):
+        User.objects.create_superuser(username="admin", password="123")
+        self.client.login(username="admin", password="123")
+        self.exercise = Exercise.objects.create(name="Deadlift")
+
+    def add_history(self, count):
+        offset = User.objects.count()
+        users = User.objects.bulk_create(
+            User(username=f"lifter{offset + i}") for i in range(count)
+        )
+        BestSetHistory.objects.bulk_create(
+            BestSetHistory(
+                user=user, exercise=self.exercise, weight=100, reps=5, estimated_1rm=112
+            )
+            for user in users
+        )
+
+    def changelist_queries(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse("admin:core_bestsethistory_changelist"))
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        self.add_history(5)
+        queries_for_few = self.changelist_queries()
+
+        self.add_history(50)
+        self.assertEqual(self.changelist_queries(), queries_for_few)
+
+    @mock.patch.object(EstimatedCountPaginator, "EXACT_COUNT_LIMIT", 0)
+    def test_paginator_estimates_only_unfiltered_lists(self):
+        self.add_history(3)
+        last_id = BestSetHistory.objects.latest("id").id
+        BestSetHistory.objects.filter(id__lt=last_id).delete()
+
+        unfiltered = EstimatedCountPaginator(BestSetHistory.objects.all(), 100)
+        filtered = EstimatedCountPaginator(
+            BestSetHistory.objects.filter(exercise=self.exercise), 100
+        )
+
+        self.assertEqual(unfiltered.count, last_id)
+        self.assertEqual(filtered.count, 1)
+
+    @mock.patch.object(EstimatedCountPaginator, "EXACT_COUNT_LIMIT", 0)
+    def test_paginator_corrects_an_overshooting_estimate(self):
+        self.add_history(10)
+        ids = list(BestSetHistory.objects.order_by("id").values_list("id", flat=True))
+        BestSetHistory.objects.filter(id__in=ids[2:7]).delete()
+
+        short = EstimatedCountPaginator(BestSetHistory.objects.order_by("id"), 3)
+        self.assertEqual(short.count, ids[-1])
+        self.assertEqual(len(short.page(2)), 2)
+        self.assertEqual((short.count, short.num_pages), (5, 2))
+
+        past_end = EstimatedCountPaginator(BestSetHistory.objects.order_by("id"), 3)
+        page = past_end.page(past_end.num_pages)
+        self.assertEqual((page.number, len(page)), (2, 2))
+        self.assertEqual(past_end.num_pages, 2)
+
+
+class SamplingProfilerTest(TestCase):
+    def setUp(self):
+        self.profile_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.profile_dir.cleanup)
+        override = override_settings(
+            PROFILER_DIR=self.profile_dir.name,
+            PROFILER_MAX_PROFILES=2,
+            PROFILER_INTERVAL=0.001,
+        )
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def stored_profiles(self):
+        return sorted(Path(self.profile_dir.name).glob("*.json"))
+
+    def test_query_flag_is_staff_only(self):
+        User.objects.create_user(username="lifter", password="123")
+        self.client.login(username="lifter", password="123")
+
+        self.client.get(reverse("home"), {"_profile": "1"})
+
+        self.assertEqual(self.stored_profiles(), [])
+
+    def test_staff_profiles_are_bounded_and_reported(self):
+        User.objects.create_superuser(username="admin", password="123")
+        self.client.login(username="admin", password="123")
+
+        for _ in range(3):
+            self.client.get(reverse("home"), {"_profile": "1"})
+
+        self.assertEqual(len(self.stored_profiles()), 2)
+
+        collapsed = Path(self.profile_dir.name) / "stacks.txt"
+        output = StringIO()
+        call_command("profile_report", collapsed=str(collapsed), stdout=output)
+
+        self.assertIn("home: 2 requests", output.getvalue())
+        for line in collapsed.read_text().splitlines():
+            self.assertRegex(line, r"^home;.+ \d+$")
+
+    @override_settings(PROFILER_URL_PATTERNS=[r"^/accounts/login/"])
+    def test_url_pattern_enables_profiling(self):
+        self.client.get(reverse("login"))
+        self.client.get(reverse("home"))
+
+        self.assertEqual(len(self.stored_profiles()), 1)
+
+
+class WarmUpTest(TestCase):
+    def test_all_stages_run(self):
+        Exercise.objects.create(name="Deadlift")
+
+        timings = warm_up()
+
+        self.assertEqual(
+            list(timings), ["urls", "templates", "database", "caches", "forms"]
+        )
+
+    def test_database_stages_can_be_skipped(self):
+        with self.assertNumQueries(0):
+            timings = warm_up(database=False)
+
+        self.assertEqual(list(timings), ["urls", "templates"])
+
+
+class SessionStorageTest(TestCase):
+    @override_settings(SESSION_LOCAL_CACHE_TTL=30)
+    def test_local_cache_entry_is_capped(self):
+        session = SessionStore()
+        session["key"] = "value"
+        session.save()
+
+        local_cache = caches["local"]
+        expires_in = local_cache._expire_info[local_cache.make_key(session.cache_key)]
+
+        self.assertLessEqual(expires_in - time.time(), 30)
+        self.assertFalse(caches["default"].has_key(session.cache_key))
+        self.assertTrue(
+            Session.objects.filter(session_key=session.session_key).exists()
+        )
+        self.assertEqual(SessionStore(session.session_key)["key"], "value")
+
+    def test_clear_expired_sessions_in_batches(self):
+        expired = timezone.now() - timedelta(days=1)
+        for i in range(5):
+            Session.objects.create(
+                session_key=f"expired{i}", session_data="", expire_date=expired
+            )
+        Session.objects.create(
+            session_key="active",
+            session_data="",
+            expire_date=timezone.now() + timedelta(days=1),
+        )
+
+        output = StringIO()
+        call_command("clear_expired_sessions", batch_size=2, pause=0, stdout=output)
+
+        self.assertIn("Deleted 5 expired sessions", output.getvalue())
+        self.assertEqual(
+            list(Session.objects.values_list("session_key", flat=True)), ["active"]
+        )
+
+
+class BulkInsertTest(TestCase):
+    def test_keeps_auto_now_add_values_in_one_write(self):
+        user = User.objects.create_user(username="lifter")
+        squat = Exercise.objects.create(name="Barbell Back Squat")
+        created_at = datetime(2020, 1, 6, 18, tzinfo=dt_timezone.utc)
+        cycles = [
+            Mesocycle(
+                user=user,
+                exercise=squat,
+                start_date=date(2020, 1, 6),
+                week=week,
+                rpe=7,
+                rir=3,
+                target_weight=100,
+                target_reps_min=6,
+                target_reps_max=8,
+                target_sets=3,
+                created_at=created_at,
+            )
+            for week in range(1, 5)
+        ]
+
+        with CaptureQueriesContext(connection) as context:
+            bulk_insert(Mesocycle, cycles, batch_size=2)
+
+        self.assertEqual(len(context.captured_queries), 2)
+        self.assertTrue(all(cycle.pk for cycle in cycles))
+        self.assertEqual(
+            set(Mesocycle.objects.values_list("created_at", flat=True)), {created_at}
+        )
+
+
+class GenerateDatasetTest(TestCase):
+    def test_same_seed_gives_same_data(self):
+        for name in [
+            "Barbell Back Squat",
+            "Barbell Bench Press",
+            "Deadlift",
+            "Leg Press",
+        ]:
+            Exercise.objects.create(name=name)
+
+        for prefix, chunk_size in (("a", 1), ("b", 3)):
+            call_command(
+                "generate_dataset",
+                "--today",
+                "2025-06-30",
+                users=3,
+                years=1,
+                prefix=prefix,
+                processes=1,
+                chunk_size=chunk_size,
+                stdout=StringIO(),
+            )
+
+        def rows(prefix):
+            return list(
+                BestSetHistory.objects.filter(user__username__startswith=prefix)
+                .order_by("user__username", "created_at", "exercise__name")
+                .values_list("exercise__name", "estimated_1rm", "created_at")
+            )
+
+        self.assertTrue(rows("a"))
+        self.assertEqual(rows("a"), rows("b"))
+        self.assertEqual(BestSet.objects.filter(user__username="a0000000").count(), 4)
+        self.assertTrue(Mesocycle.objects.filter(user__username="a0000000").exists())
+        self.assertTrue(User.objects.get(username="b0000002").userprofile.pk)
+        self.assertEqual(
+            BestSet.objects.latest("updated_at").updated_at.isoformat()[:7], "2025-06"
+        )
+        self.assertLess(
+            Mesocycle.objects.latest("created_at").created_at.date().isoformat(),
+            "2025-06-30",
+        )
+
+
+@override_settings(
+    ALLOWED_HOSTS=["127.0.0.1"],
+    PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
+)
+class LoadTestCommandTest(LiveServerTestCase):
+    def setUp(self):
+        for name in ["Barbell Back Squat", "Barbell Bench Press", "Deadlift"]:
+            Exercise.objects.create(name=name)
+
+    def test_synthetic_users_and_their_tasks_are_removed(self):
+        out = StringIO()
+
+        call_command(
+            "loadtest",
+            users=2,
+            duration=0.5,
+            mix="profile=1,add_best_set=1",
+            stdout=out,
+        )
+
+        self.assertIn("Created 2 synthetic users", out.getvalue())
+        self.assertRegex(out.getvalue(), r"add_best_set +[1-9]")
+        self.assertFalse(User.objects.exists())
+        self.assertFalse(TaskRecord.objects.exists())
+
+    def test_login_target_creates_no_users(self):
+        User.objects.create_user(username="remote", password="123")
+        out = StringIO()
+
+        call_command(
+            "loadtest",
+            users=2,
+            duration=0.5,
+            mix="profile=1",
+            target=self.live_server_url,
+            login="remote:123",
+            stdout=out,
+        )
+
+        self.assertNotIn("synthetic users", out.getvalue())
+        self.assertRegex(out.getvalue(), r"profile +[1-9]\d* .* 0\.0%")
+        self.assertEqual(
+            list(User.objects.values_list("username", flat=True)), ["remote"]
+        )
+
+
+@mock.patch.dict(connections.settings, {"replica": connections.settings["default"]})
+class ReplicaRouterTest(TestCase):
+    def test_reads_go_to_replica_until_something_is_written(self):
+        self.assertEqual(Exercise.objects.all().db, "default")
+
+        with replica_reads():
+            self.assertEqual(Exercise.objects.all().db, "replica")
+            # Auth, sessions and the task queue always read the primary.
+            self.assertEqual(User.objects.all().db, "default")
+            self.assertEqual(Session.objects.all().db, "default")
+
+    def test_writes_pin_the_session_to_the_primary(self):
+        User.objects.create_user(username="test", password="123")
+        self.client.login(username="test", password="123")
+
+        self.client.get(reverse("home"))
+        self.assertNotIn(PIN_SESSION_KEY, self.client.session)
+
+        self.client.post(reverse("log_bodyweight"), {"weight": 80, "sex": "M"})
+        self.assertGreater(self.client.session[PIN_SESSION_KEY], time.time())
+
+    def test_best_set_changes_pin_reads_in_the_same_request(self):
+        with replica_reads():
+            pin_to_primary()
+            self.assertEqual(Exercise.objects.all().db, "default")
+
+    def test_middleware_is_unused_without_a_replica(self):
+        with mock.patch.dict(connections.settings):
+            del connections.settings["replica"]
+            with self.assertRaises(MiddlewareNotUsed):
+                ReplicaMiddleware(lambda request: None)
+
+            with CaptureQueriesContext(connection) as context:
+                self.client.get(reverse("login"))
+        self.assertFalse(
+            any("django_session" in query["sql"] for query in context.captured_queries)
+        )
+
+
+class SyncReplicaTest(TransactionTestCase):
+    # The backup cannot read a database inside TestCase's open transaction.
+
+    def test_copies_primary_into_replica_file(self):
+        Exercise.objects.create(name="Deadlift")
+        replica_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(replica_dir.cleanup)
+        path = str(Path(replica_dir.name) / "replica.sqlite3")
+
+        call_command("sync_replica", path=path, stdout=StringIO())
+
+        replica = sqlite3.connect(path)
+        self.addCleanup(replica.close)
+        names = replica.execute("SELECT name FROM core_exercise").fetchall()
+        self.assertEqual(names, [("Deadlift",)])
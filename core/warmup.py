@@ -0,0 +1,62 @@
+import time
+from pathlib import Path
+
+from django.apps import apps
+from django.core.cache import caches
+from django.db import connections
+from django.template.loader import get_template
+from django.urls import get_resolver, reverse
+
+
+def warm_up(database: bool = True) -> dict:
+    """
+    Pay the one-off costs of the first request up front: URLconf import,
+    template compilation, crispy-forms layouts, DB connections and the
+    exercise catalog. Returns {stage: seconds}.
+    """
+    stages = [("urls", _load_urls), ("templates", _compile_templates)]
+    if database:
+        stages += [
+            ("database", _open_connections),
+            ("caches", _prime_caches),
+            ("forms", _render_forms),
+        ]
+
+    timings = {}
+    for name, stage in stages:
+        started = time.perf_counter()
+        stage()
+        timings[name] = time.perf_counter() - started
+    return timings
+
+
+def _load_urls():
+    get_resolver().url_patterns
+    reverse("home")
+
+
+def _compile_templates():
+    """Load every template under core/templates into the cached loader."""
+    template_dir = Path(apps.get_app_config("core").path) / "templates"
+    for path in sorted(template_dir.rglob("*.html")):
+        get_template(path.relative_to(template_dir).as_posix())
+
+
+def _open_connections():
+    for connection in connections.all():
+        connection.ensure_connection()
+
+
+def _prime_caches():
+    for alias in caches:
+        caches[alias].get("warmup")
+
+
+def _render_forms():
+    """Build crispy layouts once so their templates get compiled."""
+    from crispy_forms.utils import render_crispy_form
+
+    from accounts.forms import BestSetForm, UserRegisterForm
+
+    for form_class in (BestSetForm, UserRegisterForm):
+        render_crispy_form(form_class())
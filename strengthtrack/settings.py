@@ -40,6 +40,8 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "core.db_router.ReplicaMiddleware",
+    "core.profiling.SamplingProfilerMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -63,11 +65,74 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "strengthtrack.wsgi.application"
 
+# Run core.warmup.warm_up() when the WSGI/ASGI application is loaded.
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP") == "True"
+
 
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        "OPTIONS": {"timeout": 20},
+        # Keep the connection opened by the warm-up for the following requests.
+        "CONN_MAX_AGE": 60,
+        "CONN_HEALTH_CHECKS": True,
+    }
+}
+
+# Optional read replica for GET requests (core.db_router). With SQLite,
+# `manage.py sync_replica` copies the primary into this file.
+REPLICA_DB_PATH = os.getenv("REPLICA_DB_PATH")
+if REPLICA_DB_PATH:
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "NAME": REPLICA_DB_PATH,
+        "TEST": {"MIRROR": "default"},
+    }
+DATABASE_ROUTERS = ["core.db_router.ReplicaRouter"]
+# Seconds a session reads from the primary after it wrote something.
+REPLICA_PIN_SECONDS = 10
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "cache_table",
+        # Progress charts and forecasts are kept per user until they change.
+        "OPTIONS": {"MAX_ENTRIES": 100000},
+    },
+    # Per-process memory cache for hot, short-lived data such as sessions.
+    "local": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "strengthtrack-local",
+    },
+}
+
+# SESSION_BACKEND: db | cached_db | signed_cookies
+#   cached_db - reads from SESSION_CACHE_ALIAS, writes through to django_session.
+#               On the per-process "local" cache other workers keep a revoked
+#               session for up to SESSION_LOCAL_CACHE_TTL seconds; add a shared
+#               Redis or memcached cache to CACHES and name it here to avoid
+#               that. Never the "default" DatabaseCache: it is slower than db.
+SESSION_ENGINES = {
+    "db": "django.contrib.sessions.backends.db",
+    "cached_db": "core.session_backend",
+    "signed_cookies": "django.contrib.sessions.backends.signed_cookies",
+}
+SESSION_ENGINE = SESSION_ENGINES[os.getenv("SESSION_BACKEND", "db")]
+SESSION_CACHE_ALIAS = os.getenv("SESSION_CACHE_ALIAS", "local")
+SESSION_LOCAL_CACHE_TTL = 60
+
+# Flash messages travel in a cookie and never touch the session.
+MESSAGE_STORAGE = "django.contrib.messages.storage.cookie.CookieStorage"
+
+TASKS = {
+    "default": {
+        "BACKEND": os.getenv("TASKS_BACKEND", "core.task_backend.DatabaseBackend"),
+        "OPTIONS": {
+            "MAX_ATTEMPTS": 3,
+            "RETRY_DELAY": 30,
+            "LEASE_TIMEOUT": 900,
+        },
     }
 }
 
@@ -97,5 +162,23 @@ USE_I18N = True
 USE_TZ = True
 
 
+HISTORY_ARCHIVE_DIR = BASE_DIR / "archive"
+
+# Keep 1RM history as packed per-exercise series too and draw the progress
+# charts from them. Run `manage.py build_history_series` after enabling.
+HISTORY_SERIES_STORE = os.getenv("HISTORY_SERIES_STORE") == "True"
+
+# Sampling profiler: staff can add ?_profile to any URL, other requests are
+# profiled by URL regex or at random. See `manage.py profile_report`.
+PROFILER_SAMPLE_RATE = float(os.getenv("PROFILER_SAMPLE_RATE", "0"))
+PROFILER_URL_PATTERNS = [
+    pattern for pattern in os.getenv("PROFILER_URL_PATTERNS", "").split(",") if pattern
+]
+PROFILER_QUERY_FLAG = "_profile"
+PROFILER_INTERVAL = 0.005
+PROFILER_DIR = BASE_DIR / "profiles"
+PROFILER_MAX_PROFILES = 500
+
+
 STATIC_URL = "static/"
 STATIC_ROOT = os.path.join(BASE_DIR, "static")